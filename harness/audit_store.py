@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""SQLite store of every run's audit.jsonl, for queries across runs.
+
+Usage:
+    python3 harness/audit_store.py ingest [--results-dir DIR] [--db PATH]
+    python3 harness/audit_store.py latency [--by-turn] [--model M] [--task T]
+    python3 harness/audit_store.py errors  [--model M] [--task T]
+    python3 harness/audit_store.py mix     [--model M] [--task T]
+    python3 harness/audit_store.py sql "SELECT ..."
+
+``ingest`` parses the audit stream of every
+``results/<model>/<task>/run-N`` into one ``events`` table, with a row
+per line. The table is indexed on ``(model, task, run, event, tool, ts)``
+and on ``call_id``. The other commands are queries over it:
+
+    latency   tool_call -> tool_result time per tool and model
+              (``--by-turn``: per run and turn)
+    errors    share of tool results with ``"error": true``
+    mix       share of each tool among a model's tool calls
+    sql       any query, printed as a table
+
+Ingestion is incremental. For each file, ``files`` records its size, its
+mtime and the byte offset up to which it has been parsed (the end of
+the last complete line). If a file is unchanged it is skipped. If it
+has grown, only the bytes past the offset are read and parsed. If it
+has shrunk, or its mtime changed with its size unchanged, it was
+rewritten, so its rows are replaced. Everything happens in one
+transaction per ingest.
+
+The default database is ``results/audit.sqlite``. It is derived data
+and can be deleted at any time.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import verifier
+
+RESULTS_DIR = verifier.RESULTS_DIR
+DB_PATH = RESULTS_DIR / "audit.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    model TEXT NOT NULL,
+    task TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    lines INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    line INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    task TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    ts INTEGER,
+    event TEXT,
+    turn INTEGER,
+    tool TEXT,
+    call_id TEXT,
+    error INTEGER,
+    detail TEXT,
+    PRIMARY KEY (file_id, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_by_run
+    ON events (model, task, run, event, tool, ts);
+CREATE INDEX IF NOT EXISTS events_by_call ON events (call_id);
+"""
+
+# Fields with their own column; the rest of a line is kept as ``detail``.
+_COLUMNS = ("ts", "event", "turn", "tool", "toolCallId", "error", "agent")
+
+
+def connect(db_path=DB_PATH):
+    """Open (creating if needed) the store at ``db_path``."""
+    db = sqlite3.connect(db_path)
+    db.executescript(SCHEMA)
+    return db
+
+
+# ============================================================
+# INGEST
+# ============================================================
+def audit_files(results_dir):
+    """``(model, task, run, path)`` of every run's audit.jsonl."""
+    for run_dir in verifier.run_dirs(results_dir):
+        audit = verifier.find_audit(run_dir, run_dir.parent.name)
+        if audit:
+            yield (run_dir.parent.parent.name, run_dir.parent.name,
+                   int(run_dir.name[len("run-"):]), audit)
+
+
+def _rows(data, file_id, first_line, model, task, run):
+    """Event rows of the complete lines of ``data``, numbered from ``first_line``."""
+    rows = []
+    for number, raw in enumerate(data.splitlines(), first_line):
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            record = {"event": "unparsed", "raw": raw.decode("utf-8", "replace")}
+        if not isinstance(record, dict):
+            record = {"event": "unparsed", "raw": record}
+        error = record.get("error")
+        detail = {key: value for key, value in record.items() if key not in _COLUMNS}
+        rows.append((file_id, number, model, task, run, record.get("ts"), record.get("event"),
+                     record.get("turn"), record.get("tool"), record.get("toolCallId"),
+                     None if error is None else int(bool(error)),
+                     json.dumps(detail, ensure_ascii=False, separators=(",", ":"))
+                     if detail else None))
+    return rows
+
+
+def ingest_file(db, model, task, run, path):
+    """Bring one audit file's rows up to date; return the number of new lines."""
+    stat = os.stat(path)
+    known = db.execute("SELECT id, size, mtime_ns, offset, lines FROM files WHERE path = ?",
+                       (path,)).fetchone()
+    if known is None:
+        file_id = db.execute(
+            "INSERT INTO files (path, model, task, run, size, mtime_ns, offset, lines)"
+            " VALUES (?, ?, ?, ?, 0, 0, 0, 0)", (path, model, task, run)).lastrowid
+        offset = lines = 0
+    else:
+        file_id, size, mtime_ns, offset, lines = known
+        if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+            return 0
+        if stat.st_size < offset or stat.st_size == size:
+            db.execute("DELETE FROM events WHERE file_id = ?", (file_id,))
+            offset = lines = 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(stat.st_size - offset)
+    # A line still being written is left for the next ingest.
+    complete = data[:data.rfind(b"\n") + 1]
+    rows = _rows(complete, file_id, lines + 1, model, task, run)
+    db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    db.execute("UPDATE files SET size = ?, mtime_ns = ?, offset = ?, lines = ? WHERE id = ?",
+               (stat.st_size, stat.st_mtime_ns, offset + len(complete), lines + len(rows),
+                file_id))
+    return len(rows)
+
+
+def ingest(db, results_dir=RESULTS_DIR):
+    """Ingest every audit file under ``results_dir``.
+
+    Returns:
+        ``(files seen, files with new lines, new lines)``.
+    """
+    seen = changed = added = 0
+    with db:
+        for model, task, run, path in audit_files(results_dir):
+            seen += 1
+            new = ingest_file(db, model, task, run, path)
+            changed += bool(new)
+            added += new
+    return seen, changed, added
+
+
+# ============================================================
+# QUERIES
+# ============================================================
+_CALLS = """
+    SELECT c.model, c.task, c.run, c.turn, c.tool, r.ts - c.ts AS ms, r.error
+    FROM events c JOIN events r
+      ON r.call_id = c.call_id AND r.file_id = c.file_id AND r.event = 'tool_result'
+    WHERE c.event = 'tool_call' {where}
+"""
+
+
+def _filters(model, task, table=""):
+    clauses, params = [], []
+    for column, value in (("model", model), ("task", task)):
+        if value:
+            clauses.append(f"AND {table}{column} = ?")
+            params.append(value)
+    return " ".join(clauses), params
+
+
+def tool_latency(db, model=None, task=None, by_turn=False):
+    """Tool call -> result latency in ms.
+
+    Returns:
+        Column names and rows: per model and tool (calls, mean, max), or
+        with ``by_turn`` one row per run and turn (calls, total, max).
+    """
+    where, params = _filters(model, task, "c.")
+    calls = _CALLS.format(where=where)
+    if by_turn:
+        query = (f"SELECT model, task, run, turn, COUNT(*), group_concat(tool, ','),"
+                 f" SUM(ms), MAX(ms) FROM ({calls})"
+                 f" GROUP BY model, task, run, turn ORDER BY model, task, run, turn")
+        columns = ("model", "task", "run", "turn", "calls", "tools", "total_ms", "max_ms")
+    else:
+        query = (f"SELECT model, tool, COUNT(*), ROUND(AVG(ms), 1), MAX(ms) FROM ({calls})"
+                 f" GROUP BY model, tool ORDER BY model, tool")
+        columns = ("model", "tool", "calls", "mean_ms", "max_ms")
+    return columns, db.execute(query, params).fetchall()
+
+
+def error_rate(db, model=None, task=None):
+    """Share of tool results flagged as errors, per model and tool."""
+    where, params = _filters(model, task)
+    query = (f"SELECT model, tool, COUNT(*), SUM(error), ROUND(100.0 * SUM(error) / COUNT(*), 1)"
+             f" FROM events WHERE event = 'tool_result' {where}"
+             f" GROUP BY model, tool ORDER BY model, tool")
+    return ("model", "tool", "results", "errors", "error_pct"), db.execute(query, params).fetchall()
+
+
+def tool_mix(db, model=None, task=None):
+    """Tool calls per model and tool, with each tool's share of the model's calls."""
+    where, params = _filters(model, task)
+    query = (f"SELECT model, tool, COUNT(*),"
+             f" ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY model), 1)"
+             f" FROM events WHERE event = 'tool_call' {where}"
+             f" GROUP BY model, tool ORDER BY model, COUNT(*) DESC")
+    return ("model", "tool", "calls", "share_pct"), db.execute(query, params).fetchall()
+
+
+def print_table(columns, rows):
+    """Print query results as an aligned text table."""
+    cells = [[("" if value is None else str(value)) for value in row] for row in rows]
+    widths = [max([len(name)] + [len(row[i]) for row in cells]) for i, name in enumerate(columns)]
+    print("  ".join(name.ljust(width) for name, width in zip(columns, widths)).rstrip())
+    for row in cells:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index and query audit.jsonl streams.")
+    parser.add_argument("--db", type=Path, default=DB_PATH,
+                        help="SQLite database (default: results/audit.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest_cmd = commands.add_parser("ingest", help="add new audit lines to the store")
+    ingest_cmd.add_argument("--results-dir", type=Path, default=RESULTS_DIR,
+                            help="results tree to scan (default: results/)")
+    for name, help_text in (("latency", "tool_call -> tool_result latency"),
+                            ("errors", "tool error rate"),
+                            ("mix", "tool mix per model")):
+        query_cmd = commands.add_parser(name, help=help_text)
+        query_cmd.add_argument("--model")
+        query_cmd.add_argument("--task")
+        if name == "latency":
+            query_cmd.add_argument("--by-turn", action="store_true",
+                                   help="one row per run and turn")
+    sql_cmd = commands.add_parser("sql", help="run a query against the store")
+    sql_cmd.add_argument("query")
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    try:
+        if args.command == "ingest":
+            seen, changed, added = ingest(db, args.results_dir.resolve())
+            print(f"{seen} audit files, {changed} changed, {added} new lines")
+        elif args.command == "latency":
+            print_table(*tool_latency(db, args.model, args.task, args.by_turn))
+        elif args.command == "errors":
+            print_table(*error_rate(db, args.model, args.task))
+        elif args.command == "mix":
+            print_table(*tool_mix(db, args.model, args.task))
+        else:
+            try:
+                cursor = db.execute(args.query)
+            except sqlite3.Error as e:
+                parser.error(f"query failed: {e}")
+            print_table([column[0] for column in cursor.description or ()], cursor.fetchall())
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
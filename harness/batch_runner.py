@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Concurrent batch runner: every task x model x run over a worker pool.
+
+Usage:
+    python3 harness/batch_runner.py [--runs 3] [--models minimax haiku]
+                                    [--jobs N] [--limit KEY=N ...]
+                                    [--timeout 300] [--pi PATH]
+                                    [--results-dir DIR] [--no-workspace-cache]
+                                    [tasks...]
+
+Does what ``batch-runner.sh`` does with ``harness.sh`` for each run, but
+runs are scheduled concurrently instead of one after another with a
+``sleep 2`` in between:
+
+    --jobs N        runs in flight at once (default: all of them)
+    --limit KEY=N   at most N runs at once for a model name (``haiku``)
+                    or a provider (``anthropic``); may be repeated
+
+Each run gets its own pi agent directory, ``<run dir>/.pi-agent``, passed
+as ``PI_CODING_AGENT_DIR``. Its ``settings.json`` selects the run's
+model, and every other entry of the user's agent directory (auth,
+models, ...) is symlinked in. ``harness.sh`` instead rewrites the global
+``~/.pi/agent/settings.json`` in ``set_model``, which is why its runs
+could never overlap.
+
+Agents run under ``run_controller.py``, as in ``harness.sh``. Each one
+gets its own process group and its output streams to ``run.log``. The
+runner awaits its exit, and at the timeout the whole group is
+terminated. Everything else matches ``harness.sh``: run directory
+layout, ``setup.sh``, and ``metrics.json`` with its sub-second timing
+fields. Fresh run directories are cloned from per-task templates in
+``workspace_cache.py`` rather than set up with git and ``setup.sh``
+every time. Each run is verified by ``verifier.py`` in a fresh worker
+process with a timeout, up to ``--jobs`` at once, which gives the same
+results as each task's ``verify.sh``. The summary file and report match
+``batch-runner.sh``.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import run_controller
+import verifier
+import workspace_cache
+
+ROOT = Path(__file__).resolve().parent.parent
+TASKS_DIR = ROOT / "tasks"
+RESULTS_DIR = ROOT / "results"
+
+MAX_TURNS = 30
+TIMEOUT_SECONDS = 300
+PROMPT = "Read plan.md and execute the task. Create the required files."
+
+# settings.json per model, as set_model in harness.sh writes them.
+MODELS = {
+    "minimax": {
+        "defaultProvider": "minimax",
+        "defaultModel": "MiniMax-M2.1",
+        "defaultThinkingLevel": "none",
+    },
+    "haiku": {
+        "defaultProvider": "anthropic",
+        "defaultModel": "claude-haiku-4-5",
+        "defaultThinkingLevel": "none",
+    },
+}
+
+
+# ============================================================
+# RUN SETUP
+# ============================================================
+def user_agent_dir():
+    """The pi agent directory runs inherit auth and other config from."""
+    configured = os.environ.get("PI_CODING_AGENT_DIR")
+    return Path(configured) if configured else Path.home() / ".pi" / "agent"
+
+
+def make_agent_dir(run_dir, model):
+    """Create the run's private pi agent directory and return its path.
+
+    ``settings.json`` is written for ``model``; everything else in the
+    user's agent directory is linked, not copied.
+    """
+    agent_dir = run_dir / ".pi-agent"
+    if agent_dir.exists():
+        shutil.rmtree(agent_dir)
+    agent_dir.mkdir(parents=True)
+    source = user_agent_dir()
+    if source.is_dir():
+        for entry in source.iterdir():
+            if entry.name != "settings.json":
+                (agent_dir / entry.name).symlink_to(entry.resolve())
+    (agent_dir / "settings.json").write_text(json.dumps(MODELS[model], indent=2) + "\n")
+    return agent_dir
+
+
+async def run_command(*args, cwd=None, log=None):
+    """Run a command to completion; return its exit code and stdout."""
+    proc = await asyncio.create_subprocess_exec(
+        *args, cwd=cwd, stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=log if log is not None else asyncio.subprocess.DEVNULL)
+    out, _ = await proc.communicate()
+    return proc.returncode, out.decode("utf-8", "replace")
+
+
+async def prepare_run(task, run_dir, log, cache=None):
+    """Create the run directory and workspace the way harness.sh does.
+
+    With a ``WorkspaceCache``, a fresh run is cloned from the task's
+    template. A rerun into an existing workspace, or a template that
+    cannot be built, goes through git and setup.sh as before.
+    """
+    if cache is not None:
+        try:
+            if await cache.prepare(task, run_dir, log):
+                return
+        except (OSError, RuntimeError) as e:
+            log.write(f"workspace cache unavailable, preparing from scratch: {e}\n".encode())
+    task_dir = TASKS_DIR / task
+    workspace = run_dir / "workspace"
+    workspace.mkdir(parents=True, exist_ok=True)
+    if not (run_dir / ".git").is_dir():
+        await run_command("git", "init", "-q", cwd=run_dir, log=log)
+        await run_command("git", "commit", "--allow-empty", "-m", "Initialize benchmark run", "-q",
+                          cwd=run_dir, log=log)
+    shutil.copy(task_dir / "plan.md", workspace)
+    if (task_dir / "setup.sh").is_file():
+        code, out = await run_command("bash", str(task_dir / "setup.sh"), cwd=workspace, log=log)
+        log.write(out.encode())
+        if code:
+            log.write(f"setup.sh exited with {code}\n".encode())
+
+
+# ============================================================
+# AGENT
+# ============================================================
+async def run_agent(task, model, run_dir, timeout, pi):
+    """Run the agent for one task to completion or timeout.
+
+    Returns:
+        The controller's ``AgentResult``.
+    """
+    env = dict(os.environ,
+               PI_CODING_AGENT_DIR=str(make_agent_dir(run_dir, model)),
+               PI_WORKSPACE_ROOT=str(run_dir),
+               PI_AGENT_NAME=task)
+    return await run_controller.run_process(
+        [pi, "--print", "--max-turns", str(MAX_TURNS), PROMPT], run_dir / "run.log", timeout,
+        cwd=run_dir / "workspace", env=env)
+
+
+# ============================================================
+# VERIFICATION
+# ============================================================
+async def verify_run(task, model, run, run_dir, agent, log, verify_threads):
+    """Verify the run and write metrics.json; return the metrics.
+
+    Tasks declared in ``verifier.TASKS`` are checked by
+    ``verifier.verify_isolated`` in a fresh worker process, waited on
+    from one of ``verify_threads``. Any other task falls back to its
+    verify.sh.
+    """
+    audit = verifier.find_audit(run_dir, task)
+    if task in verifier.TASKS:
+        try:
+            metrics = await asyncio.get_running_loop().run_in_executor(
+                verify_threads, verifier.verify_isolated, task, run_dir / "workspace", audit)
+        except RuntimeError as e:
+            log.write(f"{e}\n".encode())
+            return None
+    else:
+        code, out = await run_command("bash", str(TASKS_DIR / task / "verify.sh"),
+                                      str(run_dir / "workspace"), audit, log=log)
+        try:
+            metrics = json.loads(out)
+        except json.JSONDecodeError:
+            log.write(f"verify.sh exited with {code} and no JSON result\n".encode())
+            return None
+    metrics.update(task=task, model=model, run=run, duration_seconds=agent.duration_seconds,
+                   started_at=agent.started_at, ended_at=agent.ended_at,
+                   timestamp=datetime.datetime.now().astimezone().isoformat(timespec="seconds"))
+    (run_dir / "metrics.json").write_text(json.dumps(metrics, indent=2, ensure_ascii=False) + "\n")
+    return metrics
+
+
+async def benchmark_run(task, model, run, results_dir, timeout, pi, verify_threads, cache=None):
+    """One harness.sh run: setup, agent, verification. Returns the metrics."""
+    run_dir = results_dir / model / task / f"run-{run}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    with open(run_dir / "harness.log", "wb") as log:
+        await prepare_run(task, run_dir, log, cache)
+        agent = await run_agent(task, model, run_dir, timeout, pi)
+        if agent.timed_out:
+            log.write(f"TIMEOUT: killed agent after {timeout}s\n".encode())
+        return await verify_run(task, model, run, run_dir, agent, log, verify_threads)
+
+
+# ============================================================
+# SCHEDULING
+# ============================================================
+async def run_batch(plan, jobs, limits, results_dir, timeout, pi, cache=None):
+    """Run every ``(task, model, run)`` of ``plan`` under the pool limits.
+
+    Args:
+        plan: List of ``(task, model, run)``.
+        jobs: Runs in flight at once.
+        limits: ``{model or provider: max runs at once}``.
+        results_dir: Directory the ``<model>/<task>/run-N`` dirs go in.
+        timeout: Agent timeout per run, in seconds.
+        pi: pi executable.
+        cache: ``WorkspaceCache`` to clone fresh runs from, or None.
+
+    Returns:
+        Summary entries in ``plan`` order, as batch-runner.sh records them;
+        runs without a metrics file are ``None``.
+    """
+    pool = asyncio.Semaphore(jobs)
+    gates = {key: asyncio.Semaphore(n) for key, n in limits.items()}
+    # Runs verify inside ``pool``, so at most ``jobs`` workers at once.
+    verify_threads = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="verify")
+
+    async def one(task, model, run):
+        keys = [key for key in (model, MODELS[model]["defaultProvider"]) if key in gates]
+        for key in keys:
+            await gates[key].acquire()
+        try:
+            async with pool:
+                metrics = await benchmark_run(task, model, run, results_dir, timeout, pi,
+                                              verify_threads, cache)
+        finally:
+            for key in keys:
+                gates[key].release()
+        report(task, model, run, metrics)
+        if metrics is None:
+            return None
+        return {"task": task, "model": model, "run": run, "passed": metrics.get("passed") is True,
+                "score": metrics.get("score"), "max_score": metrics.get("max_score"),
+                "duration": metrics.get("duration_seconds")}
+
+    try:
+        return await asyncio.gather(*(one(*entry) for entry in plan))
+    finally:
+        verify_threads.shutdown()
+
+
+def report(task, model, run, metrics):
+    label = f"{task} | {model} | run {run}"
+    if metrics is None:
+        print(f"⚠️  NO RESULT FILE: {label}", flush=True)
+    elif metrics.get("passed") is True:
+        print(f"✅ PASSED ({metrics['score']}/{metrics['max_score']}) in "
+              f"{metrics['duration_seconds']}s: {label}", flush=True)
+    else:
+        print(f"❌ FAILED ({metrics.get('score')}/{metrics.get('max_score')}) in "
+              f"{metrics['duration_seconds']}s: {label}", flush=True)
+
+
+def print_summary(tasks, models, results, summary_file, wall_seconds):
+    runs = [entry for entry in results if entry is not None]
+    total = len(results)
+    passed = sum(entry["passed"] for entry in runs)
+    print()
+    print("=" * 60)
+    print("BATCH COMPLETE")
+    print("=" * 60)
+    print(f"Total runs: {total}")
+    print(f"Passed:     {passed}")
+    print(f"Failed:     {total - passed}")
+    print(f"Pass rate:  {passed * 100 / total:.1f}%" if total else "Pass rate:  n/a")
+    print(f"Wall time:  {wall_seconds:.1f}s")
+    print()
+    print(f"Summary saved to: {summary_file}")
+    print()
+    print("=== Results by Model ===")
+    for model in models:
+        entries = [entry for entry in runs if entry["model"] == model]
+        durations = [entry["duration"] for entry in entries]
+        average = sum(durations) / len(durations) if durations else 0
+        print(f"{model}: {sum(e['passed'] for e in entries)}/{len(entries)} passed, avg {average:g}s")
+    print()
+    print("=== Results by Task ===")
+    for task in tasks:
+        entries = [entry for entry in runs if entry["task"] == task]
+        print(f"{task}: {sum(e['passed'] for e in entries)}/{len(entries)} passed")
+
+
+# ============================================================
+# CLI
+# ============================================================
+def parse_limit(text):
+    key, sep, value = text.partition("=")
+    if not sep or not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f"expected KEY=N with N >= 1, got {text!r}")
+    return key, int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark concurrently.")
+    parser.add_argument("tasks", nargs="*", help="task ids (default: every task)")
+    parser.add_argument("--runs", type=int, default=3, help="runs per task per model (default: 3)")
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS),
+                        help="models to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="runs in flight at once (default: every run)")
+    parser.add_argument("--limit", type=parse_limit, action="append", default=[],
+                        metavar="KEY=N", help="cap concurrent runs of a model or provider")
+    parser.add_argument("--timeout", type=int, default=TIMEOUT_SECONDS,
+                        help=f"agent timeout per run in seconds (default: {TIMEOUT_SECONDS})")
+    parser.add_argument("--pi", default="pi", help="pi executable (default: pi on PATH)")
+    parser.add_argument("--results-dir", type=Path, default=RESULTS_DIR,
+                        help="where run directories and the summary go (default: results/)")
+    parser.add_argument("--no-workspace-cache", action="store_true",
+                        help="prepare every run with git and setup.sh instead of cloning "
+                             "cached templates")
+    args = parser.parse_args(argv)
+
+    tasks = args.tasks or sorted(p.name for p in TASKS_DIR.iterdir() if p.is_dir())
+    missing = [task for task in tasks if not (TASKS_DIR / task / "plan.md").is_file()]
+    if missing:
+        parser.error(f"task not found: {', '.join(missing)}")
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if shutil.which(args.pi) is None:
+        parser.error(f"pi executable not found: {args.pi}")
+    known = set(MODELS) | {settings["defaultProvider"] for settings in MODELS.values()}
+    limits = dict(args.limit)
+    unknown = sorted(set(limits) - known)
+    if unknown:
+        parser.error(f"--limit names no model or provider: {', '.join(unknown)}")
+
+    plan = [(task, model, run) for task in tasks for model in args.models
+            for run in range(1, args.runs + 1)]
+    jobs = args.jobs or len(plan)
+    print("=" * 60)
+    print("BENCHMARK BATCH RUN")
+    print("=" * 60)
+    print(f"Tasks:  {' '.join(tasks)}")
+    print(f"Models: {' '.join(args.models)}")
+    print(f"Runs:   {args.runs} per task per model")
+    print(f"Total:  {len(plan)} benchmark runs, {jobs} at once"
+          + "".join(f", {key} <= {n}" for key, n in limits.items()))
+    print("=" * 60, flush=True)
+
+    results_dir = args.results_dir.resolve()
+    results_dir.mkdir(parents=True, exist_ok=True)
+    summary_file = results_dir / f"batch-summary-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    start = time.monotonic()
+    cache = None if args.no_workspace_cache else workspace_cache.WorkspaceCache()
+    results = asyncio.run(run_batch(plan, jobs, limits, results_dir, args.timeout, args.pi,
+                                    cache))
+    wall_seconds = time.monotonic() - start
+    runs = [entry for entry in results if entry is not None]
+    summary_file.write_text(json.dumps({"runs": runs}, indent=2) + "\n")
+    print_summary(tasks, args.models, results, summary_file, wall_seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
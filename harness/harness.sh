@@ -111,49 +111,35 @@ set_model "$MODEL"
 # RUN AGENT
 # ============================================================
 echo ""
-echo "Starting agent..."
-START_TIME=$(date +%s)
-
-# Generate unique session name
-SESSION="bench-${MODEL}-${TASK_ID}-run${RUN_NUM}-$$"
-
-# Spawn agent with tmux for observability
-tmux new-session -d -s "$SESSION" \
-    "cd '$RUN_DIR/workspace' && \
-     PI_WORKSPACE_ROOT='$RUN_DIR' \
-     PI_AGENT_NAME='$TASK_ID' \
-     pi --print --max-turns $MAX_TURNS \
-        'Read plan.md and execute the task. Create the required files.' \
-        2>&1 | tee '../run.log'"
-
-echo "Agent spawned in tmux session: $SESSION"
-echo "Waiting for completion (timeout: ${TIMEOUT_SECONDS}s)..."
-
-# Wait for completion with timeout
-ELAPSED=0
-while tmux has-session -t "$SESSION" 2>/dev/null; do
-    sleep 5
-    ELAPSED=$((ELAPSED + 5))
-    
-    if [ $ELAPSED -ge $TIMEOUT_SECONDS ]; then
-        echo "TIMEOUT: Killing agent after ${TIMEOUT_SECONDS}s"
-        tmux kill-session -t "$SESSION" 2>/dev/null
-        break
-    fi
-    
-    # Progress indicator
-    printf "."
-done
-echo ""
+echo "Starting agent (timeout: ${TIMEOUT_SECONDS}s)..."
+
+# The controller runs pi as a child in its own process group, tees its
+# output to run.log, and kills the group at the timeout. It returns as
+# soon as pi exits; timings are sub-second.
+TIMING_FILE="$RUN_DIR/timing.json"
+rm -f "$TIMING_FILE"
+(cd "$RUN_DIR/workspace" && \
+ PI_WORKSPACE_ROOT="$RUN_DIR" \
+ PI_AGENT_NAME="$TASK_ID" \
+ python3 "$SCRIPT_DIR/run_controller.py" \
+    --timeout "$TIMEOUT_SECONDS" --log "$RUN_DIR/run.log" --timing "$TIMING_FILE" -- \
+    pi --print --max-turns $MAX_TURNS \
+       'Read plan.md and execute the task. Create the required files.')
+
+if [ ! -f "$TIMING_FILE" ]; then
+    echo "ERROR: Agent could not be started"
+    exit 1
+fi
+if [ "$(jq -r '.timed_out' "$TIMING_FILE")" = "true" ]; then
+    echo "TIMEOUT: Killed agent after ${TIMEOUT_SECONDS}s"
+fi
 
-END_TIME=$(date +%s)
-DURATION=$((END_TIME - START_TIME))
+DURATION=$(jq -r '.duration_seconds' "$TIMING_FILE")
+STARTED_AT=$(jq -r '.started_at' "$TIMING_FILE")
+ENDED_AT=$(jq -r '.ended_at' "$TIMING_FILE")
 
 echo "Agent completed in ${DURATION}s"
 
-# Small delay for file sync
-sleep 2
-
 # ============================================================
 # VERIFICATION
 # ============================================================
@@ -187,8 +173,10 @@ METRICS=$(echo "$METRICS" | jq \
     --arg model "$MODEL" \
     --argjson run "$RUN_NUM" \
     --argjson duration "$DURATION" \
+    --arg started_at "$STARTED_AT" \
+    --arg ended_at "$ENDED_AT" \
     --arg timestamp "$(date -Iseconds)" \
-    '. + {task: $task, model: $model, run: $run, duration_seconds: $duration, timestamp: $timestamp}')
+    '. + {task: $task, model: $model, run: $run, duration_seconds: $duration, started_at: $started_at, ended_at: $ended_at, timestamp: $timestamp}')
 
 # Save metrics
 echo "$METRICS" | jq . > "$RUN_DIR/metrics.json"
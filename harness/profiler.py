@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Where each run's time goes: model think time, tool time, harness overhead.
+
+Usage:
+    python3 harness/profiler.py [--results-dir DIR] [--model M] [--task T]
+                                [--timeline [--run N] [--width 60]]
+
+Every ``audit.jsonl`` under the results tree is streamed once, line by
+line, and its millisecond timestamps are split three ways:
+
+    think     ``turn_start`` to the turn's first ``tool_call``, or to
+              ``turn_end`` if the model called no tool
+    tool      ``tool_call`` to the ``tool_result`` with the same
+              ``toolCallId`` (overlapping calls are counted once)
+    overhead  the rest of the run's wall time: starting the agent,
+              dispatching calls after the first, between turns
+
+A run's wall time is the sum of its sessions, each from
+``session_start`` to the session's last event. A rerun that appends a
+second session to the same file adds its time, but not the gap between
+the two. Process startup before ``session_start`` is not in the audit
+and not counted.
+
+The report gives, per model, the share of each part, the p50/p95/p99 of
+think time per turn, and the p50/p95/p99 of each tool's latency.
+``--timeline`` prints each selected run as one bar per turn, flame-graph
+style, with all bars on one time scale:
+
+    =  think      R W B E  read, write, bash, edit (first letter of tool)
+    .  overhead
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import audit_store
+import verifier
+
+PERCENTILES = (50, 95, 99)
+
+
+class Turn:
+    """One model turn: its span, when it first called a tool, and its calls."""
+
+    __slots__ = ("start", "end", "first_call", "calls")
+
+    def __init__(self, start):
+        self.start = start
+        self.end = None
+        self.first_call = None
+        self.calls = []
+
+    @property
+    def think(self):
+        return (self.first_call if self.first_call is not None else self.end) - self.start
+
+    @property
+    def tool(self):
+        # A result logged after turn_end counts only up to the turn's end.
+        return _union([(tool, start, min(end, self.end)) for tool, start, end in self.calls])
+
+
+class RunProfile:
+    """Timing of one run, built by ``profile_file``."""
+
+    def __init__(self, model, task, run):
+        self.model = model
+        self.task = task
+        self.run = run
+        self.wall = 0
+        self.turns = []
+        # (tool, start, end) of every call whose result was seen.
+        self.calls = []
+        # Calls made outside any turn, counted in ``tool`` only.
+        self.loose_calls = []
+
+    @property
+    def think(self):
+        return sum(turn.think for turn in self.turns)
+
+    @property
+    def tool(self):
+        return sum(turn.tool for turn in self.turns) + _union(self.loose_calls)
+
+    @property
+    def overhead(self):
+        return self.wall - self.think - self.tool
+
+
+def _union(calls):
+    """Milliseconds covered by ``(tool, start, end)`` intervals."""
+    total, reach = 0, None
+    for _, start, end in sorted(calls, key=lambda call: call[1]):
+        if reach is None or start > reach:
+            total += end - start
+            reach = end
+        elif end > reach:
+            total += end - reach
+            reach = end
+    return total
+
+
+def profile_file(model, task, run, path):
+    """Stream one audit file into a ``RunProfile``."""
+    profile = RunProfile(model, task, run)
+    turn = None
+    pending = {}
+    session_start = last = None
+
+    def close_turn(ts):
+        if turn is not None:
+            turn.end = ts
+            profile.turns.append(turn)
+
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                ts, event = int(record["ts"]), record["event"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if event == "session_start":
+                close_turn(last)
+                turn = None
+                if session_start is not None:
+                    profile.wall += last - session_start
+                session_start = ts
+            elif event == "turn_start":
+                close_turn(ts)
+                turn = Turn(ts)
+            elif event == "turn_end":
+                close_turn(ts)
+                turn = None
+            elif event == "tool_call":
+                if turn is not None and turn.first_call is None:
+                    turn.first_call = ts
+                pending[record.get("toolCallId")] = (record.get("tool") or "?", ts, turn)
+            elif event == "tool_result" and record.get("toolCallId") in pending:
+                tool, start, owner = pending.pop(record.get("toolCallId"))
+                call = (tool, start, ts)
+                profile.calls.append(call)
+                (owner.calls if owner is not None else profile.loose_calls).append(call)
+            if session_start is None:
+                session_start = ts
+            last = ts
+    close_turn(last)
+    if session_start is not None:
+        profile.wall += last - session_start
+    return profile
+
+
+def profile_results(results_dir, model=None, task=None):
+    """Yield a ``RunProfile`` per audit file under ``results_dir``."""
+    for run_model, run_task, run, path in audit_store.audit_files(results_dir):
+        if (model is None or model == run_model) and (task is None or task == run_task):
+            yield profile_file(run_model, run_task, run, path)
+
+
+# ============================================================
+# REPORT
+# ============================================================
+def percentile(values, p):
+    """Linearly interpolated ``p``-th percentile of sorted ``values``."""
+    if not values:
+        return 0
+    rank = (len(values) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _seconds(ms):
+    return f"{ms / 1000:.1f}s"
+
+
+def _share(part, whole):
+    return f"{100 * part / whole:.0f}%" if whole else "-"
+
+
+def _quantiles(values):
+    values = sorted(values)
+    return [f"{percentile(values, p):,.0f}" for p in PERCENTILES] + [f"{values[-1]:,}"]
+
+
+def report(profiles):
+    """Print the per-model breakdown and the percentile tables."""
+    by_model = defaultdict(list)
+    for profile in profiles:
+        by_model[profile.model].append(profile)
+
+    print(f"{'model':<10} {'runs':>5} {'wall':>9} {'think':>9} {'tool':>9} {'overhead':>9}")
+    for model, runs in sorted(by_model.items()):
+        wall = sum(p.wall for p in runs)
+        think, tool, overhead = (sum(p.think for p in runs), sum(p.tool for p in runs),
+                                 sum(p.overhead for p in runs))
+        print(f"{model:<10} {len(runs):>5} {_seconds(wall):>9} {_share(think, wall):>9} "
+              f"{_share(tool, wall):>9} {_share(overhead, wall):>9}")
+
+    print()
+    print("think time per turn (ms)")
+    print(f"{'model':<10} {'turns':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for model, runs in sorted(by_model.items()):
+        thinks = [turn.think for p in runs for turn in p.turns]
+        if thinks:
+            print(f"{model:<10} {len(thinks):>6} "
+                  + " ".join(f"{q:>8}" for q in _quantiles(thinks)))
+
+    print()
+    print("tool latency (ms)")
+    print(f"{'model':<10} {'tool':<8} {'calls':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for model, runs in sorted(by_model.items()):
+        latencies = defaultdict(list)
+        for p in runs:
+            for tool, start, end in p.calls:
+                latencies[tool].append(end - start)
+        for tool, values in sorted(latencies.items()):
+            print(f"{model:<10} {tool:<8} {len(values):>6} "
+                  + " ".join(f"{q:>8}" for q in _quantiles(values)))
+
+
+def timeline(profile, width):
+    """Print one run as a bar per turn on a shared time scale."""
+    wall = profile.wall
+    print(f"{profile.model}/{profile.task}/run-{profile.run}: wall {_seconds(wall)}, "
+          f"think {_share(profile.think, wall)}, tool {_share(profile.tool, wall)}, "
+          f"overhead {_share(profile.overhead, wall)}")
+    longest = max((turn.end - turn.start for turn in profile.turns), default=0)
+    scale = longest / width if longest else 1
+    for number, turn in enumerate(profile.turns):
+        span = turn.end - turn.start
+        cells = max(1, round(span / scale))
+        bar = []
+        for i in range(cells):
+            t = turn.start + (i + 0.5) * scale
+            if t < turn.start + turn.think:
+                bar.append("=")
+            else:
+                tool = next((tool for tool, start, end in turn.calls if start <= t < end), None)
+                bar.append(tool[0].upper() if tool else ".")
+        # Calls shorter than one cell still get the cell they start in.
+        for tool, start, _ in turn.calls:
+            i = min(cells - 1, int((start - turn.start) / scale))
+            if bar[i] in "=.":
+                bar[i] = tool[0].upper()
+        tools = ",".join(tool for tool, _, _ in turn.calls)
+        print(f"  {number:>3} {span:>8,}ms |{''.join(bar):<{width}}| {tools}".rstrip())
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split run time into think, tool and overhead.")
+    parser.add_argument("--results-dir", type=Path, default=verifier.RESULTS_DIR,
+                        help="results tree to read (default: results/)")
+    parser.add_argument("--model", help="only runs of this model")
+    parser.add_argument("--task", help="only runs of this task")
+    parser.add_argument("--timeline", action="store_true",
+                        help="print a per-turn timeline of each selected run")
+    parser.add_argument("--run", type=int, help="with --timeline, only this run number")
+    parser.add_argument("--width", type=int, default=60,
+                        help="characters for the longest turn (default: 60)")
+    args = parser.parse_args(argv)
+    if args.width < 1:
+        parser.error("--width must be at least 1")
+
+    profiles = list(profile_results(args.results_dir.resolve(), args.model, args.task))
+    if not profiles:
+        parser.error("no audit files match")
+    if args.timeline:
+        for profile in profiles:
+            if args.run is None or profile.run == args.run:
+                timeline(profile, args.width)
+                print()
+        return 0
+    report(profiles)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Run an agent as a child process: stream its output, time it, enforce a timeout.
+
+Usage:
+    python3 harness/run_controller.py [--timeout 300] [--log run.log]
+                                      [--timing timing.json] [--quiet]
+                                      -- COMMAND [ARGS ...]
+
+``harness.sh`` used to start the agent in a detached tmux session and
+poll ``tmux has-session`` every 5 seconds, then ``sleep 2`` "for file
+sync". That added up to 7 seconds to every ``duration_seconds``. The
+controller instead owns the agent process:
+
+    - the agent is a direct child in its own process group, with stdout
+      and stderr on one pipe
+    - the pipe is copied to the log (and the terminal, unless
+      ``--quiet``) as output arrives, so nothing is lost if the agent is
+      killed
+    - completion is the child's exit, awaited rather than polled
+    - at the timeout the whole group gets SIGTERM, then SIGKILL after
+      ``KILL_GRACE_SECONDS``
+
+The run ends when the child exits, even if background processes it
+left behind still hold the pipe. Their output is copied for up to
+``KILL_GRACE_SECONDS`` more, and then the group is killed. A child's
+files are written by the time it exits, so no extra sleep is needed.
+
+Start and end are recorded as wall-clock timestamps with milliseconds.
+The duration comes from the monotonic clock, in seconds with
+millisecond precision. ``--timing`` writes them as JSON for
+``harness.sh``. The exit status is the agent's, or 124 on timeout, as
+with ``timeout(1)``.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+KILL_GRACE_SECONDS = 5
+
+# Exit status after a timeout, as timeout(1) uses.
+TIMEOUT_STATUS = 124
+
+
+class AgentResult:
+    """Outcome of one ``run_process`` call.
+
+    Attributes:
+        started_at: ISO 8601 wall-clock start, with milliseconds.
+        ended_at: ISO 8601 wall-clock end (child exited or was killed).
+        duration_seconds: Monotonic run time, rounded to milliseconds.
+        returncode: Child's exit status (negative for a signal).
+        timed_out: Whether the timeout killed the child.
+    """
+
+    __slots__ = ("started_at", "ended_at", "duration_seconds", "returncode", "timed_out")
+
+    def __init__(self, started_at, ended_at, duration_seconds, returncode, timed_out):
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.duration_seconds = duration_seconds
+        self.returncode = returncode
+        self.timed_out = timed_out
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def timestamp():
+    """Current local time, ISO 8601 with milliseconds."""
+    return datetime.datetime.now().astimezone().isoformat(timespec="milliseconds")
+
+
+async def run_process(argv, log_path, timeout, cwd=None, env=None, echo=None):
+    """Run ``argv`` to completion or ``timeout``, copying its output to a log.
+
+    Args:
+        argv: Command and arguments.
+        log_path: File that receives stdout and stderr (truncated).
+        timeout: Seconds before the process group is killed; None to
+            wait indefinitely.
+        cwd: Working directory of the child.
+        env: Environment of the child (default: inherited).
+        echo: Binary stream that also gets the output, or None.
+
+    Returns:
+        An ``AgentResult``.
+    """
+    loop = asyncio.get_running_loop()
+    with open(log_path, "wb") as log:
+        started_at, start = timestamp(), time.monotonic()
+        transport, protocol = await loop.subprocess_exec(
+            lambda: _AgentProtocol(loop, log, echo), *argv, cwd=cwd, env=env,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            start_new_session=True)
+        pid = transport.get_pid()
+        try:
+            timed_out = False
+            try:
+                await asyncio.wait_for(asyncio.shield(protocol.exited), timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                await kill_group(pid, protocol.exited)
+            duration = round(time.monotonic() - start, 3)
+            ended_at = timestamp()
+            try:
+                await asyncio.wait_for(asyncio.shield(protocol.drained), KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                # Leftover children of the agent still hold the pipe.
+                _signal_group(pid, signal.SIGKILL)
+        finally:
+            transport.close()
+    return AgentResult(started_at, ended_at, duration, transport.get_returncode(), timed_out)
+
+
+class _AgentProtocol(asyncio.SubprocessProtocol):
+    """Copies the child's output as it arrives and reports exit and EOF.
+
+    ``Process.wait()`` only returns once every pipe is closed, which a
+    background process left by the agent can delay indefinitely. The
+    protocol's ``process_exited`` fires when the child itself exits.
+    """
+
+    def __init__(self, loop, log, echo):
+        self.log = log
+        self.echo = echo
+        self.exited = loop.create_future()
+        self.drained = loop.create_future()
+
+    def pipe_data_received(self, fd, data):
+        self.log.write(data)
+        self.log.flush()
+        if self.echo is not None:
+            self.echo.write(data)
+            self.echo.flush()
+
+    def pipe_connection_lost(self, fd, exc):
+        if not self.drained.done():
+            self.drained.set_result(None)
+
+    def process_exited(self):
+        if not self.exited.done():
+            self.exited.set_result(None)
+
+
+def _signal_group(pid, sig):
+    """Send ``sig`` to the process group led by ``pid``; False if it is gone."""
+    try:
+        os.killpg(pid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+
+
+async def kill_group(pid, exited):
+    """Terminate a process group, then kill it after a grace period.
+
+    Args:
+        pid: Process group leader, started with ``start_new_session``.
+        exited: Future that completes when the leader has exited.
+    """
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        if not _signal_group(pid, sig):
+            break
+        try:
+            await asyncio.wait_for(asyncio.shield(exited), KILL_GRACE_SECONDS)
+            break
+        except asyncio.TimeoutError:
+            continue
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a command with output logging and a timeout.")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="seconds before the command's process group is killed")
+    parser.add_argument("--log", default="run.log",
+                        help="file for the command's output (default: run.log)")
+    parser.add_argument("--timing", default=None,
+                        help="write start, end, duration and status as JSON to this file")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only write output to the log, not to stdout")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="command to run, after --")
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command given")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+
+    echo = None if args.quiet else sys.stdout.buffer
+    try:
+        result = asyncio.run(run_process(command, args.log, args.timeout, echo=echo))
+    except OSError as e:
+        parser.error(f"cannot run {command[0]}: {e}")
+    if args.timing:
+        with open(args.timing, "w") as f:
+            json.dump(result.as_dict(), f, indent=2)
+            f.write("\n")
+    if result.timed_out:
+        return TIMEOUT_STATUS
+    return result.returncode if result.returncode >= 0 else 128 - result.returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
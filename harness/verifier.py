@@ -0,0 +1,846 @@
+#!/usr/bin/env python3
+"""Python verification of benchmark runs, equivalent to tasks/*/verify.sh.
+
+Usage:
+    python3 harness/verifier.py [RUN_DIR ...] [--results-dir DIR] [--write]
+                                [--compare] [--timeout 120]
+
+Each ``verify.sh`` pipes its result JSON through ``jq`` once per metric,
+greps ``audit.jsonl`` once per tool and forks ``python3`` for each check.
+That adds up to dozens of processes per run. Here every task is declared
+as a list of checks (``TASKS``), and all checks of a run execute in one
+Python process:
+
+    file_exists    ``[ -f ... ]``
+    py_compiles    ``python3 -m py_compile``, without writing a ``.pyc``
+    grep           ``grep -q`` on a workspace file
+    tool_usage     the ``grep -c '"tool":"[Ww]rite"'`` counts, from one
+                   read of ``audit.jsonl`` shared by every check of a run
+    run_cases      the generated ``test_runner.py`` scripts (C1, C7)
+    run_unittest   ``python3 -m unittest -v`` (C3)
+
+plus the task-specific checks below. Agent code is imported and run
+inside ``_sandboxed``, which gives it the workspace as working directory
+and ``sys.path[0]``, captures its output, and removes the modules it
+imported afterwards.
+
+``verify`` runs the checks in the calling process. ``verify_isolated``,
+which the CLI and ``batch_runner.py`` use, runs them in a fresh worker
+process per run: started from a ``forkserver``, in its own session, and
+killed with everything it started after the checks, or at a timeout. The
+agent code therefore cannot hang, exit or leave state (patched modules,
+environment, threads, signal handlers) in the caller or a later run.
+
+``verify`` returns the same fields, in the same order and with the same
+scores, as the task's ``verify.sh``. There are two deliberate
+differences, both where ``verify.sh`` itself breaks. In B2, a missing
+``data-testid`` makes ``grep -c ... || echo 0`` yield ``0\\n0``, and jq
+then empties the whole result. In C3, a missing method aborts the
+arithmetic, and ``methods_implemented`` and ``has_all_methods`` are
+dropped. In both cases the intended metrics are reported instead.
+Timings inside C3's ``test_summary`` naturally differ.
+
+With no run directories, every ``results/<model>/<task>/run-N`` is
+verified. ``--write`` updates each ``metrics.json``, keeping its run
+metadata (task, model, run, timings). ``--compare`` also
+runs ``verify.sh`` on each run and reports any field that differs.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import py_compile
+import re
+import runpy
+import signal
+import subprocess
+import sys
+import time
+import traceback
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TASKS_DIR = ROOT / "tasks"
+RESULTS_DIR = ROOT / "results"
+
+# Seconds ``verify_isolated`` gives one run before killing its worker.
+VERIFY_TIMEOUT_SECONDS = 120
+
+# Fields harness.sh appends to verify.sh's result in metrics.json.
+RUN_FIELDS = ("task", "model", "run", "duration_seconds", "started_at", "ended_at", "timestamp")
+
+
+class Run:
+    """One workspace under verification and the result being built.
+
+    Args:
+        task: Task id.
+        workspace: Workspace path, as it would be passed to verify.sh
+            (it appears verbatim in D1's ``judge_input_path``).
+        audit: Path of ``audit.jsonl``, or "" when there is none.
+    """
+
+    def __init__(self, task, workspace, audit=""):
+        self.task = task
+        self.workspace = str(workspace)
+        self.audit = str(audit) if audit else ""
+        self.result = {}
+        self._audit_lines = None
+
+    def path(self, name):
+        return Path(self.workspace, name)
+
+    def exists(self, name):
+        return self.path(name).is_file()
+
+    def read(self, name):
+        """File contents as text, undecodable bytes replaced (as jq -R does)."""
+        return self.path(name).read_bytes().decode("utf-8", "replace")
+
+    def has_audit(self):
+        return bool(self.audit) and os.path.isfile(self.audit)
+
+    def audit_count(self, pattern):
+        """``grep -c`` over audit.jsonl: lines matching a bytes regex."""
+        if self._audit_lines is None:
+            with open(self.audit, "rb") as f:
+                self._audit_lines = f.read().splitlines()
+        search = re.compile(pattern).search
+        return sum(1 for line in self._audit_lines if search(line))
+
+
+def _tool_pattern(tool):
+    """The ``"tool":"[Ww]rite"`` pattern verify.sh greps for ``tool``."""
+    return b'"tool":"[%s%s]%s"' % (tool[0].upper().encode(), tool[0].encode(), tool[1:].encode())
+
+
+def _lines(text):
+    """Lines as sed/head see them: split on \\n only, endings dropped."""
+    return text.split("\n")
+
+
+def _line(text, number):
+    """``sed -n 'Np'`` without its newline; "" past the end."""
+    lines = _lines(text)
+    if text.endswith("\n"):
+        lines.pop()
+    return lines[number - 1] if number <= len(lines) else ""
+
+
+def _command_output(text):
+    """``$(...)``: trailing newlines dropped."""
+    return text.rstrip("\n")
+
+
+# ============================================================
+# CHECKS
+# ============================================================
+def file_exists(name, key="file_exists"):
+    def check(run):
+        run.result[key] = run.exists(name)
+    return check
+
+
+def py_compiles(name, key="valid_syntax", error_key=None):
+    """``python3 -m py_compile``, compiled in memory.
+
+    ``error_key`` records the first three lines of the error message, as
+    B1's ``syntax_error``.
+    """
+    def check(run):
+        if not run.exists(name):
+            run.result[key] = False
+            return
+        path = str(run.path(name))
+        try:
+            compile(run.path(name).read_bytes(), path, "exec", dont_inherit=True)
+            run.result[key] = True
+        except Exception as err:
+            run.result[key] = False
+            if error_key:
+                message = py_compile.PyCompileError(err.__class__, err, path).msg
+                run.result[error_key] = "\n".join(_lines(_command_output(message))[:3])
+    return check
+
+
+def grep(name, pattern, key, flags=0):
+    """``grep -q`` for a regex in a workspace file; False if it is missing."""
+    regex = re.compile(pattern, flags)
+
+    def check(run):
+        run.result[key] = run.exists(name) and any(
+            regex.search(line) for line in _lines(run.read(name)))
+    return check
+
+
+def tool_usage(counts, used_tools=None):
+    """Tool call counts from audit.jsonl and whether any tool was used.
+
+    Args:
+        counts: ``[(tool, key)]`` in the order verify.sh sets them.
+        used_tools: Tools whose total must be positive for
+            ``used_tools``; default all of ``counts``.
+    """
+    def check(run):
+        if not run.has_audit():
+            run.result["used_tools"] = None
+            run.result["audit_missing"] = True
+            return
+        found = {tool: run.audit_count(_tool_pattern(tool)) for tool, _ in counts}
+        for tool, key in counts:
+            run.result[key] = found[tool]
+        total = sum(found[tool] for tool in (used_tools or found))
+        run.result["used_tools"] = total > 0
+    return check
+
+
+def run_cases(name, function, cases, describe):
+    """Call ``function`` from a workspace module on fixed cases.
+
+    The C1 and C7 ``verify.sh`` scripts write a ``test_runner.py`` that
+    imports the function, counts passes and failures and lists up to
+    five failures; an import error leaves both counts at 0.
+
+    Args:
+        name: Module file in the workspace, e.g. ``"buggy.py"``.
+        function: Function to import from it.
+        cases: ``[(input, expected, label)]``.
+        describe: ``describe(input, label)`` names a case in failure
+            messages.
+    """
+    module = name[:-len(".py")]
+
+    def check(run):
+        if not run.exists(name):
+            run.result["all_tests_pass"] = False
+            if module == "intervals":
+                run.result["tests_passed"] = 0
+            return
+        passed = failed = 0
+        failures = []
+        imported = False
+        with _sandboxed(run.workspace):
+            try:
+                fn = getattr(__import__(module), function)
+                imported = True
+            except (Exception, SystemExit):
+                pass
+            if imported:
+                for value, expected, label in cases:
+                    try:
+                        result = fn(_copy(value))
+                        if _case_matches(module, result, expected):
+                            passed += 1
+                        else:
+                            failed += 1
+                            failures.append(f"{describe(value, label)}: "
+                                            f"expected {expected}, got {result}")
+                    except Exception as e:
+                        failed += 1
+                        failures.append(f"{describe(value, label)}: exception {e}")
+        run.result["tests_passed"] = passed
+        run.result["tests_failed"] = failed
+        run.result["all_tests_pass"] = imported and failed == 0
+        if not run.result["all_tests_pass"]:
+            run.result["failure_details"] = "\n".join(f"  - {f}" for f in failures[:5])
+    return check
+
+
+def _copy(value):
+    return [list(item) for item in value] if isinstance(value, list) else value
+
+
+def _case_matches(module, result, expected):
+    if module == "intervals":
+        return sorted(sorted(x) for x in result) == sorted(sorted(x) for x in expected)
+    return result == expected
+
+
+def run_unittest(module):
+    """``python3 -m unittest <module> -v`` in the workspace (C3).
+
+    Passes and failures are counted from the verbose output the same way
+    verify.sh greps it, and the run passes if a line starts with "OK".
+    """
+    ok_line = re.compile(r"\.\.\..*ok$")
+    bad_line = re.compile(r"\.\.\..*FAIL$|\.\.\..*ERROR$")
+
+    def check(run):
+        if not (run.exists("solution.py") and run.exists(f"{module}.py")):
+            run.result["all_tests_pass"] = False
+            run.result["tests_passed"] = 0
+            return
+        with _sandboxed(run.workspace) as output:
+            try:
+                suite = unittest.defaultTestLoader.loadTestsFromName(module)
+                unittest.TextTestRunner(stream=output, verbosity=2).run(suite)
+            except (Exception, SystemExit):
+                traceback.print_exc(file=output)
+        lines = _lines(_command_output(output.getvalue()))
+        run.result["tests_passed"] = sum(1 for line in lines if ok_line.search(line))
+        run.result["tests_failed"] = sum(1 for line in lines if bad_line.search(line))
+        run.result["all_tests_pass"] = any(line.startswith("OK") for line in lines)
+        if not run.result["all_tests_pass"]:
+            run.result["test_summary"] = "\n".join(lines[-5:])
+    return check
+
+
+@contextlib.contextmanager
+def _sandboxed(workspace):
+    """Run agent code as if ``python3`` had been started in ``workspace``.
+
+    Yields a buffer collecting its stdout and stderr. The working
+    directory, ``sys.path`` and ``sys.argv`` are restored afterwards,
+    modules loaded from the workspace are forgotten, and no bytecode is
+    written.
+    """
+    cwd = os.getcwd()
+    path, argv = sys.path[:], sys.argv[:]
+    root = os.path.join(os.path.abspath(workspace), "")
+    dont_write = sys.dont_write_bytecode
+    output = io.StringIO()
+    os.chdir(workspace)
+    sys.path.insert(0, root[:-1])
+    sys.dont_write_bytecode = True
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            yield output
+    finally:
+        os.chdir(cwd)
+        sys.path[:], sys.argv[:] = path, argv
+        sys.dont_write_bytecode = dont_write
+        for name, module in list(sys.modules.items()):
+            if (getattr(module, "__file__", None) or "").startswith(root):
+                del sys.modules[name]
+
+
+def _run_script(run, name):
+    """``$(python3 <name> 2>&1) || OUTPUT="ERROR: $?"``."""
+    with _sandboxed(run.workspace) as output:
+        sys.argv[:] = [name]
+        code = 0
+        try:
+            runpy.run_path(name, run_name="__main__")
+        except SystemExit as exit_:
+            code = exit_.code if isinstance(exit_.code, int) else (0 if exit_.code is None else 1)
+            if exit_.code is not None and not isinstance(exit_.code, int):
+                print(exit_.code, file=output)
+        except Exception:
+            traceback.print_exc(file=output)
+            code = 1
+    return f"ERROR: {code}" if code else _command_output(output.getvalue())
+
+
+# ============================================================
+# TASK-SPECIFIC CHECKS
+# ============================================================
+def a1_content(run):
+    if not run.exists("hello.txt"):
+        run.result["content_correct"] = False
+        return
+    content = _command_output(run.read("hello.txt").replace("\0", ""))
+    run.result["content_correct"] = content == "Hello World"
+    if content != "Hello World":
+        run.result["actual_content"] = content + "\n"
+
+
+def a1_no_extra_files(run):
+    names = sorted(name for name in os.listdir(run.workspace)
+                   if not name.startswith(".") and name != "plan.md") \
+        if os.path.isdir(run.workspace) else []
+    run.result["no_extra_files"] = len(names) == 1
+    if len(names) != 1:
+        run.result["file_count"] = len(names)
+        run.result["files_found"] = names
+
+
+def a2_content(run):
+    if not run.exists("output.txt"):
+        run.result["content_correct"] = False
+        return
+    content = re.sub(r"[ \t\n\v\f\r]", "", run.read("output.txt"))
+    run.result["content_correct"] = content == "7"
+    if content != "7":
+        run.result["actual"] = content
+        run.result["expected"] = 7
+
+
+def a2_input_preserved(run):
+    run.result["input_preserved"] = (run.exists("input.txt")
+                                     and run.path("input.txt").read_bytes().count(b"\n") == 7)
+
+
+B1_EXPECTED = ("['1', '2', 'Fizz', '4', 'Buzz', 'Fizz', '7', '8', 'Fizz', 'Buzz', "
+               "'11', 'Fizz', '13', '14', 'FizzBuzz']")
+
+
+def b1_output(run):
+    if not run.exists("fizzbuzz.py"):
+        run.result["output_correct"] = False
+        return
+    output = _run_script(run, "fizzbuzz.py")
+    squeeze = str.maketrans("", "", " \t\n\v\f\r")
+    correct = output.translate(squeeze) == B1_EXPECTED.translate(squeeze)
+    run.result["output_correct"] = correct
+    if not correct:
+        short = (output + "\n").encode()[:200].decode("utf-8", "replace")
+        run.result["actual_output"] = _command_output(short)
+
+
+def b2_testids(run):
+    if not run.exists("Counter.jsx"):
+        run.result["has_all_testids"] = False
+        return
+    lines = _lines(run.read("Counter.jsx"))
+    found = {}
+    for name in ("count", "increment", "decrement"):
+        regex = re.compile(f"data-testid.*{name}")
+        found[name] = any(regex.search(line) for line in lines)
+        run.result[f"testid_{name}"] = found[name]
+    run.result["has_all_testids"] = all(found.values())
+
+
+def c3_methods(run):
+    if not run.exists("solution.py"):
+        run.result["has_all_methods"] = False
+        return
+    lines = _lines(run.read("solution.py"))
+    count = sum(1 for method in ("push", "pop", "peek", "is_empty", "size")
+                for line in lines if f"def {method}" in line)
+    run.result["methods_implemented"] = count
+    run.result["has_all_methods"] = count >= 5
+
+
+C4_HEADER = "customer,order_count,total_spent,avg_order_value"
+C4_ROWS = ("Charlie,2,405", "Alice,2,300", "Bob,1,125")
+
+
+def c4_header(run):
+    if not run.exists("summary.csv"):
+        run.result["correct_headers"] = False
+        return
+    header = _line(run.read("summary.csv"), 1).replace("\r", "")
+    run.result["correct_headers"] = header == C4_HEADER
+    if header != C4_HEADER:
+        run.result["actual_header"] = header
+
+
+def c4_row_count(run):
+    if not run.exists("summary.csv"):
+        run.result["correct_row_count"] = False
+        return
+    count = run.path("summary.csv").read_bytes().count(b"\n")
+    run.result["correct_row_count"] = count == 4
+    if count != 4:
+        run.result["actual_row_count"] = count
+
+
+def _read_summary(path):
+    try:
+        with open(path, "r") as f:
+            return sorted([dict(r) for r in csv.DictReader(f)], key=lambda x: x.get("customer", ""))
+    except Exception:
+        return None
+
+
+def c4_data(run):
+    expected_path = TASKS_DIR / run.task / "expected" / "summary.csv"
+    if not (run.exists("summary.csv") and expected_path.is_file()):
+        run.result["data_correct"] = False
+        return
+    actual, expected = _read_summary(run.path("summary.csv")), _read_summary(expected_path)
+    match = actual is not None and expected is not None and len(actual) == len(expected)
+    if match:
+        for a, e in zip(actual, expected):
+            for key in e.keys():
+                try:
+                    if key in ("order_count", "total_spent", "avg_order_value"):
+                        if abs(float(a.get(key, 0)) - float(e.get(key, 0))) > 0.01:
+                            match = False
+                    elif a.get(key) != e.get(key):
+                        match = False
+                except Exception:
+                    match = False
+    run.result["data_correct"] = match
+    if not match:
+        lines = _lines(run.read("summary.csv"))
+        run.result["correct_rows"] = sum(1 for row in C4_ROWS if any(row in line for line in lines))
+        run.result["actual_content"] = _command_output(run.read("summary.csv"))
+
+
+def c4_sort(run):
+    if not run.exists("summary.csv"):
+        run.result["correct_sort"] = False
+        return
+    text = run.read("summary.csv")
+    order = [_line(text, n).split(",", 1)[0] for n in (2, 3, 4)]
+    run.result["correct_sort"] = order == ["Charlie", "Alice", "Bob"]
+    if order != ["Charlie", "Alice", "Bob"]:
+        run.result["actual_order"] = ",".join(order)
+
+
+D1_SECTIONS = ("state inventory", "components", "hot paths", "failure modes",
+               "design decisions|decision.*log", "final summary")
+D1_TURNS = ("session", "rate limit", "audit", "performance|latency|850ms",
+            "ci.cd|build agent|api key", "region|gdpr|eu|europe", "webhook",
+            "encrypt|security.*product|conflict", "10x|scale", "summary|tradeoff|limitation")
+
+
+def d1_structure(run):
+    exists = run.exists("design.md")
+    run.result["file_exists"] = exists
+    if not exists:
+        run.result["has_required_sections"] = False
+        return
+    run.result["file_size_bytes"] = run.path("design.md").stat().st_size
+    lines = _lines(run.read("design.md"))
+
+    def found(pattern):
+        regex = re.compile(pattern, re.IGNORECASE)
+        return any(regex.search(line) for line in lines)
+
+    sections = sum(map(found, D1_SECTIONS))
+    run.result["sections_found"] = sections
+    run.result["expected_sections"] = 6
+    run.result["has_required_sections"] = sections >= 5
+    run.result["turns_addressed"] = sum(map(found, D1_TURNS))
+    run.result["expected_turns"] = 10
+
+
+def d1_tools(run):
+    if not run.has_audit():
+        run.result["iterative_development"] = None
+        run.result["audit_missing"] = True
+        return
+    counts = {tool: run.audit_count(_tool_pattern(tool)) for tool in ("write", "edit", "read")}
+    run.result["write_calls"] = counts["write"]
+    run.result["edit_calls"] = counts["edit"]
+    run.result["read_calls"] = counts["read"]
+    run.result["iterative_development"] = counts["write"] + counts["edit"] >= 5
+
+
+def d1_score(run):
+    """D1's structural score out of 10; it has no score/passed fields."""
+    result = run.result
+    score = 2 * (result.get("file_exists") is True)
+    score += 3 * (result.get("has_required_sections") is True)
+    turns = result.get("turns_addressed") or 0
+    score += 3 if turns >= 8 else 2 if turns >= 5 else 1 if turns >= 3 else 0
+    score += 2 * (result.get("iterative_development") is True)
+    result["structural_score"] = score
+    result["structural_max"] = 10
+    if run.exists("design.md"):
+        run.path("design_for_judge.md").write_bytes(run.path("design.md").read_bytes())
+        result["ready_for_llm_judge"] = True
+        result["judge_input_path"] = f"{run.workspace}/design_for_judge.md"
+    else:
+        result["ready_for_llm_judge"] = False
+    result["structural_passed"] = score >= 7
+    result["note"] = "Structural check only. Run LLM judge for qualitative evaluation."
+
+
+E1_EXPECTED = ("ERROR: File not found", "Missing file: data.json", "Status: Handled gracefully")
+
+
+def e1_content(run):
+    if not run.exists("report.txt"):
+        run.result["content_correct"] = False
+        return
+    text = run.read("report.txt")
+    lines = [_line(text, n) for n in (1, 2, 3)]
+    correct = sum(line == expected for line, expected in zip(lines, E1_EXPECTED))
+    run.result["correct_lines"] = correct
+    run.result["content_correct"] = correct == 3
+    if correct != 3:
+        for n, line in enumerate(lines, 1):
+            run.result[f"actual_line{n}"] = line
+
+
+def e1_tools(run):
+    if not run.has_audit():
+        run.result["attempted_read"] = None
+        run.result["audit_missing"] = True
+        run.result["used_tools"] = None
+    else:
+        run.result["attempted_read"] = run.audit_count(rb"data\.json") > 0
+        writes = run.audit_count(_tool_pattern("write"))
+        run.result["write_calls"] = writes
+        run.result["used_tools"] = writes > 0
+    run.result["did_not_create_data"] = not run.exists("data.json")
+
+
+# ============================================================
+# TASKS
+# ============================================================
+class Task:
+    """A task's checks and how they score.
+
+    Args:
+        checks: Callables run in order, each setting fields of
+            ``run.result``.
+        scored: Fields worth one point each when ``true``; ``score``,
+            ``max_score`` and ``passed`` are appended. None for tasks
+            that score themselves in a check (D1).
+    """
+
+    def __init__(self, checks, scored=None):
+        self.checks = checks
+        self.scored = scored
+
+    def verify(self, run):
+        for check in self.checks:
+            check(run)
+        if self.scored is not None:
+            score = sum(run.result.get(key) is True for key in self.scored)
+            run.result["score"] = score
+            run.result["max_score"] = len(self.scored)
+            run.result["passed"] = score == len(self.scored)
+        return run.result
+
+
+C1_CASES = [("", 0, None), ("a", 1, None), ("abcabcbb", 3, None), ("bbbbb", 1, None),
+            ("pwwkew", 3, None), ("abba", 2, None)]
+C7_CASES = [
+    ([], [], "empty input"),
+    ([[1, 3]], [[1, 3]], "single interval"),
+    ([[1, 3], [2, 6], [8, 10], [15, 18]], [[1, 6], [8, 10], [15, 18]], "basic merge"),
+    ([[1, 4], [4, 5]], [[1, 5]], "adjacent intervals"),
+    ([[1, 4], [0, 4]], [[0, 4]], "overlapping with earlier start"),
+    ([[1, 4], [2, 3]], [[1, 4]], "nested interval"),
+    ([[2, 3], [4, 5], [6, 7], [8, 9], [1, 10]], [[1, 10]], "one covers all"),
+    ([[1, 4], [0, 2], [3, 5]], [[0, 5]], "three-way merge"),
+]
+C1_FIX_PATTERNS = (r"max.*window_start|window_start.*max"
+                   r"|char_index\[char\].*>=.*window_start|window_start.*<=.*char_index")
+
+TASKS = {
+    "A1-create-file": Task(
+        [file_exists("hello.txt"), a1_content,
+         tool_usage([("write", "write_tool_calls"), ("bash", "bash_tool_calls")]),
+         a1_no_extra_files],
+        ["file_exists", "content_correct", "used_tools", "no_extra_files"]),
+    "A2-count-lines": Task(
+        [file_exists("output.txt"), a2_content,
+         tool_usage([("read", "read_calls"), ("write", "write_calls"), ("bash", "bash_calls")]),
+         a2_input_preserved],
+        ["file_exists", "content_correct", "used_tools", "input_preserved"]),
+    "B1-fizzbuzz": Task(
+        [file_exists("fizzbuzz.py"), py_compiles("fizzbuzz.py", error_key="syntax_error"),
+         b1_output, tool_usage([("write", "write_calls"), ("bash", "bash_calls")])],
+        ["file_exists", "valid_syntax", "output_correct", "used_tools"]),
+    "B2-react-counter": Task(
+        [file_exists("Counter.jsx"), grep("Counter.jsx", "useState", "has_useState"),
+         b2_testids, grep("Counter.jsx", r"export\s+default|module\.exports", "has_export"),
+         tool_usage([("write", "write_calls"), ("bash", "bash_calls")])],
+        ["file_exists", "has_useState", "has_all_testids", "has_export", "used_tools"]),
+    "C1-debug-the-bug": Task(
+        [file_exists("buggy.py"), py_compiles("buggy.py"),
+         run_cases("buggy.py", "longest_unique_substring", C1_CASES,
+                   lambda value, label: f"'{value}'"),
+         grep("buggy.py", C1_FIX_PATTERNS, "correct_fix_pattern"),
+         tool_usage([("read", "read_calls"), ("edit", "edit_calls"), ("write", "write_calls"),
+                     ("bash", "bash_calls")])],
+        ["file_exists", "valid_syntax", "all_tests_pass", "correct_fix_pattern", "used_tools"]),
+    "C3-tdd-implement": Task(
+        [file_exists("solution.py"), py_compiles("solution.py"),
+         grep("solution.py", "class Stack", "has_stack_class"), run_unittest("test_solution"),
+         c3_methods,
+         tool_usage([("read", "read_calls"), ("write", "write_calls"), ("bash", "bash_calls")])],
+        ["file_exists", "valid_syntax", "has_stack_class", "has_all_methods", "all_tests_pass",
+         "used_tools"]),
+    "C4-data-pipeline": Task(
+        [file_exists("summary.csv"), c4_header, c4_row_count, c4_data, c4_sort,
+         tool_usage([("read", "read_calls"), ("write", "write_calls"), ("bash", "bash_calls")])],
+        ["file_exists", "correct_headers", "correct_row_count", "data_correct", "correct_sort",
+         "used_tools"]),
+    "C7-merge-intervals": Task(
+        [file_exists("intervals.py"), py_compiles("intervals.py"),
+         grep("intervals.py", "def merge_intervals", "has_function"),
+         run_cases("intervals.py", "merge_intervals", C7_CASES, lambda value, label: label),
+         tool_usage([("read", "read_calls"), ("write", "write_calls"), ("bash", "bash_calls")])],
+        ["file_exists", "valid_syntax", "has_function", "all_tests_pass", "used_tools"]),
+    "D1-incremental-system-design": Task([d1_structure, d1_tools, d1_score]),
+    "E1-handle-missing-file": Task(
+        [file_exists("report.txt"), e1_content, e1_tools],
+        ["file_exists", "content_correct", "attempted_read", "used_tools", "did_not_create_data"]),
+}
+
+
+def verify(task, workspace, audit=""):
+    """Verify one workspace; return the result verify.sh would print.
+
+    Raises:
+        KeyError: If ``task`` has no declaration in ``TASKS``.
+    """
+    return TASKS[task].verify(Run(task, workspace, audit))
+
+
+# ============================================================
+# ISOLATION
+# ============================================================
+def _verify_worker(conn, task, workspace, audit):
+    os.setsid()
+    try:
+        reply = ("ok", verify(task, workspace, audit))
+    except BaseException as e:
+        # Agent code may raise anything, KeyboardInterrupt included.
+        reply = ("error", f"{type(e).__name__}: {e}")
+    conn.send(reply)
+    conn.close()
+
+
+def verify_isolated(task, workspace, audit="", timeout=VERIFY_TIMEOUT_SECONDS):
+    """``verify`` in a fresh worker process, killed after ``timeout`` seconds.
+
+    Blocks the calling thread; the result arrives through a pipe.
+
+    Raises:
+        RuntimeError: If verification timed out, raised, or the worker
+            died before replying.
+    """
+    context = multiprocessing.get_context("forkserver")
+    receiver, sender = context.Pipe(duplex=False)
+    worker = context.Process(target=_verify_worker, args=(sender, task, str(workspace), audit))
+    worker.start()
+    sender.close()
+    reply = None
+    try:
+        ready = multiprocessing.connection.wait([receiver, worker.sentinel], timeout)
+        if receiver in ready:
+            with contextlib.suppress(EOFError):
+                reply = receiver.recv()
+    finally:
+        receiver.close()
+        _kill_worker(worker)
+    if not ready:
+        raise RuntimeError(f"verification timed out after {timeout}s")
+    if reply is None:
+        raise RuntimeError(f"verification worker exited with {worker.exitcode}")
+    status, value = reply
+    if status != "ok":
+        raise RuntimeError(f"verification failed: {value}")
+    return value
+
+
+def _kill_worker(worker):
+    """Kill the worker's session, including anything the agent code started."""
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(worker.pid, signal.SIGKILL)
+    worker.kill()
+    worker.join()
+
+
+# ============================================================
+# RUN DIRECTORIES
+# ============================================================
+def find_audit(run_dir, task):
+    """Path of a run's audit.jsonl, or "" as harness.sh passes it."""
+    for candidate in (run_dir / "agents" / task / "audit.jsonl",
+                      run_dir / "audit.jsonl",
+                      run_dir / "workspace" / "audit.jsonl"):
+        if candidate.is_file():
+            return str(candidate)
+    return ""
+
+
+def run_dirs(results_dir):
+    """Every ``<model>/<task>/run-N`` directory under ``results_dir``."""
+    return sorted(path.parent for path in results_dir.glob("*/*/run-*/workspace") if path.is_dir())
+
+
+def verify_run_dir(run_dir, timeout=VERIFY_TIMEOUT_SECONDS):
+    """Verify a run directory with ``verify_isolated``; return ``(task, metrics)``.
+
+    Raises:
+        RuntimeError: As ``verify_isolated``.
+    """
+    task = run_dir.parent.name
+    return task, verify_isolated(task, run_dir / "workspace", find_audit(run_dir, task), timeout)
+
+
+def compare_with_shell(run_dir, task, metrics):
+    """Differences between ``metrics`` and the output of the task's verify.sh."""
+    proc = subprocess.run(["bash", str(TASKS_DIR / task / "verify.sh"), str(run_dir / "workspace"),
+                           find_audit(run_dir, task)], capture_output=True, text=True)
+    try:
+        expected = json.loads(proc.stdout)
+    except json.JSONDecodeError:
+        return [f"verify.sh printed no JSON (exit {proc.returncode})"]
+    problems = []
+    if list(expected) != [key for key in metrics if key in expected]:
+        problems.append(f"field order: verify.sh {list(expected)}, here {list(metrics)}")
+    for key in expected.keys() | metrics.keys():
+        if key == "test_summary":
+            continue
+        if expected.get(key, "<missing>") != metrics.get(key, "<missing>"):
+            problems.append(f"{key}: verify.sh {expected.get(key, '<missing>')!r}, "
+                            f"here {metrics.get(key, '<missing>')!r}")
+    return problems
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify benchmark runs without verify.sh.")
+    parser.add_argument("run_dirs", nargs="*", type=Path,
+                        help="run directories (default: every run under --results-dir)")
+    parser.add_argument("--results-dir", type=Path, default=RESULTS_DIR,
+                        help="where to find runs when none are given (default: results/)")
+    parser.add_argument("--write", action="store_true",
+                        help="update each run's metrics.json, keeping its run metadata")
+    parser.add_argument("--compare", action="store_true",
+                        help="also run verify.sh on each run and report differences")
+    parser.add_argument("--timeout", type=float, default=VERIFY_TIMEOUT_SECONDS,
+                        help="seconds before a run's verification is killed "
+                             f"(default: {VERIFY_TIMEOUT_SECONDS})")
+    args = parser.parse_args(argv)
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+
+    dirs = [path.resolve() for path in args.run_dirs] or run_dirs(args.results_dir.resolve())
+    unknown = sorted({path.parent.name for path in dirs} - set(TASKS))
+    if unknown:
+        parser.error(f"no checks declared for: {', '.join(unknown)}")
+
+    start = time.perf_counter()
+    passed = mismatched = errors = 0
+    for run_dir in dirs:
+        try:
+            task, metrics = verify_run_dir(run_dir, args.timeout)
+        except RuntimeError as e:
+            print(f"ERROR       {run_dir}: {e}")
+            errors += 1
+            continue
+        ok = metrics.get("passed", metrics.get("structural_passed")) is True
+        passed += ok
+        score = (f"{metrics['score']}/{metrics['max_score']}" if "score" in metrics
+                 else f"{metrics['structural_score']}/{metrics['structural_max']}")
+        print(f"{'PASS' if ok else 'FAIL'} {score:>5}  {run_dir}")
+        if args.compare:
+            problems = compare_with_shell(run_dir, task, metrics)
+            mismatched += bool(problems)
+            for problem in problems:
+                print(f"    MISMATCH {problem}")
+        if args.write:
+            metrics_file = run_dir / "metrics.json"
+            previous = json.loads(metrics_file.read_text()) if metrics_file.is_file() else {}
+            metrics.update((key, previous[key]) for key in RUN_FIELDS if key in previous)
+            metrics_file.write_text(json.dumps(metrics, indent=2, ensure_ascii=False) + "\n")
+    seconds = time.perf_counter() - start
+    print(f"{passed}/{len(dirs)} runs passed, verified in {seconds:.2f}s")
+    if errors:
+        print(f"{errors}/{len(dirs)} runs could not be verified")
+    if args.compare:
+        print(f"{len(dirs) - mismatched - errors}/{len(dirs)} runs match verify.sh")
+    return 1 if errors or mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
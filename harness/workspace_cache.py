@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Cache of prepared run directories, cloned into new runs instead of rebuilt.
+
+Usage:
+    python3 harness/workspace_cache.py warm [tasks...]
+    python3 harness/workspace_cache.py list
+    python3 harness/workspace_cache.py prune
+
+Preparing a run the way ``harness.sh`` does costs a ``git init``, an
+empty ``git commit`` and a ``bash setup.sh``, so three forks per run.
+Across a sweep of hundreds of runs that are all identical per task,
+that adds up. This module prepares each task once into a template:
+
+    <cache>/<task>-<key>/
+        .git/                 after git init + the empty commit, minus
+                              the ``hooks/*.sample`` files
+        workspace/            plan.md plus whatever setup.sh created
+        setup.log             setup.sh's output, replayed into each run
+
+``key`` is a SHA-256 over the relative path, mode and contents of every
+file in the task directory. Editing anything there (plan, setup,
+fixtures) therefore selects a new template, and ``prune`` removes the
+old ones. Templates are built in a scratch directory and renamed into
+place, so concurrent builders never see a half-built one.
+
+A new run directory is cloned from the template file by file:
+
+    - files under ``.git/objects`` are hardlinked; git never modifies
+      an object file in place
+    - every other file is reflinked (``FICLONE``) where the filesystem
+      supports it, and copied otherwise
+
+Workspace files are never hardlinked, because an agent that rewrites
+one in place would corrupt the template. Every run shares the template's
+initial commit, including its hash and timestamp.
+
+Only fresh run directories are cloned. When the workspace already
+exists (a rerun into the same directory), ``setup.sh`` has to run
+against what is there, so the caller falls back to the uncached path.
+"""
+
+import argparse
+import asyncio
+import errno
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TASKS_DIR = ROOT / "tasks"
+CACHE_DIR = ROOT / ".cache" / "workspaces"
+
+# Bump when the template layout or build steps change.
+TEMPLATE_VERSION = b"1"
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+def task_key(task_dir):
+    """Hex digest identifying the contents of ``task_dir``."""
+    digest = hashlib.sha256(TEMPLATE_VERSION)
+    for path in sorted(task_dir.rglob("*")):
+        if "__pycache__" in path.parts or not path.is_file():
+            continue
+        digest.update(b"\0%s\0%o\0" % (str(path.relative_to(task_dir)).encode(),
+                                       path.stat().st_mode & 0o777))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+# ============================================================
+# CLONING
+# ============================================================
+def _reflink(src, dst):
+    """Clone ``src`` to ``dst`` sharing its blocks; False if unsupported."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL,
+                           errno.EBADF, errno.ENOSYS):
+                return False
+            raise
+
+
+def clone_tree(src, dst):
+    """Recreate ``src`` at ``dst``: git objects hardlinked, the rest cloned.
+
+    Returns:
+        Number of files created.
+    """
+    reflink = True
+    files = 0
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel = os.path.relpath(dirpath, src)
+        target = os.path.join(dst, rel) if rel != "." else str(dst)
+        os.makedirs(target, exist_ok=True)
+        immutable = rel == os.path.join(".git", "objects") or \
+            rel.startswith(os.path.join(".git", "objects", ""))
+        for name in filenames:
+            s, d = os.path.join(dirpath, name), os.path.join(target, name)
+            if os.path.islink(s):
+                os.symlink(os.readlink(s), d)
+            elif immutable:
+                os.link(s, d)
+            else:
+                if not (reflink and _reflink(s, d)):
+                    reflink = False
+                    shutil.copyfile(s, d)
+                os.chmod(d, os.stat(s).st_mode & 0o7777)
+            files += 1
+    return files
+
+
+# ============================================================
+# TEMPLATES
+# ============================================================
+def _git(*args, cwd):
+    proc = subprocess.run(["git", *args], cwd=cwd, stdin=subprocess.DEVNULL,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode:
+        raise RuntimeError(f"git {args[0]} exited with {proc.returncode}:\n"
+                           f"{proc.stderr.decode('utf-8', 'replace')}")
+
+
+def _build(task_dir, scratch):
+    workspace = scratch / "workspace"
+    workspace.mkdir(parents=True)
+    _git("init", "-q", cwd=scratch)
+    _git("commit", "--allow-empty", "-m", "Initialize benchmark run", "-q", cwd=scratch)
+    # Inert examples, about half the files a clone would otherwise create.
+    for sample in (scratch / ".git" / "hooks").glob("*.sample"):
+        sample.unlink()
+    shutil.copy(task_dir / "plan.md", workspace)
+    output = b""
+    if (task_dir / "setup.sh").is_file():
+        proc = subprocess.run(["bash", str(task_dir / "setup.sh")], cwd=workspace,
+                              stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT)
+        output = proc.stdout
+        if proc.returncode:
+            raise RuntimeError(f"{task_dir.name}/setup.sh exited with {proc.returncode}:\n"
+                               f"{output.decode('utf-8', 'replace')}")
+    (scratch / "setup.log").write_bytes(output)
+
+
+def build_template(task_dir, path):
+    """Prepare a run directory for ``task_dir`` at ``path`` as harness.sh would.
+
+    Raises:
+        RuntimeError: If git or setup.sh fails.
+    """
+    scratch = Path(f"{path}.tmp-{os.getpid()}")
+    shutil.rmtree(scratch, ignore_errors=True)
+    try:
+        _build(task_dir, scratch)
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    try:
+        os.rename(scratch, path)
+    except OSError:
+        # Another process finished the same template first.
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not path.is_dir():
+            raise
+
+
+class WorkspaceCache:
+    """Per-task templates under ``cache_dir``, built on first use.
+
+    Keys are computed once per task for the lifetime of the object, so
+    one cache instance should not outlive edits to the tasks it serves.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, tasks_dir=TASKS_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.tasks_dir = Path(tasks_dir)
+        self._paths = {}
+        self._locks = {}
+
+    def template_path(self, task):
+        if task not in self._paths:
+            key = task_key(self.tasks_dir / task)
+            self._paths[task] = self.cache_dir / f"{task}-{key[:16]}"
+        return self._paths[task]
+
+    async def template(self, task):
+        """Path of the task's template, building it if needed."""
+        path = self.template_path(task)
+        if path.is_dir():
+            return path
+        lock = self._locks.setdefault(task, asyncio.Lock())
+        async with lock:
+            if not path.is_dir():
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                await asyncio.to_thread(build_template, self.tasks_dir / task, path)
+        return path
+
+    async def prepare(self, task, run_dir, log):
+        """Clone the task's template into a fresh ``run_dir``.
+
+        Args:
+            task: Task id.
+            run_dir: Run directory; only its ``workspace`` must not exist.
+            log: Binary stream that gets setup.sh's recorded output.
+
+        Returns:
+            True if the run was cloned. False if its workspace already
+            exists, in which case the caller must prepare it itself.
+        """
+        if (run_dir / "workspace").exists():
+            return False
+        template = await self.template(task)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        if (run_dir / ".git").exists():
+            clone_tree(template / "workspace", run_dir / "workspace")
+        else:
+            for name in (".git", "workspace"):
+                clone_tree(template / name, run_dir / name)
+        log.write((template / "setup.log").read_bytes())
+        return True
+
+    def entries(self):
+        """Cached templates as ``(path, current)`` pairs.
+
+        A template is current if it matches its task's present contents.
+        """
+        if not self.cache_dir.is_dir():
+            return []
+        entries = []
+        for path in sorted(self.cache_dir.iterdir()):
+            if not path.is_dir() or ".tmp-" in path.name:
+                continue
+            task = path.name.rsplit("-", 1)[0]
+            current = (self.tasks_dir / task).is_dir() and path == self.template_path(task)
+            entries.append((path, current))
+        return entries
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage cached run templates.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR,
+                        help="template directory (default: .cache/workspaces)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm = commands.add_parser("warm", help="build templates ahead of a sweep")
+    warm.add_argument("tasks", nargs="*", help="task ids (default: all)")
+    commands.add_parser("list", help="show cached templates")
+    commands.add_parser("prune", help="remove templates of changed or deleted tasks")
+    args = parser.parse_args(argv)
+
+    cache = WorkspaceCache(args.cache_dir)
+    if args.command == "warm":
+        tasks = args.tasks or sorted(p.name for p in TASKS_DIR.iterdir()
+                                     if (p / "plan.md").is_file())
+        unknown = [task for task in tasks if not (TASKS_DIR / task / "plan.md").is_file()]
+        if unknown:
+            parser.error(f"unknown tasks: {', '.join(unknown)}")
+        for task in tasks:
+            try:
+                print(asyncio.run(cache.template(task)))
+            except RuntimeError as e:
+                print(f"cannot build template for {task}: {e}", file=sys.stderr)
+                return 1
+    elif args.command == "list":
+        for path, current in cache.entries():
+            print(f"{'current' if current else 'stale  '}  {path}")
+    else:
+        for path, current in cache.entries():
+            if not current:
+                shutil.rmtree(path)
+                print(f"removed {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
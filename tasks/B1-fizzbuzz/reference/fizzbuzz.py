@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Reference FizzBuzz, from the plan's list to billions of labels.
+
+Usage:
+    python3 fizzbuzz.py                                  # prints fizzbuzz(15)
+    python3 fizzbuzz.py --stop N [--start A] [-o labels.txt]
+
+``fizzbuzz(n)`` is the function plan.md specifies. The label of ``i``
+depends only on ``i % 15``, and every other API uses that period
+instead of testing divisibility:
+
+    fizzbuzz_at(i)          label of one number, O(1)
+    fizzbuzz_range(a, b)    labels of ``a <= i < b`` as a list
+    iter_fizzbuzz(a, b)     the same lazily, unbounded when ``b`` is None
+    write_fizzbuzz(f, a, b) labels one per line to a text stream
+    fizzbuzz_array(a, b)    the same range as a NumPy string array
+
+Every range call starts anywhere, so N processes can each produce a
+slice of ``[1, 10**9)`` and their outputs, concatenated in order, equal
+one serial run. ``--start``/``--stop`` expose that on the command line.
+
+``write_fizzbuzz`` writes whole periods at a time. Fifteen consecutive
+labels starting at a multiple of 15 always form the same text with
+eight numbers filled in. A chunk of ``k`` periods is therefore that
+pattern repeated ``k`` times and filled by one ``%`` format, and its
+``8 * k`` numbers are built with slice assignment rather than a loop.
+Only the partial periods at either end go through ``fizzbuzz_range``.
+"""
+
+import argparse
+import sys
+
+# Label of i by i % 15; None where the label is the number itself.
+_CYCLE = ("FizzBuzz", None, None, "Fizz", None, "Buzz", "Fizz", None,
+          None, "Fizz", "Buzz", None, "Fizz", None, None)
+
+# One period starting after a multiple of 15: offsets of its numbers and
+# its text with those numbers left as %d.
+_NUMBER_OFFSETS = tuple(r for r in range(1, 16) if _CYCLE[r % 15] is None)
+_PERIOD = "".join(f"{_CYCLE[r % 15]}\n" if _CYCLE[r % 15] else "%d\n" for r in range(1, 16))
+
+# Periods formatted per write: 15 * 4096 labels, about 300 KB of text.
+CHUNK_PERIODS = 4096
+
+
+def fizzbuzz(n):
+    """Return the FizzBuzz labels for 1 to ``n`` as a list of strings."""
+    return fizzbuzz_range(1, n + 1)
+
+
+def fizzbuzz_at(i):
+    """Return the FizzBuzz label of the integer ``i``."""
+    return _CYCLE[i % 15] or str(i)
+
+
+def fizzbuzz_range(start, stop):
+    """Return the labels of ``start <= i < stop`` as a list of strings."""
+    labels = [None] * max(stop - start, 0)
+    for r, label in enumerate(_CYCLE):
+        first = start + (r - start) % 15
+        numbers = range(first, stop, 15)
+        labels[first - start::15] = [label] * len(numbers) if label else map(str, numbers)
+    return labels
+
+
+def iter_fizzbuzz(start=1, stop=None):
+    """Yield the labels of ``start <= i < stop``, or forever if ``stop`` is None.
+
+    Labels are produced a chunk of whole periods at a time, so memory
+    stays constant however long the range is.
+    """
+    step = 15 * CHUNK_PERIODS
+    while stop is None or start < stop:
+        end = start + step if stop is None else min(start + step, stop)
+        yield from fizzbuzz_range(start, end)
+        start = end
+
+
+def write_fizzbuzz(f, start, stop, chunk_periods=CHUNK_PERIODS):
+    """Write the labels of ``start <= i < stop`` to ``f``, one per line.
+
+    Args:
+        f: Text stream.
+        start: First number.
+        stop: One past the last number.
+        chunk_periods: Periods of 15 labels formatted per write.
+
+    Returns:
+        Number of labels written.
+    """
+    if stop <= start:
+        return 0
+    # Partial period up to the first number following a multiple of 15.
+    aligned = start + (1 - start) % 15
+    head_end = min(aligned, stop)
+    if head_end > start:
+        f.write("".join(label + "\n" for label in fizzbuzz_range(start, head_end)))
+    base = aligned - 1
+    periods = (stop - aligned) // 15 if stop > aligned else 0
+    template = _PERIOD * chunk_periods
+    width = len(_NUMBER_OFFSETS)
+    numbers = [0] * (width * chunk_periods)
+    while periods:
+        k = min(periods, chunk_periods)
+        if k < chunk_periods:
+            template = _PERIOD * k
+            numbers = [0] * (width * k)
+        for j, offset in enumerate(_NUMBER_OFFSETS):
+            numbers[j::width] = range(base + offset, base + offset + 15 * k, 15)
+        f.write(template % tuple(numbers))
+        base += 15 * k
+        periods -= k
+    if base + 1 < stop:
+        f.write("".join(label + "\n" for label in fizzbuzz_range(base + 1, stop)))
+    return stop - start
+
+
+def fizzbuzz_array(start, stop):
+    """Return the labels of ``start <= i < stop`` as a NumPy string array.
+
+    Requires NumPy.
+    """
+    import numpy as np
+
+    if start < 1:
+        numbers = np.arange(start, stop, dtype=np.int64)
+        labels = numbers.astype(np.str_)
+        labels = labels.astype(f"<U{max(labels.dtype.itemsize // 4, len('FizzBuzz'))}")
+    else:
+        labels = _decimal_strings(np, start, stop, len("FizzBuzz"))
+    for r, label in enumerate(_CYCLE):
+        if label:
+            labels[(r - start) % 15::15] = label
+    return labels
+
+
+def _decimal_strings(np, start, stop, min_width):
+    """Format ``start <= i < stop`` (``start >= 1``) as a ``<U`` array.
+
+    ``astype(str)`` formats element by element. Here the numbers are
+    split into runs of equal digit count, and each run gets its UCS-4
+    code points one digit column at a time with vectorized ``divmod``.
+    """
+    n = max(stop - start, 0)
+    width = max(len(str(stop - 1)) if n else 0, min_width)
+    codes = np.zeros((n, width), dtype=np.uint32)
+    lo = start
+    while lo < stop:
+        digits = len(str(lo))
+        hi = min(stop, 10 ** digits)
+        rest = np.arange(lo, hi, dtype=np.int64)
+        block = codes[lo - start:hi - start]
+        for column in range(digits - 1, -1, -1):
+            rest, digit = np.divmod(rest, 10)
+            block[:, column] = digit
+            block[:, column] += ord("0")
+        lo = hi
+    return codes.view(f"<U{width}").reshape(-1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FizzBuzz labels, one per line.")
+    parser.add_argument("--start", type=int, default=1,
+                        help="first number (default: 1)")
+    parser.add_argument("--stop", type=int, default=None,
+                        help="one past the last number; without it, print fizzbuzz(15)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file for the labels (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.stop is None:
+        print(fizzbuzz(15))
+        return 0
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        write_fizzbuzz(dst, args.start, args.stop)
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Reference longest-unique-substring, single string and batch.
+
+Usage:
+    python3 longest_unique.py [lines.txt|-] [--workers N] [--chunk-lines N]
+    python3 longest_unique.py --stream [big.txt|-]
+
+``buggy.py`` is the C1 task fixture and stays buggy on purpose; this is the
+fixed sliding window plus batch tooling around it. Every function returns
+``(start, length)``: the offset of the first longest substring without a
+repeated character, and its length (``(0, 0)`` for empty input).
+
+Bytes and ASCII strings take a fast path that tracks last positions in a
+fixed 256-entry list indexed by byte value instead of a dict. Other
+strings use the dict, so offsets are always in characters of the input.
+
+The batch API processes lines from an iterable or a file in a process
+pool. Lines are sent in chunks of ``chunk_lines`` with a bounded number
+of chunks in flight, so an input of millions of lines is never held in
+memory at once, and results come back in input order. The CLI prints
+``start length`` for every input line.
+
+The streaming API scans one input too long to hold, such as a
+multi-gigabyte file, as a sequence of chunks. ``StreamScanner`` carries
+only the window state across chunk boundaries, so offsets stay absolute
+and the result equals ``longest_unique_span`` of the concatenation.
+``scan_file`` feeds it zero-copy slices of a memory map; with NumPy the
+per-chunk scan is vectorized. ``--stream`` prints the single result.
+"""
+
+import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Lines per work unit sent to a pool worker.
+CHUNK_LINES = 10_000
+
+# Chunks queued per worker, enough to keep the pool busy.
+CHUNKS_IN_FLIGHT = 2
+
+# Bytes (or characters) per read when streaming one long input.
+CHUNK_BYTES = 1 << 20
+
+
+def longest_unique_substring(s):
+    """Return the length of the longest substring without repeating characters."""
+    return longest_unique_span(s)[1]
+
+
+def longest_unique_span(s):
+    """Return ``(start, length)`` of the first longest repeat-free substring.
+
+    Args:
+        s: A ``str`` or bytes-like object.
+    """
+    if isinstance(s, str):
+        if s.isascii():
+            return _bytes_span(s.encode("ascii"))
+        return _dict_span(s)
+    return _bytes_span(s)
+
+
+def _dict_span(s):
+    """Sliding window with a dict of last positions, for any str."""
+    last = {}
+    window_start = 0
+    best_start = best_length = 0
+    for window_end, char in enumerate(s):
+        previous = last.get(char, -1)
+        if previous >= window_start:
+            window_start = previous + 1
+        last[char] = window_end
+        if window_end - window_start >= best_length:
+            best_start, best_length = window_start, window_end - window_start + 1
+    return best_start, best_length
+
+
+def _bytes_span(data):
+    """Sliding window with a 256-entry list of last positions, for bytes."""
+    last = [-1] * 256
+    window_start = 0
+    best_start = best_length = 0
+    for window_end, byte in enumerate(data):
+        previous = last[byte]
+        if previous >= window_start:
+            window_start = previous + 1
+        last[byte] = window_end
+        if window_end - window_start >= best_length:
+            best_start, best_length = window_start, window_end - window_start + 1
+    return best_start, best_length
+
+
+# ============================================================
+# BATCH
+# ============================================================
+def _spans(lines):
+    """Worker: ``longest_unique_span`` for every line of a chunk."""
+    return [longest_unique_span(line) for line in lines]
+
+
+def _chunks(lines, size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def batch_spans(lines, workers=None, chunk_lines=CHUNK_LINES):
+    """Yield ``longest_unique_span`` for every line, in input order.
+
+    Args:
+        lines: Iterable of ``str`` or bytes lines, without line endings.
+        workers: Pool size (default: ``os.cpu_count()``); 1 runs in-process.
+        chunk_lines: Lines per work unit.
+
+    Yields:
+        ``(start, length)`` per line.
+    """
+    if workers == 1:
+        for line in lines:
+            yield longest_unique_span(line)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        limit = CHUNKS_IN_FLIGHT * workers
+        pending = []
+        for chunk in _chunks(lines, chunk_lines):
+            pending.append(pool.submit(_spans, chunk))
+            if len(pending) >= limit:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def read_lines(f):
+    """Yield the lines of a binary stream without their line endings.
+
+    ASCII lines stay bytes (fast path); others are decoded as UTF-8, so
+    offsets count characters.
+    """
+    for line in f:
+        line = line.rstrip(b"\r\n")
+        yield line if line.isascii() else line.decode("utf-8")
+
+
+def batch_file(path, workers=None, chunk_lines=CHUNK_LINES):
+    """``batch_spans`` over the lines of a file."""
+    with open(path, "rb") as f:
+        yield from batch_spans(read_lines(f), workers, chunk_lines)
+
+
+# ============================================================
+# STREAMING
+# ============================================================
+class StreamScanner:
+    """Sliding window fed one chunk at a time, in constant memory.
+
+    Only the window state survives between chunks: the last absolute
+    position of every symbol, where the window starts and how much has
+    been consumed. Offsets are absolute from the start of the stream, in
+    bytes for bytes chunks and characters for ``str`` chunks; a scanner
+    takes one kind or the other.
+
+    Bytes chunks are scanned with NumPy when it is installed (see
+    ``_feed_numpy``) and with a 256-entry list otherwise.
+
+    Attributes:
+        position: Symbols consumed so far.
+        best_start: Absolute offset of the first longest window so far.
+        best_length: Its length.
+    """
+
+    def __init__(self):
+        self.position = 0
+        self.best_start = 0
+        self.best_length = 0
+        self._window_start = 0
+        self._last = None
+        self._numpy = None
+
+    @property
+    def span(self):
+        """``(start, length)`` of the first longest window so far."""
+        return self.best_start, self.best_length
+
+    def feed(self, chunk):
+        """Consume the next chunk of the stream and return ``span``.
+
+        Raises:
+            TypeError: If the chunk is ``str`` after bytes, or the reverse.
+        """
+        text = isinstance(chunk, str)
+        if self._last is None:
+            self._last = {} if text else [-1] * 256
+        elif text != isinstance(self._last, dict):
+            raise TypeError("a scanner takes either str or bytes chunks, not both")
+        if not len(chunk):
+            return self.span
+        if text:
+            self._feed_python(chunk, self._last.get)
+        else:
+            if self._numpy is None:
+                try:
+                    import numpy
+                    self._numpy = numpy
+                except ImportError:
+                    self._numpy = False
+            if self._numpy:
+                self._feed_numpy(chunk)
+            else:
+                self._feed_python(chunk, None)
+        return self.span
+
+    def _feed_python(self, chunk, lookup):
+        last = self._last
+        window_start = self._window_start
+        best_start, best_length = self.best_start, self.best_length
+        for window_end, symbol in enumerate(chunk, self.position):
+            previous = lookup(symbol, -1) if lookup else last[symbol]
+            if previous >= window_start:
+                window_start = previous + 1
+            last[symbol] = window_end
+            if window_end - window_start >= best_length:
+                best_start, best_length = window_start, window_end - window_start + 1
+        self._window_start = window_start
+        self.best_start, self.best_length = best_start, best_length
+        self.position += len(chunk)
+
+    def _feed_numpy(self, chunk):
+        """Vectorized window over one bytes chunk.
+
+        The window ending at ``i`` starts one past the latest previous
+        occurrence of any byte in it, i.e. at the running maximum of
+        ``previous[j] + 1`` over ``j <= i``. Previous occurrences come from
+        a stable sort by byte value (a radix sort for ``uint8``): within a
+        run of equal bytes each position's predecessor is the one before
+        it, and the first of a run takes the carried last position.
+        """
+        np = self._numpy
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        n = len(data)
+        base = self.position
+        last = np.array(self._last, dtype=np.int64)
+
+        order = np.argsort(data, kind="stable")
+        ordered = data[order]
+        first = np.empty(n, dtype=bool)
+        first[0] = True
+        np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+        previous = np.empty(n, dtype=np.int64)
+        previous[1:] = order[:-1] + base
+        previous[first] = last[ordered[first]]
+        window_start = np.empty(n, dtype=np.int64)
+        window_start[order] = previous + 1
+        np.maximum(window_start, self._window_start, out=window_start)
+        np.maximum.accumulate(window_start, out=window_start)
+
+        lengths = np.arange(base + 1, base + n + 1, dtype=np.int64) - window_start
+        end = int(np.argmax(lengths))
+        if lengths[end] > self.best_length:
+            self.best_start, self.best_length = int(window_start[end]), int(lengths[end])
+        final = np.empty(n, dtype=bool)
+        final[-1] = True
+        final[:-1] = first[1:]
+        last[ordered[final]] = order[final] + base
+        self._last = last.tolist()
+        self._window_start = int(window_start[-1])
+        self.position += n
+
+
+def scan_chunks(chunks):
+    """Scan a stream given as chunks, yielding the running result.
+
+    Args:
+        chunks: Iterable of ``str`` or bytes-like chunks, all of one kind.
+
+    Yields:
+        ``(position, start, length)`` after every chunk: symbols consumed
+        so far and the first longest window among them.
+    """
+    scanner = StreamScanner()
+    for chunk in chunks:
+        start, length = scanner.feed(chunk)
+        yield scanner.position, start, length
+
+
+def scan_stream(f, chunk_size=CHUNK_BYTES):
+    """``scan_chunks`` over ``f.read(chunk_size)`` calls, text or binary."""
+    return scan_chunks(iter(lambda: f.read(chunk_size), f.read(0)))
+
+
+def scan_file(path, chunk_size=CHUNK_BYTES):
+    """Scan a whole file as one byte string through a memory map.
+
+    Chunks are zero-copy slices of the map, so the scan stays in constant
+    memory and the page cache does the reading.
+
+    Yields:
+        ``(position, start, length)`` after every chunk; offsets in bytes.
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            yield from scan_chunks([])
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                chunks = (view[at:at + chunk_size] for at in range(0, len(view), chunk_size))
+                yield from scan_chunks(chunks)
+            finally:
+                view.release()
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Longest substring without repeats, per line.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="text file, one string per line (default: stdin)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool size (default: CPU count; 1 runs in-process)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES,
+                        help=f"lines per work unit (default: {CHUNK_LINES:,})")
+    parser.add_argument("--stream", action="store_true",
+                        help="scan the whole input as one byte string, newlines included, "
+                             "in constant memory")
+    args = parser.parse_args(argv)
+    if args.chunk_lines < 1:
+        parser.error("--chunk-lines must be at least 1")
+
+    if args.stream:
+        if args.input == "-":
+            progress = scan_stream(sys.stdin.buffer)
+        else:
+            progress = scan_file(args.input)
+        start = length = 0
+        for _, start, length in progress:
+            pass
+        print(f"{start} {length}")
+        return 0
+
+    if args.input == "-":
+        spans = batch_spans(read_lines(sys.stdin.buffer), args.workers, args.chunk_lines)
+    else:
+        spans = batch_file(args.input, args.workers, args.chunk_lines)
+    sys.stdout.writelines(f"{start} {length}\n" for start, length in spans)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
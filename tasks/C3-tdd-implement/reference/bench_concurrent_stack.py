@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Contention benchmark for ConcurrentStack against a fully locked stack.
+
+Usage:
+    python3 bench_concurrent_stack.py [--ops 200000] [--threads 1 4 16 32]
+
+Two workloads per thread count, each ``--ops`` pushes and as many pops
+in total:
+
+    mixed  every thread alternates push and pop, so the stack is rarely
+           empty (the uncontended fast path)
+    split  half the threads only push and half only pop, so consumers
+           keep finding the stack empty and block in ``pop()`` (even
+           thread counts only)
+
+The baseline ``LockedStack`` is the textbook design, with every
+operation under one ``threading.Condition``. After each run the popped
+items are checked to be exactly the pushed ones.
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from concurrent_stack import ConcurrentStack
+
+
+class LockedStack:
+    """Baseline: every operation takes the same condition lock."""
+
+    def __init__(self):
+        self._items = []
+        self._cond = threading.Condition()
+
+    def push(self, item):
+        with self._cond:
+            self._items.append(item)
+            self._cond.notify()
+
+    def pop(self, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise IndexError("pop timed out on empty stack")
+            return self._items.pop()
+
+
+def run(stack, threads, ops, split):
+    """Run one workload; return (seconds, sorted popped items)."""
+    per_thread = ops // threads
+    popped = [[] for _ in range(threads)]
+    start_gate = threading.Barrier(threads + 1)
+
+    def mixed(t):
+        push, pop, out = stack.push, stack.pop, popped[t]
+        start_gate.wait()
+        for i in range(t * per_thread, (t + 1) * per_thread):
+            push(i)
+            out.append(pop())
+
+    def producer(t):
+        push = stack.push
+        start_gate.wait()
+        for i in range(t * per_thread * 2, (t + 1) * per_thread * 2):
+            push(i)
+
+    def consumer(t):
+        pop, out = stack.pop, popped[t]
+        start_gate.wait()
+        for _ in range(per_thread * 2):
+            out.append(pop())
+
+    if split:
+        # Pairs of one producer and one consumer, each moving 2 * per_thread items.
+        workers = [threading.Thread(target=producer, args=(t // 2,)) if t % 2 == 0
+                   else threading.Thread(target=consumer, args=(t,))
+                   for t in range(threads)]
+    else:
+        workers = [threading.Thread(target=mixed, args=(t,)) for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    start_gate.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+    return seconds, sorted(item for out in popped for item in out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = parser.parse_args(argv)
+    if any(threads < 1 for threads in args.threads):
+        parser.error("--threads must be at least 1")
+
+    print(f"{args.ops:,} push/pop pairs per run")
+    print(f"{'threads':>7} {'workload':<8} {'locked ops/s':>14} {'concurrent ops/s':>17} {'speedup':>8}")
+    for threads in args.threads:
+        for split in (False, True):
+            if split and threads % 2:
+                continue
+            rates = []
+            for make in (LockedStack, ConcurrentStack):
+                seconds, items = run(make(), threads, args.ops, split)
+                expected = (args.ops // threads) * threads
+                if items != list(range(expected)):
+                    print(f"MISMATCH: {make.__name__} lost or duplicated items")
+                    return 1
+                rates.append(2 * expected / seconds)
+            workload = "split" if split else "mixed"
+            print(f"{threads:>7} {workload:<8} {rates[0]:>14,.0f} {rates[1]:>17,.0f} "
+                  f"{rates[1] / rates[0]:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
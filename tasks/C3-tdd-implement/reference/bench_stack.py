@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark the list-backed Stack against the array-backed ArrayStack.
+
+Usage:
+    python3 bench_stack.py [--items 2000000] [--batch 1000]
+
+Both stacks get the same random int64 values, first one ``push``/``pop``
+at a time and then in ``--batch``-sized ``push_many``/``pop_many`` calls,
+with ArrayStack fed from an int64 ``array`` as a numeric workload would.
+Memory is what ``tracemalloc`` sees allocated for a full stack, including
+the int objects the list points to. Every pop sequence is checked against
+the pushed values in reverse before timings are printed.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+from solution import ArrayStack, Stack
+
+
+def synthesize(n, seed=0):
+    """Return ``n`` random int64 values."""
+    rng = random.Random(seed)
+    return [rng.randrange(-1 << 63, 1 << 63) for _ in range(n)]
+
+
+def one_by_one(stack, values):
+    """Push then pop every value singly; return (seconds, popped)."""
+    start = time.perf_counter()
+    push = stack.push
+    for value in values:
+        push(value)
+    pop = stack.pop
+    popped = [pop() for _ in range(len(values))]
+    return time.perf_counter() - start, popped
+
+
+def in_batches(stack, values, batch):
+    """Push then pop every value in batches; return (seconds, popped)."""
+    start = time.perf_counter()
+    for at in range(0, len(values), batch):
+        stack.push_many(values[at:at + batch])
+    popped = values[:0]
+    while len(stack):
+        popped.extend(stack.pop_many(min(batch, len(stack))))
+    return time.perf_counter() - start, popped
+
+
+def footprint(make, n):
+    """Bytes allocated while building a stack of ``n`` fresh random values."""
+    rng = random.Random(1)
+    tracemalloc.start()
+    try:
+        stack = make()
+        stack.push_many(rng.randrange(-1 << 63, 1 << 63) for _ in range(n))
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del stack
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args(argv)
+    if args.batch < 1:
+        parser.error("--batch must be at least 1")
+
+    values = synthesize(args.items)
+    expected = values[::-1]
+    # Each stack is fed batches in its own representation: list slices
+    # for Stack, int64 array slices (one memcpy each) for ArrayStack.
+    stacks = [("list", Stack, values), ("array", ArrayStack, array("q", values))]
+    rows = []
+    for name, make, source in stacks:
+        single_s, popped = one_by_one(make(), values)
+        if popped != expected:
+            print(f"MISMATCH popping {name} one by one")
+            return 1
+        batch_s, popped = in_batches(make(), source, args.batch)
+        if list(popped) != expected:
+            print(f"MISMATCH popping {name} in batches")
+            return 1
+        rows.append((name, single_s, batch_s, footprint(make, args.items)))
+
+    n = args.items
+    print(f"{n:,} int64 items, batches of {args.batch:,}")
+    print(f"{'stack':<6} {'single ops/s':>14} {'batch ops/s':>14} {'bytes/item':>11}")
+    for name, single_s, batch_s, size in rows:
+        print(f"{name:<6} {2 * n / single_s:>14,.0f} {2 * n / batch_s:>14,.0f} {size / n:>11.1f}")
+    (_, list_single, list_batch, list_size), (_, array_single, array_batch, array_size) = rows
+    print(f"speedup: single {list_single / array_single:.1f}x, batch {list_batch / array_batch:.1f}x, "
+          f"memory {list_size / array_size:.1f}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
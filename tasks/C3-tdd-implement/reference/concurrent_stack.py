@@ -0,0 +1,197 @@
+"""Thread-safe and asyncio stacks with blocking pops.
+
+``Stack.pop`` in ``solution.py`` is safe for one thread only. Under
+threads, a caller that checks ``is_empty()`` and then pops can lose the
+item to another thread in between. ``ConcurrentStack`` makes every
+operation atomic and adds a blocking ``pop(timeout=...)`` and a
+non-blocking ``try_pop``.
+
+Contention is kept off the common path rather than spread over shards or
+an elimination array. ``list.append``, ``list.extend`` and ``list.pop``
+are each atomic, so pushes and pops of a non-empty stack never touch a
+lock. The condition lock is taken only by a ``pop`` that finds the stack
+empty and must sleep, and by a push while such pops are waiting, as
+counted in ``_waiters``. With 32 threads the lock is therefore contended
+only around empty-stack waits, and LIFO order is kept, which sharding
+would give up.
+
+A sleeping ``pop`` increments ``_waiters`` and retries under the lock
+before waiting. A push appends before it reads ``_waiters``. So either
+the push sees the waiter and notifies it, or the waiter's retry finds
+the item, and no wakeup is lost.
+
+``AsyncStack`` is the same for coroutines on one event loop. A push
+while pops are waiting hands the item straight to the oldest waiter's
+future instead of going through the list.
+
+Empty and timed-out pops raise ``IndexError``, like ``Stack.pop``.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+
+
+class ConcurrentStack:
+    """LIFO stack safe for any number of producer and consumer threads."""
+
+    __slots__ = ("_items", "_cond", "_waiters")
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters = 0
+
+    def push(self, item):
+        """Push ``item``, waking one waiting ``pop`` if there is one."""
+        self._items.append(item)
+        if self._waiters:
+            with self._cond:
+                self._cond.notify()
+
+    def push_many(self, items):
+        """Push every item of an iterable in order, as one atomic step."""
+        items = list(items)
+        self._items.extend(items)
+        if self._waiters:
+            with self._cond:
+                self._cond.notify(len(items))
+
+    def try_pop(self, default=None):
+        """Remove and return the top item, or ``default`` if the stack is empty."""
+        try:
+            return self._items.pop()
+        except IndexError:
+            return default
+
+    def pop(self, timeout=None):
+        """Remove and return the top item, waiting while the stack is empty.
+
+        Args:
+            timeout: Seconds to wait at most; ``None`` waits forever and
+                ``0`` does not wait.
+
+        Raises:
+            IndexError: If the stack is still empty after ``timeout``.
+        """
+        try:
+            return self._items.pop()
+        except IndexError:
+            pass
+        if timeout is not None and timeout <= 0:
+            raise IndexError("pop from empty stack")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiters += 1
+            try:
+                while True:
+                    try:
+                        return self._items.pop()
+                    except IndexError:
+                        pass
+                    if deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise IndexError("pop timed out on empty stack")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+    def peek(self):
+        """Return the top item without removing it.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items[-1]
+        except IndexError:
+            raise IndexError("peek at empty stack") from None
+
+    def is_empty(self):
+        return not self._items
+
+    def size(self):
+        return len(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class AsyncStack:
+    """LIFO stack for coroutines of one event loop, with awaitable pops."""
+
+    __slots__ = ("_items", "_waiters")
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._waiters = collections.deque()
+
+    def push(self, item):
+        """Push ``item``, or hand it directly to the oldest waiting ``pop``."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(item)
+                return
+        self._items.append(item)
+
+    def push_many(self, items):
+        """Push every item of an iterable in order."""
+        for item in items:
+            self.push(item)
+
+    def try_pop(self, default=None):
+        """Remove and return the top item, or ``default`` if the stack is empty."""
+        return self._items.pop() if self._items else default
+
+    async def pop(self, timeout=None):
+        """Remove and return the top item, waiting while the stack is empty.
+
+        Args:
+            timeout: Seconds to wait at most; ``None`` waits forever.
+
+        Raises:
+            IndexError: If the stack is still empty after ``timeout``.
+        """
+        if self._items:
+            return self._items.pop()
+        if timeout is not None and timeout <= 0:
+            raise IndexError("pop from empty stack")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            raise IndexError("pop timed out on empty stack") from None
+        except asyncio.CancelledError:
+            # The item may have been handed over just before the cancel.
+            if waiter.done() and not waiter.cancelled():
+                self._items.append(waiter.result())
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+
+    def peek(self):
+        """Return the top item without removing it.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items[-1]
+        except IndexError:
+            raise IndexError("peek at empty stack") from None
+
+    def is_empty(self):
+        return not self._items
+
+    def size(self):
+        return len(self._items)
+
+    def __len__(self):
+        return len(self._items)
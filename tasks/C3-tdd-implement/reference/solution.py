@@ -0,0 +1,224 @@
+"""Reference implementation of the C3 stack.
+
+``Stack`` is the class ``test_solution.py`` specifies: a LIFO stack of
+any Python objects. ``ArrayStack`` has the same interface, but it stores
+numbers unboxed in an ``array.array`` of one typecode (int64 by default).
+That uses 8 bytes per item, where ``Stack`` needs a pointer plus an int
+object. It also lets ``snapshot`` expose the contents as a ``memoryview``
+without copying. Single pushes and pops are slower than on a list,
+because every value is converted on the way in and boxed on the way
+out; the gains are memory and the bulk operations (``bench_stack.py``).
+
+Both classes also have bulk operations that work on whole slices instead
+of one call per item:
+
+    push_many(items)   push every item, the last one ends on top
+    pop_many(n)        remove the top ``n`` items, returned top first
+    peek_many(n)       the top ``n`` items, top first, without removing
+
+Empty operations raise ``IndexError``, as the tests require. The list or
+array raises it, so the common, non-empty case costs no ``is_empty()``
+check. Bulk operations are all or nothing: asking for more items than
+the stack holds raises ``IndexError`` and leaves the stack unchanged.
+"""
+
+import sys
+from array import array
+
+# Buffer format characters by kind, to match buffers to an array typecode
+# whatever the spelling ("q" and NumPy's "l" are both int64 on Linux).
+_KINDS = {**dict.fromkeys("bhilqn", "int"), **dict.fromkeys("BHILQN", "uint"),
+          **dict.fromkeys("efd", "float")}
+_NATIVE_ORDER = ("", "@", "=", "<" if sys.byteorder == "little" else ">")
+
+
+class Stack:
+    """LIFO stack of arbitrary objects, backed by a list."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = list(items)
+
+    def push(self, item):
+        """Push ``item`` on top of the stack."""
+        self._items.append(item)
+
+    def pop(self):
+        """Remove and return the top item.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items.pop()
+        except IndexError:
+            raise IndexError("pop from empty stack") from None
+
+    def peek(self):
+        """Return the top item without removing it.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items[-1]
+        except IndexError:
+            raise IndexError("peek at empty stack") from None
+
+    def is_empty(self):
+        return not self._items
+
+    def size(self):
+        return len(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def push_many(self, items):
+        """Push every item of an iterable, in order."""
+        self._items.extend(items)
+
+    def pop_many(self, n):
+        """Remove the top ``n`` items and return them as a list, top first.
+
+        Raises:
+            IndexError: If the stack holds fewer than ``n`` items.
+        """
+        top = self.peek_many(n)
+        if n:
+            del self._items[-n:]
+        return top
+
+    def peek_many(self, n):
+        """Return the top ``n`` items as a list, top first.
+
+        Raises:
+            IndexError: If the stack holds fewer than ``n`` items.
+        """
+        _check_count(n, len(self._items))
+        top = self._items[len(self._items) - n:]
+        top.reverse()
+        return top
+
+
+class ArrayStack:
+    """LIFO stack of numbers of one C type, backed by ``array.array``.
+
+    Args:
+        typecode: ``array`` typecode of the items (default ``"q"``,
+            signed 64-bit). Pushing a value the type cannot hold raises
+            ``OverflowError`` or ``TypeError``, as ``array`` does.
+        items: Optional initial items, bottom first.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, typecode="q", items=()):
+        self._items = array(typecode, items)
+
+    @property
+    def typecode(self):
+        return self._items.typecode
+
+    def push(self, item):
+        """Push ``item`` on top of the stack."""
+        self._items.append(item)
+
+    def pop(self):
+        """Remove and return the top item.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items.pop()
+        except IndexError:
+            raise IndexError("pop from empty stack") from None
+
+    def peek(self):
+        """Return the top item without removing it.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        try:
+            return self._items[-1]
+        except IndexError:
+            raise IndexError("peek at empty stack") from None
+
+    def is_empty(self):
+        return not self._items
+
+    def size(self):
+        return len(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def push_many(self, items):
+        """Push every item, in order.
+
+        An ``array`` of the same typecode or any contiguous buffer of the
+        same C type (e.g. an int64 NumPy array for ``"q"``) is copied in
+        one ``memcpy``; other iterables are converted item by item.
+        """
+        if isinstance(items, array) and items.typecode == self._items.typecode:
+            self._items.extend(items)
+            return
+        try:
+            view = memoryview(items)
+        except TypeError:
+            self._items.extend(items)
+            return
+        with view:
+            if view.ndim == 1 and view.c_contiguous and _same_type(view, self._items):
+                self._items.frombytes(view.cast("B"))
+            else:
+                self._items.extend(items)
+
+    def pop_many(self, n):
+        """Remove the top ``n`` items and return them as an array, top first.
+
+        Raises:
+            IndexError: If the stack holds fewer than ``n`` items.
+        """
+        top = self.peek_many(n)
+        if n:
+            del self._items[-n:]
+        return top
+
+    def peek_many(self, n):
+        """Return the top ``n`` items as a new array, top first.
+
+        Raises:
+            IndexError: If the stack holds fewer than ``n`` items.
+        """
+        _check_count(n, len(self._items))
+        top = self._items[len(self._items) - n:]
+        top.reverse()
+        return top
+
+    def snapshot(self):
+        """Return a read-only ``memoryview`` of the items, bottom first.
+
+        The view shares the stack's buffer, so it costs nothing to take
+        but reflects later writes. While it is alive the buffer cannot be
+        resized: pushes and pops raise ``BufferError``. Release it (or use
+        it in a ``with`` block) before changing the stack.
+        """
+        return memoryview(self._items).toreadonly()
+
+
+def _same_type(view, items):
+    """Whether a buffer holds native values of the array's C type."""
+    order, code = view.format[:-1], view.format[-1:]
+    return (order in _NATIVE_ORDER and view.itemsize == items.itemsize
+            and _KINDS.get(code) == _KINDS[items.typecode])
+
+
+def _check_count(n, available):
+    if n < 0:
+        raise ValueError("count must be non-negative")
+    if n > available:
+        raise IndexError(f"cannot take {n} items from a stack of {available}")
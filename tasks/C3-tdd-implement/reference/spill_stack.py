@@ -0,0 +1,151 @@
+"""Stack of numbers that spills its bottom to disk, for very deep DFS.
+
+``SpillStack`` keeps the top of the stack in memory and the rest in a
+temporary file. Pushes and pops only touch the top, so the older part
+can sit on disk until pops reach it.
+
+The items are kept unboxed in an ``array.array``, as in ``ArrayStack``.
+The in-memory top holds at most two pages of ``page_items`` items. When
+a push would exceed that, the bottom page of the top segment is written
+to the backing file. When a pop empties the top segment, the last
+spilled page is read back. Each page moves through its own
+``mmap`` of one page-aligned region of the file. The file is truncated
+as pages come back, so disk use follows the stack's depth.
+
+Because the top segment refills to one page and spills at two, a
+push/pop sequence wobbling around a page boundary moves at most one
+page per ``page_items`` operations. Resident memory stays within
+``2 * page_items`` items plus one page in flight, however deep the stack
+grows. ``size()`` and ``is_empty()`` are O(1): the depth is the number
+of spilled pages times ``page_items`` plus the length of the top.
+"""
+
+import mmap
+import os
+import tempfile
+from array import array
+
+# Items per page: 8 MiB of int64.
+PAGE_ITEMS = 1 << 20
+
+
+class SpillStack:
+    """LIFO stack of numbers of one C type with older pages on disk.
+
+    Args:
+        typecode: ``array`` typecode of the items (default ``"q"``).
+        page_items: Items per page. A page's size in bytes must be a
+            multiple of ``mmap.ALLOCATIONGRANULARITY``.
+        tmp_dir: Directory for the backing file (default: the system
+            temp dir). The file is unlinked on creation.
+
+    Raises:
+        ValueError: If the page size is not a positive multiple of the
+            mapping granularity.
+    """
+
+    __slots__ = ("_top", "_page_items", "_page_bytes", "_pages", "_file")
+
+    def __init__(self, typecode="q", page_items=PAGE_ITEMS, tmp_dir=None):
+        self._top = array(typecode)
+        self._page_items = page_items
+        self._page_bytes = page_items * self._top.itemsize
+        if page_items < 1 or self._page_bytes % mmap.ALLOCATIONGRANULARITY:
+            raise ValueError(f"a page must be a positive multiple of "
+                             f"{mmap.ALLOCATIONGRANULARITY} bytes")
+        self._pages = 0
+        self._file = tempfile.TemporaryFile(prefix="stack-", dir=tmp_dir)
+
+    def close(self):
+        """Discard the contents and the backing file."""
+        self._file.close()
+        self._top = array(self._top.typecode)
+        self._pages = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ============================================================
+    # STACK API
+    # ============================================================
+    def push(self, item):
+        """Push ``item`` on top of the stack."""
+        top = self._top
+        top.append(item)
+        if len(top) > 2 * self._page_items:
+            self._spill()
+
+    def push_many(self, items):
+        """Push every item of an iterable, in order."""
+        for item in items:
+            self.push(item)
+
+    def pop(self):
+        """Remove and return the top item.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        if not self._top:
+            if not self._pages:
+                raise IndexError("pop from empty stack")
+            self._fill()
+        return self._top.pop()
+
+    def peek(self):
+        """Return the top item without removing it.
+
+        Raises:
+            IndexError: If the stack is empty.
+        """
+        if not self._top:
+            if not self._pages:
+                raise IndexError("peek at empty stack")
+            self._fill()
+        return self._top[-1]
+
+    def is_empty(self):
+        return not self._top and not self._pages
+
+    def size(self):
+        return self._pages * self._page_items + len(self._top)
+
+    def __len__(self):
+        return self.size()
+
+    @property
+    def spilled_pages(self):
+        """Pages currently on disk."""
+        return self._pages
+
+    @property
+    def resident_bytes(self):
+        """Bytes of items held in memory."""
+        return len(self._top) * self._top.itemsize
+
+    # ============================================================
+    # PAGING
+    # ============================================================
+    def _map(self, page):
+        return mmap.mmap(self._file.fileno(), self._page_bytes, offset=page * self._page_bytes)
+
+    def _spill(self):
+        """Move the bottom page of the top segment to the end of the file."""
+        page = self._pages
+        os.ftruncate(self._file.fileno(), (page + 1) * self._page_bytes)
+        with self._map(page) as mapped, memoryview(self._top) as view:
+            with view[:self._page_items].cast("B") as bottom:
+                mapped[:] = bottom
+        del self._top[:self._page_items]
+        self._pages = page + 1
+
+    def _fill(self):
+        """Read the last spilled page back into the (empty) top segment."""
+        page = self._pages - 1
+        with self._map(page) as mapped:
+            self._top.frombytes(mapped)
+        os.ftruncate(self._file.fileno(), page * self._page_bytes)
+        self._pages = page
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark the dict-based and columnar paths for Steps 1-3.
+
+Usage:
+    python3 bench_columnar.py [--items 10000000] [--customers 10000]
+
+Synthetic orders are generated directly as columns. The dict path runs
+``pipeline.aggregate`` over order dicts built from those columns in batches
+(building them is not timed), and the columnar path runs ``order_metrics``
+and ``customer_totals`` over the full arrays. Both results are checked
+against each other before timings are printed.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from columnar import OrderColumns, customer_totals, order_metrics
+from parallel import merge_stats
+from pipeline import aggregate
+
+
+def synthesize(n_items, n_customers, seed=0):
+    """Generate ``OrderColumns`` with roughly ``n_items`` items."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 5, n_items // 2 + 1)
+    n_orders = int(np.searchsorted(np.cumsum(sizes), n_items)) + 1
+    sizes = sizes[:n_orders]
+    order = np.repeat(np.arange(n_orders, dtype=np.int64), sizes)
+    return OrderColumns(
+        customers=[f"C{code:06d}" for code in range(n_customers)],
+        customer=rng.integers(0, n_customers, n_orders),
+        completed=rng.random(n_orders) < 0.7,
+        order=order,
+        quantity=rng.integers(1, 6, len(order)),
+        price=np.round(rng.uniform(1, 100, len(order)), 2),
+    )
+
+
+def as_dicts(cols, lo, hi):
+    """Build order dicts for orders ``lo``..``hi`` (not timed)."""
+    first, last = np.searchsorted(cols.order, [lo, hi])
+    order = cols.order[first:last].tolist()
+    quantity = cols.quantity[first:last].tolist()
+    price = cols.price[first:last].tolist()
+    orders = [
+        {
+            "customer": cols.customers[code],
+            "items": [],
+            "status": "completed" if done else "pending",
+        }
+        for code, done in zip(cols.customer[lo:hi].tolist(), cols.completed[lo:hi].tolist())
+    ]
+    for idx, q, p in zip(order, quantity, price):
+        orders[idx - lo]["items"].append({"name": "item", "quantity": q, "price": p})
+    return orders
+
+
+def bench_dicts(cols, batch):
+    stats = {}
+    elapsed = 0.0
+    n_orders = len(cols.customer)
+    for lo in range(0, n_orders, batch):
+        orders = as_dicts(cols, lo, min(lo + batch, n_orders))
+        start = time.perf_counter()
+        merge_stats(stats, aggregate(orders))
+        elapsed += time.perf_counter() - start
+    return stats, elapsed
+
+
+def bench_columnar(cols):
+    start = time.perf_counter()
+    totals, _ = order_metrics(cols)
+    order_count, total_spent = customer_totals(cols, totals)
+    return (order_count, total_spent), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000_000)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=250_000,
+                        help="orders per dict batch (bounds the benchmark's memory)")
+    args = parser.parse_args(argv)
+
+    cols = synthesize(args.items, args.customers)
+    print(f"{len(cols.order):,} items in {len(cols.customer):,} orders, "
+          f"{args.customers:,} customers")
+
+    (order_count, total_spent), columnar_s = bench_columnar(cols)
+    stats, dict_s = bench_dicts(cols, args.batch)
+
+    for code, name in enumerate(cols.customers):
+        count, total = stats.get(name, (0, 0.0))
+        if count != order_count[code] or abs(total - total_spent[code]) > 1e-6 * max(total, 1):
+            print(f"MISMATCH for {name}: dict={count},{total} columnar="
+                  f"{order_count[code]},{total_spent[code]}")
+            return 1
+
+    n = len(cols.order)
+    print(f"{'path':<10} {'seconds':>9} {'items/s':>14}")
+    print(f"{'dict':<10} {dict_s:>9.3f} {n / dict_s:>14,.0f}")
+    print(f"{'columnar':<10} {columnar_s:>9.3f} {n / columnar_s:>14,.0f}")
+    print(f"speedup: {dict_s / columnar_s:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
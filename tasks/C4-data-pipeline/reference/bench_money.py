@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark float, Decimal and integer-cents money arithmetic.
+
+Usage:
+    python3 bench_money.py [--orders 500000] [--customers 1000] [--items 10000000]
+
+Two stages of the stream engine are timed for each representation over
+the same synthetic JSON Lines orders:
+
+    parse+aggregate  decode every line and run the fused Steps 1-3
+    aggregate        Steps 1-3 only, over orders decoded beforehand
+
+The exact totals (from cents) are used to count how many customer totals
+the float path gets wrong before rounding. If NumPy is installed, the
+columnar engine's float64 and int64-cents kernels are timed as well.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+
+from pipeline import aggregate, aggregate_cents
+
+MODES = [
+    ("float", json.JSONDecoder(), aggregate),
+    ("Decimal", json.JSONDecoder(parse_float=Decimal), aggregate),
+    ("cents", json.JSONDecoder(), aggregate_cents),
+]
+
+
+def synthesize(n_orders, n_customers, seed=0):
+    """Return JSON Lines text for ``n_orders`` random orders."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n_orders):
+        order = {
+            "id": f"ORD{i:08d}",
+            "customer": f"C{rng.randrange(n_customers):06d}",
+            "items": [
+                {"name": "item", "quantity": rng.randint(1, 5),
+                 "price": rng.randrange(100, 10000) / 100}
+                for _ in range(rng.randint(1, 4))
+            ],
+            "status": "completed" if rng.random() < 0.7 else "pending",
+            "date": "2024-01-15",
+        }
+        lines.append(json.dumps(order))
+    return lines
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--items", type=int, default=10_000_000,
+                        help="items for the columnar kernels")
+    args = parser.parse_args(argv)
+
+    lines = synthesize(args.orders, args.customers)
+    print(f"{args.orders:,} orders, {args.customers:,} customers")
+    print(f"{'mode':<8} {'parse+aggregate':>16} {'aggregate':>10} {'orders/s':>12}")
+
+    results = {}
+    for name, decoder, agg in MODES:
+        stats, both_s = timed(lambda: agg(decoder.decode(line) for line in lines))
+        orders = [decoder.decode(line) for line in lines]
+        _, agg_s = timed(agg, orders)
+        del orders
+        results[name] = stats
+        print(f"{name:<8} {both_s:>15.3f}s {agg_s:>9.3f}s {args.orders / agg_s:>12,.0f}")
+
+    exact = results["cents"]
+    off = sum(
+        1 for customer, (_, total) in results["float"].items()
+        if Decimal(total) * 100 != exact[customer][1]
+    )
+    decimal_ok = all(
+        total * 100 == exact[customer][1] for customer, (_, total) in results["Decimal"].items()
+    )
+    print(f"float totals not exact before rounding: {off}/{len(exact)}")
+    print(f"Decimal totals exact: {decimal_ok}")
+
+    try:
+        bench_vectorized(args.items, args.customers)
+    except ImportError:
+        print("NumPy not installed; skipping the columnar kernels")
+    return 0
+
+
+def bench_vectorized(n_items, n_customers):
+    """Time the columnar kernels with float64 and int64-cents totals."""
+    from bench_columnar import synthesize as synthesize_columns
+    from columnar import customer_totals, order_metrics
+
+    cols = synthesize_columns(n_items, n_customers)
+    print(f"\ncolumnar kernels, {len(cols.order):,} items")
+    print(f"{'mode':<8} {'seconds':>9} {'items/s':>14}")
+    for name, cents in (("float", False), ("cents", True)):
+        start = time.perf_counter()
+        totals, _ = order_metrics(cols, cents)
+        customer_totals(cols, totals)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<8} {elapsed:>9.3f} {len(cols.order) / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Incremental C4 summaries over an append-mostly order feed.
+
+Per-customer accumulators (in integer cents) persist in a SQLite state
+file, together with a high-water mark for every input file: the byte
+offset just past the last processed order, the last order's ``id`` and
+``date``, the file's size and mtime, and a fingerprint of the bytes just
+before the offset. A run only parses what was appended after the mark.
+
+Feeds record status changes by appending a new version of an order with
+the same ``id``. The state remembers the cents each completed order
+contributed, so a later version first retracts the old contribution and
+then applies its own: ``pending`` -> ``completed`` adds the order,
+``completed`` -> ``cancelled`` removes it. The summary therefore reflects
+the latest version of every order.
+
+If a file shrank or the bytes before its mark changed, it was rewritten
+rather than appended to, and the state is rebuilt from scratch. A run on
+unchanged input only stats the files and reads a few state rows.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import sqlite3
+
+from parallel import _is_array
+from pipeline import READ_SIZE, _SEPARATORS, _WHITESPACE, _decoder, input_files, order_total_cents
+
+# Bytes before the high-water mark hashed to detect in-place rewrites.
+FINGERPRINT_BYTES = 4096
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path        TEXT PRIMARY KEY,
+    is_array    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    offset      INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    last_id     TEXT,
+    last_date   TEXT
+);
+CREATE TABLE IF NOT EXISTS customers (
+    customer    TEXT PRIMARY KEY,
+    order_count INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id          TEXT PRIMARY KEY,
+    customer    TEXT NOT NULL,
+    total_cents INTEGER NOT NULL
+);
+"""
+
+
+# ============================================================
+# READING FROM A HIGH-WATER MARK
+# ============================================================
+def _fingerprint(f, offset):
+    """Hash the bytes just before ``offset`` in the open binary file."""
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _iter_array_from(f, offset):
+    """Yield ``(order, end_offset)`` for array elements after ``offset``.
+
+    ``offset`` is 0 or a previous ``end_offset``: the byte just past an
+    element. Parsing stops at the closing ``]``, so the mark stays before
+    it and a later append that rewrites the bracket is picked up.
+    """
+    f.seek(offset)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    mark, mark_offset = 0, offset  # buf[mark] sits at byte mark_offset
+    started = offset > 0
+    eof = False
+    while True:
+        if not started:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                if buf[pos] != "[":
+                    raise ValueError(f"{f.name}: expected a JSON array")
+                pos += 1
+                started = True
+                continue
+        else:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos < len(buf):
+                if buf[pos] == "]":
+                    return
+                try:
+                    order, end = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    nxt = _WHITESPACE.match(buf, end).end()
+                    if nxt < len(buf) and buf[nxt] in ",]":
+                        mark_offset += len(buf[mark:end].encode("utf-8"))
+                        mark = pos = end
+                        yield order, mark_offset
+                        continue
+                    if eof:
+                        raise json.JSONDecodeError("Expecting ',' delimiter", buf, nxt)
+        if eof:
+            # No closing bracket yet: the writer is mid-append. Everything
+            # before the mark is complete, so stop there.
+            return
+
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buf = buf[mark:] + decoder.decode(chunk, final=eof)
+        pos -= mark
+        mark = 0
+
+
+def _iter_lines_from(f, offset):
+    """Yield ``(order, end_offset)`` for JSON Lines records after ``offset``.
+
+    A final line without a newline is taken only if it already parses;
+    otherwise it is assumed to be mid-write and left for the next run.
+    """
+    f.seek(offset)
+    for line in f:
+        if not line.endswith(b"\n"):
+            if line.strip():
+                try:
+                    order = json.loads(line)
+                except ValueError:
+                    return
+                yield order, offset + len(line)
+            return
+        offset += len(line)
+        if line.strip():
+            yield json.loads(line), offset
+
+
+# ============================================================
+# STATE
+# ============================================================
+class SummaryState:
+    """Persisted per-customer aggregates and per-file high-water marks.
+
+    Args:
+        path: SQLite state file; created on first use.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self):
+        """Forget every mark and aggregate."""
+        with self.conn:
+            self.conn.execute("DELETE FROM sources")
+            self.conn.execute("DELETE FROM customers")
+            self.conn.execute("DELETE FROM orders")
+
+    def _plan(self, files):
+        """Return the ``(file, mark, stat)`` triples that have new bytes.
+
+        ``mark`` is the stored sources row or None for a new file. Raises
+        ``_Rewritten`` if any file was changed other than by appending.
+        """
+        known = {row[0]: row for row in self.conn.execute("SELECT * FROM sources")}
+        if set(known) - set(files):
+            raise _Rewritten("an input file was removed")
+        todo = []
+        for file in files:
+            st = os.stat(file)
+            mark = known.get(file)
+            if mark is not None:
+                _, _, size, mtime_ns, offset, fingerprint, _, _ = mark
+                if st.st_size == size and st.st_mtime_ns == mtime_ns:
+                    continue
+                if st.st_size < offset:
+                    raise _Rewritten(f"{file} shrank")
+                with open(file, "rb") as f:
+                    if _fingerprint(f, offset) != fingerprint:
+                        raise _Rewritten(f"{file} changed before its high-water mark")
+            todo.append((file, mark, st))
+        return todo
+
+    def update(self, path):
+        """Apply orders appended to ``path`` since the previous update.
+
+        Args:
+            path: Orders file or directory of shards.
+
+        Returns:
+            Number of order records processed, or None if no input changed
+            since the previous update.
+        """
+        files = input_files(path)
+        try:
+            todo = self._plan(files)
+        except _Rewritten:
+            self.reset()
+            todo = self._plan(files)
+            if not todo:
+                return 0
+        if not todo:
+            return None
+
+        stats = {
+            customer: [count, cents]
+            for customer, count, cents in self.conn.execute("SELECT * FROM customers")
+        }
+        touched = set()
+        processed = 0
+        with self.conn:
+            for file, mark, st in todo:
+                with open(file, "rb") as f:
+                    if mark is None:
+                        is_array, offset, last_id, last_date = _is_array(f), 0, None, None
+                    else:
+                        is_array, offset, last_id, last_date = bool(mark[1]), mark[4], mark[6], mark[7]
+                    records = _iter_array_from(f, offset) if is_array else _iter_lines_from(f, offset)
+                    for order, offset in records:
+                        self._apply(order, stats, touched)
+                        last_id, last_date = order.get("id"), order.get("date")
+                        processed += 1
+                    fingerprint = _fingerprint(f, offset)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (file, int(is_array), st.st_size, st.st_mtime_ns, offset, fingerprint,
+                     last_id, last_date),
+                )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO customers VALUES (?, ?, ?)",
+                [(customer, *stats[customer]) for customer in touched],
+            )
+        return processed
+
+    def _apply(self, order, stats, touched):
+        """Retract the previous version of ``order`` and apply this one."""
+        order_id = order["id"]
+        old = self.conn.execute(
+            "SELECT customer, total_cents FROM orders WHERE id = ?", (order_id,)
+        ).fetchone()
+        if old is not None:
+            acc = stats[old[0]]
+            acc[0] -= 1
+            acc[1] -= old[1]
+            touched.add(old[0])
+
+        if order["status"] != "completed":
+            if old is not None:
+                self.conn.execute("DELETE FROM orders WHERE id = ?", (order_id,))
+            return
+
+        total = order_total_cents(order)
+        customer = order["customer"]
+        acc = stats.get(customer)
+        if acc is None:
+            stats[customer] = [1, total]
+        else:
+            acc[0] += 1
+            acc[1] += total
+        touched.add(customer)
+        self.conn.execute("INSERT OR REPLACE INTO orders VALUES (?, ?, ?)",
+                          (order_id, customer, total))
+
+    def stats(self):
+        """Return ``{customer: [order_count, total_cents]}`` for summarize()."""
+        return {
+            customer: [count, cents]
+            for customer, count, cents in self.conn.execute(
+                "SELECT * FROM customers WHERE order_count > 0")
+        }
+
+    def marks(self):
+        """Return the stored high-water marks as dicts, one per input file."""
+        cursor = self.conn.execute("SELECT * FROM sources ORDER BY path")
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+
+class _Rewritten(Exception):
+    """An input changed in a way an append cannot explain."""
+
+
+def run_incremental(path, state_path, force=False):
+    """Bring the state at ``state_path`` up to date with ``path``.
+
+    Args:
+        path: Orders file or directory of shards.
+        state_path: SQLite state file.
+        force: Return the aggregates even if no input changed.
+
+    Returns:
+        Dict mapping customer to ``[order_count, total_cents]``, or None if
+        no input changed and ``force`` is false.
+    """
+    with SummaryState(state_path) as state:
+        if state.update(path) is None and not force:
+            return None
+        return state.stats()
@@ -0,0 +1,35 @@
+"""Exact integer-cents money helpers for the C4 pipeline.
+
+Money is converted to integer cents before it is accumulated across
+orders, and totals accumulate in plain ``int`` (``int64`` in the columnar
+engine), so no rounding error builds up across millions of orders and
+``decimal.Decimal``'s per-operation cost is avoided entirely.
+
+Prices are decoded by the C JSON parser as floats, and each order's
+float total is converted once with ``round(amount * 100)``, in every
+engine (vectorized with ``np.rint`` in the columnar one). For amounts
+written with at most two decimals, the float error of one order's
+handful of line items is far below half a cent for any realistic order
+size, so the conversion recovers the exact cents. That is much cheaper
+than a Python-level ``parse_float`` hook or a ``round`` per item.
+Sub-cent amounts are rounded to the nearest cent per order, so every
+engine gives the same cents.
+"""
+
+
+def to_cents(amount):
+    """Convert a dollar amount (float or int) to integer cents."""
+    return round(amount * 100)
+
+
+def div_cents(cents, count):
+    """Divide integer cents by a positive count, rounding half away from zero."""
+    quotient = (2 * abs(cents) + count) // (2 * count)
+    return -quotient if cents < 0 else quotient
+
+
+def format_cents(cents):
+    """Format integer cents as a two-decimal amount, e.g. ``-1.05``."""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
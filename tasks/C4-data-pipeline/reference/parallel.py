@@ -0,0 +1,196 @@
+"""Multi-process sharded aggregation for the C4 pipeline.
+
+The input (one orders file or a directory of shards) is cut into byte-range
+chunks. Every chunk boundary is moved forward to the start of a top-level
+record, so each order belongs to exactly one chunk. Workers in a
+``ProcessPoolExecutor`` aggregate their chunk into a partial per-customer
+table and the parent folds the partials together with ``merge_stats``,
+which is associative, in chunk order.
+
+In cents mode (the default) partial totals are exact integers, so the merge
+reproduces the serial result exactly. Float totals are summed per chunk
+before being combined and can differ from the serial fold in the last bits;
+summaries round to cents, which absorbs that for data priced in cents.
+"""
+
+import codecs
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from pipeline import _SEPARATORS, _WHITESPACE, _decoder, aggregate, aggregate_cents, input_files
+
+# Target size of one work unit. Several chunks per worker keep the pool
+# busy when shards are uneven.
+CHUNK_BYTES = 32 << 20
+
+# Bytes read at a time while looking for a record boundary.
+PROBE_BYTES = 64 << 10
+
+_ORDER_KEYS = ("customer", "items", "status")
+
+
+# ============================================================
+# CHUNKING
+# ============================================================
+def _is_array(f):
+    """Return True if the open binary file holds a top-level JSON array."""
+    f.seek(0)
+    while True:
+        probe = f.read(PROBE_BYTES)
+        if not probe:
+            return False
+        stripped = probe.lstrip()
+        if stripped:
+            return stripped.startswith(b"[")
+
+
+def _next_line_start(f, offset, size):
+    """Return the offset of the first line starting at or after ``offset``."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    pos = offset - 1
+    while True:
+        probe = f.read(PROBE_BYTES)
+        if not probe:
+            return pos
+        newline = probe.find(b"\n")
+        if newline >= 0:
+            return pos + newline + 1
+        pos += len(probe)
+
+
+def _next_record_start(f, offset, size):
+    """Return the offset of the first array element at or after ``offset``.
+
+    A candidate ``{`` is accepted when it decodes to an order-shaped object
+    followed by ``,`` or ``]``. Braces of nested item objects or inside
+    string values fail one of those checks, so scanning resumes after them.
+    """
+    window = PROBE_BYTES
+    while True:
+        f.seek(offset)
+        data = f.read(window)
+        complete = offset + len(data) >= size
+        pos = data.find(b"{")
+        while pos >= 0:
+            text = codecs.getincrementaldecoder("utf-8")("replace").decode(data[pos:])
+            try:
+                value, end = _decoder.raw_decode(text)
+            except json.JSONDecodeError as err:
+                truncated = err.pos >= len(text) - 1 or err.msg.startswith("Unterminated string")
+                if truncated and not complete:
+                    break  # Cut by the window edge: widen and retry.
+            else:
+                nxt = _WHITESPACE.match(text, end).end()
+                if nxt >= len(text) and not complete:
+                    break
+                if (isinstance(value, dict) and all(key in value for key in _ORDER_KEYS)
+                        and nxt < len(text) and text[nxt] in ",]"):
+                    return offset + pos
+            pos = data.find(b"{", pos + 1)
+        else:
+            if complete:
+                return size
+            # No usable brace in this window; move on, keeping one byte
+            # so a brace split from its record is not skipped.
+            offset += max(len(data) - 1, 1)
+            continue
+        window *= 2
+
+
+def plan_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """Split the input into record-aligned byte ranges.
+
+    Args:
+        path: Orders file (JSON array or JSON Lines) or directory of shards.
+        chunk_bytes: Target chunk size in bytes.
+
+    Returns:
+        List of ``(file, start, end, is_array)`` work units in input order.
+    """
+    chunks = []
+    for file in input_files(path):
+        size = os.path.getsize(file)
+        with open(file, "rb") as f:
+            is_array = _is_array(f)
+            align = _next_record_start if is_array else _next_line_start
+            bounds = [align(f, 0, size)]
+            for nominal in range(chunk_bytes, size, chunk_bytes):
+                start = align(f, nominal, size)
+                if start > bounds[-1]:
+                    bounds.append(start)
+            if bounds[-1] < size:
+                bounds.append(size)
+        chunks.extend((file, start, end, is_array) for start, end in zip(bounds, bounds[1:]))
+    return chunks
+
+
+# ============================================================
+# WORKERS
+# ============================================================
+def _iter_array_slice(text):
+    """Decode the array elements in a record-aligned slice of the file."""
+    pos = 0
+    while True:
+        pos = _SEPARATORS.match(text, pos).end()
+        if pos >= len(text) or text[pos] == "]":
+            return
+        order, pos = _decoder.raw_decode(text, pos)
+        yield order
+
+
+def _iter_lines_slice(text):
+    """Decode the JSON Lines records in a line-aligned slice of the file."""
+    for line in text.splitlines():
+        if line.strip():
+            yield _decoder.decode(line)
+
+
+def aggregate_chunk(chunk, cents=False):
+    """Worker: aggregate one ``(file, start, end, is_array)`` range."""
+    file, start, end, is_array = chunk
+    with open(file, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    orders = _iter_array_slice(text) if is_array else _iter_lines_slice(text)
+    return aggregate_cents(orders) if cents else aggregate(orders)
+
+
+def merge_stats(into, part):
+    """Fold a partial per-customer table into ``into`` and return it."""
+    for customer, (count, total) in part.items():
+        acc = into.get(customer)
+        if acc is None:
+            into[customer] = [count, total]
+        else:
+            acc[0] += count
+            acc[1] += total
+    return into
+
+
+def run_parallel(path, workers=None, chunk_bytes=CHUNK_BYTES, cents=False):
+    """Run steps 1-3 across a process pool.
+
+    Args:
+        path: Orders file or directory of shards.
+        workers: Pool size (default: ``os.cpu_count()``).
+        chunk_bytes: Target chunk size in bytes.
+        cents: Sum money in integer cents.
+
+    Returns:
+        Dict mapping customer to ``[order_count, total_spent]``.
+    """
+    chunks = plan_chunks(path, chunk_bytes)
+    work = partial(aggregate_chunk, cents=cents)
+    stats = {}
+    if len(chunks) <= 1 or workers == 1:
+        for chunk in chunks:
+            merge_stats(stats, work(chunk))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(work, chunks):
+            merge_stats(stats, part)
+    return stats
@@ -0,0 +1,211 @@
+"""Date windows, per-period summaries and month-partitioned order shards.
+
+Every order carries an ISO ``date`` (``YYYY-MM-DD``, optionally followed
+by a time). This module adds three things on top of the pipeline:
+
+    windows     keep only orders whose date falls in ``[since, until]``
+                (both inclusive, compared on the ``YYYY-MM-DD`` prefix)
+    periods     group completed orders by (customer, day|week|month) in
+                the same single pass as the customer aggregation; weeks
+                are ISO weeks, written ``2024-W03``
+    partitions  rewrite an input as one JSON Lines shard per month,
+                ``YYYY-MM.jsonl`` (orders without a date go to
+                ``undated.jsonl``)
+
+A partitioned directory is an ordinary shard directory for every engine.
+When a window is given, month shards entirely outside it are never
+opened, so a query for one month reads one shard.
+"""
+
+import datetime
+import json
+import os
+import re
+
+from money import div_cents, format_cents, to_cents
+from pipeline import completed_totals, csv_field, input_files, iter_orders, load_orders
+
+GRAINS = ["day", "week", "month"]
+PERIOD_HEADER = ["period", "customer", "order_count", "total_spent", "avg_order_value"]
+UNDATED_SHARD = "undated.jsonl"
+
+_MONTH_SHARD = re.compile(r"(\d{4}-\d{2})\.jsonl")
+
+
+def parse_day(text):
+    """Validate an ISO ``YYYY-MM-DD`` date and return it unchanged.
+
+    Raises:
+        ValueError: If ``text`` is not a valid date.
+    """
+    return datetime.date.fromisoformat(text).isoformat()
+
+
+def _week(day):
+    year, week, _ = datetime.date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def period_function(grain):
+    """Return a function mapping an order date to its ``grain`` period key.
+
+    Week keys need a calendar computation, so they are memoized per day;
+    a feed has far fewer distinct days than orders.
+    """
+    if grain == "day":
+        return lambda date: date[:10]
+    if grain == "month":
+        return lambda date: date[:7]
+    if grain == "week":
+        weeks = {}
+
+        def week_of(date):
+            day = date[:10]
+            week = weeks.get(day)
+            if week is None:
+                week = weeks[day] = _week(day)
+            return week
+        return week_of
+    raise ValueError(f"unknown grain {grain!r}; expected one of {GRAINS}")
+
+
+# ============================================================
+# WINDOWS
+# ============================================================
+def window_files(path, since=None, until=None):
+    """Return the files under ``path`` that can hold orders in the window.
+
+    Month shards (``YYYY-MM.jsonl``) outside ``[since, until]`` are
+    skipped; any other file is kept, since its dates are unknown.
+    """
+    files = input_files(path)
+    if since is None and until is None:
+        return files
+    keep = []
+    for file in files:
+        match = _MONTH_SHARD.fullmatch(os.path.basename(file))
+        if match:
+            month = match.group(1)
+            if (since is not None and month < since[:7]) or (until is not None and month > until[:7]):
+                continue
+        keep.append(file)
+    return keep
+
+
+def in_window(orders, since=None, until=None):
+    """Yield the orders dated within ``[since, until]``.
+
+    Orders without a ``date`` are dropped whenever a bound is given.
+    """
+    if since is None and until is None:
+        yield from orders
+        return
+    for order in orders:
+        day = order.get("date")
+        if day is None:
+            continue
+        day = day[:10]
+        if (since is None or day >= since) and (until is None or day <= until):
+            yield order
+
+
+def window_orders(path, since=None, until=None, load=False):
+    """Orders from ``path`` within the window, reading only relevant shards.
+
+    Args:
+        path: Orders file or directory of shards.
+        since: First day included (``YYYY-MM-DD``), or None.
+        until: Last day included (``YYYY-MM-DD``), or None.
+        load: Load each file fully (batch engine) instead of streaming.
+    """
+    for file in window_files(path, since, until):
+        yield from in_window(load_orders(file) if load else iter_orders(file), since, until)
+
+
+# ============================================================
+# PERIOD SUMMARIES
+# ============================================================
+def aggregate_periods(orders, grain, cents=False):
+    """Steps 1-3 grouped by (customer, period) in a single pass.
+
+    Args:
+        orders: Iterable of order dicts; completed ones need a ``date``.
+        grain: One of ``GRAINS``.
+        cents: Accumulate integer cents instead of floats.
+
+    Returns:
+        Dict mapping ``(customer, period)`` to ``[order_count, total_spent]``.
+    """
+    period_of = period_function(grain)
+    stats = {}
+    for order, total in completed_totals(orders, cents):
+        key = (order["customer"], period_of(order["date"]))
+        acc = stats.get(key)
+        if acc is None:
+            stats[key] = [1, total]
+        else:
+            acc[0] += 1
+            acc[1] += total
+    return stats
+
+
+def summarize_periods(stats, cents=False):
+    """Step 4 per period: rows ordered by period, then as ``summarize`` does.
+
+    Returns:
+        List of ``(period, customer, order_count, total_cents, avg_cents)``.
+    """
+    rows = []
+    for (customer, period), (count, total) in stats.items():
+        if not cents:
+            total = to_cents(total)
+        rows.append((period, customer, count, total, div_cents(total, count)))
+    rows.sort(key=lambda row: (row[0], -row[3], row[1]))
+    return rows
+
+
+def write_period_summary(rows, path):
+    """Step 5 for period rows, written like ``write_summary``."""
+    lines = [",".join(PERIOD_HEADER) + "\n"]
+    lines += [
+        f"{period},{csv_field(customer)},{count},{format_cents(total)},{format_cents(avg)}\n"
+        for period, customer, count, total, avg in rows
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+# ============================================================
+# MONTH PARTITIONS
+# ============================================================
+def partition_orders(path, out_dir):
+    """Rewrite the orders under ``path`` as one JSON Lines shard per month.
+
+    Orders keep their input order within each shard. Shards written by
+    this call replace any existing file of the same name.
+
+    Args:
+        path: Orders file or directory of shards.
+        out_dir: Directory for the ``YYYY-MM.jsonl`` shards; created if
+            missing.
+
+    Returns:
+        ``(orders_written, shards_written)``.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    shards = {}
+    written = 0
+    try:
+        for file in input_files(path):
+            for order in iter_orders(file):
+                day = order.get("date")
+                name = f"{day[:7]}.jsonl" if day else UNDATED_SHARD
+                out = shards.get(name)
+                if out is None:
+                    out = shards[name] = open(os.path.join(out_dir, name), "w", encoding="utf-8")
+                out.write(json.dumps(order, ensure_ascii=False, separators=(",", ":")) + "\n")
+                written += 1
+    finally:
+        for out in shards.values():
+            out.close()
+    return written, len(shards)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""Reference implementation of the C4 order pipeline.
+
+Usage:
+    python3 pipeline.py [orders.json|shards/] [-o OUTPUT]
+                        [--engine batch|stream|parallel|columnar|incremental]
+                        [--workers N] [--money cents|float] [--state FILE]
+                        [--top K] [--format csv|binary|arrow|parquet]
+                        [--since DAY] [--until DAY] [--by day|week|month]
+                        [--partition DIR]
+
+The batch engine follows plan.md step by step: it loads the whole file and
+builds the filtered and transformed lists before aggregating. The stream
+engine parses the input incrementally (a top-level JSON array or JSON Lines)
+and fuses filter, transform and aggregate into one pass, so peak memory is
+proportional to the number of distinct customers, not the number of orders.
+The parallel engine (parallel.py) aggregates byte-range chunks of the input
+in a process pool and merges the partial per-customer tables. The columnar
+engine (columnar.py, needs NumPy) flattens items into arrays and computes
+totals and group-bys with vectorized operations.
+
+The incremental engine (incremental.py) keeps per-customer aggregates and a
+high-water mark in a SQLite state file and only reads orders appended since
+the previous run.
+
+Money is summed in exact integer cents by default (money.py); ``--money
+float`` keeps the float arithmetic that plan.md describes.
+
+``--top K`` writes only the K best customers, selected with a bounded heap
+(topk.py) instead of sorting every customer; the rows equal the head of the
+full summary.
+
+``--format`` picks the output: the default CSV, a memory-mappable
+fixed-width binary table, or Arrow/Parquet when pyarrow is installed
+(writers.py).
+
+``--since``/``--until`` restrict the summary to a date window and ``--by``
+groups it by (customer, period) in the same pass; ``--partition DIR``
+rewrites the input as one shard per month, so windowed runs over that
+directory only open the months they need (periods.py).
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sys
+
+from money import div_cents, format_cents, to_cents
+
+HEADER = ["customer", "order_count", "total_spent", "avg_order_value"]
+ENGINES = ["batch", "stream", "parallel", "columnar", "incremental"]
+MONEY_MODES = ["cents", "float"]
+FORMATS = ["csv", "binary", "arrow", "parquet"]
+# Default output file per --format.
+DEFAULT_OUTPUTS = {"csv": "summary.csv", "binary": "summary.bin",
+                   "arrow": "summary.arrow", "parquet": "summary.parquet"}
+
+# Characters read per refill of the streaming parser's buffer.
+READ_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_SEPARATORS = re.compile(r"[\s,]*")
+_WHITESPACE = re.compile(r"\s*")
+# Characters that may make csv.writer quote a field.
+_NEEDS_QUOTES = re.compile(r'[,"\r\n]')
+_quote_buf = io.StringIO()
+_quoter = csv.writer(_quote_buf, lineterminator="\n")
+
+
+# ============================================================
+# INPUT
+# ============================================================
+def input_files(path):
+    """Return the order files behind ``path``.
+
+    ``path`` is either a single orders file or a directory of shards, in
+    which case its visible regular files are returned in name order.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    return [
+        os.path.join(path, name)
+        for name in sorted(os.listdir(path))
+        if not name.startswith(".") and os.path.isfile(os.path.join(path, name))
+    ]
+
+
+def load_orders(path):
+    """Load every order into memory (the batch engine's input)."""
+    orders = []
+    for file in input_files(path):
+        with open(file, "r", encoding="utf-8") as f:
+            if f.read(READ_SIZE).lstrip().startswith("["):
+                f.seek(0)
+                orders.extend(json.load(f))
+            else:
+                f.seek(0)
+                orders.extend(_iter_lines(f))
+    return orders
+
+
+def iter_orders(path, read_size=READ_SIZE):
+    """Yield orders one at a time from a JSON array or JSON Lines file.
+
+    Args:
+        path: File holding either a top-level JSON array of orders or one
+            order object per line.
+        read_size: Characters to read per buffer refill.
+
+    Yields:
+        Order dicts, in file order.
+
+    Raises:
+        json.JSONDecodeError: If an order is malformed.
+        ValueError: If the top-level array is never closed.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(read_size)
+        stripped = head.lstrip()
+        while head and not stripped:
+            head = f.read(read_size)
+            stripped = head.lstrip()
+        if stripped.startswith("["):
+            yield from _iter_array(path, f, stripped[1:], read_size)
+        else:
+            f.seek(0)
+            yield from _iter_lines(f)
+
+
+def _iter_array(path, f, buf, read_size):
+    """Decode the elements of a top-level JSON array from a buffered file."""
+    pos = 0
+    eof = False
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos < len(buf):
+            if buf[pos] == "]":
+                return
+            try:
+                order, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely an element cut by the buffer edge; refill
+                # and retry unless there is nothing left to read.
+                if eof:
+                    raise
+            else:
+                # A scalar cut by the buffer edge can still decode ("2."
+                # reads as 2), so only trust a value once the next
+                # character confirms that it ended.
+                nxt = _WHITESPACE.match(buf, end).end()
+                if nxt < len(buf) and buf[nxt] in ",]":
+                    yield order
+                    pos = nxt
+                    continue
+                if eof:
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buf, nxt)
+        elif eof:
+            raise ValueError(f"{path}: unterminated JSON array")
+
+        chunk = f.read(read_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
+def _iter_lines(f):
+    """Decode one order per non-blank line (JSON Lines)."""
+    for line in f:
+        if line.strip():
+            yield _decoder.decode(line)
+
+
+# ============================================================
+# PIPELINE STEPS
+# ============================================================
+def order_total(order):
+    """Step 2: sum of quantity x price over the order's items."""
+    return sum(item["quantity"] * item["price"] for item in order["items"])
+
+
+def order_total_cents(order):
+    """Step 2 in exact integer cents."""
+    return to_cents(order_total(order))
+
+
+def aggregate(orders):
+    """Steps 1-3 fused into a single pass over ``orders``.
+
+    Only completed orders are counted. Nothing but the per-customer
+    accumulators is kept, so ``orders`` may be a lazy iterator.
+
+    Args:
+        orders: Iterable of order dicts.
+
+    Returns:
+        Dict mapping customer to ``[order_count, total_spent]``.
+    """
+    stats = {}
+    for order in orders:
+        if order["status"] != "completed":
+            continue
+        total = 0
+        for item in order["items"]:
+            total += item["quantity"] * item["price"]
+        acc = stats.get(order["customer"])
+        if acc is None:
+            stats[order["customer"]] = [1, total]
+        else:
+            acc[0] += 1
+            acc[1] += total
+    return stats
+
+
+def completed_totals(orders, cents=False):
+    """Steps 1-2 fused: yield ``(order, total)`` for each completed order.
+
+    The Python engines get their order totals here, and the columnar
+    engine rounds each order total the same way, so every engine
+    produces the same cents.
+
+    Args:
+        orders: Iterable of order dicts.
+        cents: Yield totals in integer cents instead of floats.
+    """
+    for order in orders:
+        if order["status"] != "completed":
+            continue
+        total = 0
+        for item in order["items"]:
+            total += item["quantity"] * item["price"]
+        if cents:
+            total = round(total * 100)  # money.to_cents, inlined for the hot loop
+        yield order, total
+
+
+def aggregate_cents(orders):
+    """``aggregate`` with each order total converted to integer cents.
+
+    Per-customer totals then accumulate exactly, whatever the number of
+    orders.
+
+    Returns:
+        Dict mapping customer to ``[order_count, total_spent_cents]``.
+    """
+    stats = {}
+    for order, total in completed_totals(orders, cents=True):
+        acc = stats.get(order["customer"])
+        if acc is None:
+            stats[order["customer"]] = [1, total]
+        else:
+            acc[0] += 1
+            acc[1] += total
+    return stats
+
+
+def run_batch(path, cents=False):
+    """Run steps 1-3 as separate materialized stages, as plan.md lays out."""
+    orders = load_orders(path)
+    total_of = order_total_cents if cents else order_total
+
+    # Step 1: Filter
+    completed_orders = [order for order in orders if order["status"] == "completed"]
+
+    # Step 2: Transform
+    transformed = [
+        {
+            "customer": order["customer"],
+            "total": total_of(order),
+            "item_count": sum(item["quantity"] for item in order["items"]),
+        }
+        for order in completed_orders
+    ]
+
+    # Step 3: Aggregate
+    stats = {}
+    for order in transformed:
+        acc = stats.setdefault(order["customer"], [0, 0])
+        acc[0] += 1
+        acc[1] += order["total"]
+    return stats
+
+
+def run_stream(path, cents=False):
+    """Run steps 1-3 in one pass over an incrementally parsed input."""
+    orders = (order for file in input_files(path) for order in iter_orders(file))
+    return aggregate_cents(orders) if cents else aggregate(orders)
+
+
+def summarize(stats, cents=False):
+    """Step 4: turn accumulators into rows sorted by total_spent descending.
+
+    Money leaves this step as integer cents. Float totals are rounded to
+    cents first, and the average is derived from the rounded total, so the
+    float and cents modes agree whenever the float total lands on the right
+    cent. Ties are broken by customer name, so the order never depends on
+    the order in which customers were first seen.
+
+    Args:
+        stats: Dict mapping customer to ``[order_count, total_spent]``.
+        cents: ``total_spent`` is already integer cents.
+
+    Returns:
+        List of ``(customer, order_count, total_cents, avg_cents)``.
+    """
+    rows = []
+    for customer, (count, total) in stats.items():
+        if not cents:
+            total = to_cents(total)
+        rows.append((customer, count, total, div_cents(total, count)))
+    rows.sort(key=lambda row: (-row[2], row[0]))
+    return rows
+
+
+def csv_field(text):
+    """Format ``text`` as a field exactly as ``csv.writer`` would.
+
+    Plain names are returned as-is; the rare name with a delimiter, quote
+    or line break goes through ``csv.writer`` itself, so quoting follows
+    whatever rules the running Python's csv module applies.
+    """
+    if not _NEEDS_QUOTES.search(text):
+        return text
+    _quote_buf.seek(0)
+    _quote_buf.truncate()
+    _quoter.writerow([text, 0])
+    return _quote_buf.getvalue()[:-3]
+
+
+def write_summary(rows, path):
+    """Step 5: write ``summary.csv`` with two-decimal money columns.
+
+    Lines are formatted in one pass and written with a single
+    ``writelines``; the bytes are the same ``csv.writer`` would produce.
+    When no name needs quoting and no total is negative (the usual case,
+    checked once for the whole summary), each line is a single
+    %-format with no per-field helper calls.
+    """
+    lines = [",".join(HEADER) + "\n"]
+    plain = (not _NEEDS_QUOTES.search("".join(row[0] for row in rows))
+             and min((row[2] for row in rows), default=0) >= 0)
+    if plain:
+        lines += [
+            "%s,%d,%d.%02d,%d.%02d\n" % (customer, count, total // 100, total % 100, avg // 100, avg % 100)
+            for customer, count, total, avg in rows
+        ]
+    else:
+        lines += [
+            f"{csv_field(customer)},{count},{format_cents(total)},{format_cents(avg)}\n"
+            for customer, count, total, avg in rows
+        ]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    from periods import GRAINS, parse_day
+
+    parser = argparse.ArgumentParser(description="Summarize completed orders per customer.")
+    parser.add_argument("input", nargs="?", default="orders.json",
+                        help="orders file (JSON array or JSON Lines) or directory of shards "
+                             "(default: orders.json)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="summary file to write (default: summary.csv, or summary.bin, "
+                             "summary.arrow or summary.parquet for the other formats)")
+    parser.add_argument("--engine", choices=ENGINES, default="batch",
+                        help="batch: load everything; stream: constant-memory single pass; "
+                             "parallel: sharded aggregation across processes; "
+                             "columnar: NumPy-vectorized; "
+                             "incremental: only read orders added since the last run")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parallel engine pool size (default: CPU count)")
+    parser.add_argument("--chunk-mb", type=int, default=32,
+                        help="parallel engine target chunk size in MiB (default: 32)")
+    parser.add_argument("--money", choices=MONEY_MODES, default="cents",
+                        help="cents: exact integer-cents sums; float: float sums (default: cents)")
+    parser.add_argument("--state", default=None,
+                        help="incremental engine state file (default: <output>.state)")
+    parser.add_argument("--top", type=int, default=None, metavar="K",
+                        help="only write the K customers with the highest total_spent")
+    parser.add_argument("--format", choices=FORMATS, default="csv",
+                        help="csv: CSV summary; binary: fixed-width table (.bin); "
+                             "arrow/parquet: columnar files, need pyarrow (default: csv)")
+    parser.add_argument("--since", type=parse_day, default=None, metavar="DAY",
+                        help="only orders dated on or after DAY (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_day, default=None, metavar="DAY",
+                        help="only orders dated on or before DAY (YYYY-MM-DD)")
+    parser.add_argument("--by", choices=GRAINS, default=None,
+                        help="summarize per customer and day, ISO week or month")
+    parser.add_argument("--partition", default=None, metavar="DIR",
+                        help="write the input as one JSON Lines shard per month to DIR "
+                             "instead of summarizing")
+    args = parser.parse_args(argv)
+    if args.output is None:
+        args.output = DEFAULT_OUTPUTS[args.format]
+    if args.partition:
+        from periods import partition_orders
+        written, shards = partition_orders(args.input, args.partition)
+        print(f"Wrote {written} orders to {shards} monthly shards in {args.partition}")
+        return 0
+    windowed = args.since or args.until or args.by
+    if windowed and args.engine not in ("batch", "stream"):
+        parser.error("--since, --until and --by need the batch or stream engine")
+    if args.since and args.until and args.since > args.until:
+        parser.error("--since is after --until")
+    if args.by and (args.top is not None or args.format != "csv"):
+        parser.error("--by writes every period to CSV; it does not combine with --top or --format")
+    if args.top is not None and args.top < 0:
+        parser.error("--top must be non-negative")
+    if args.format in ("arrow", "parquet"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error(f"--format {args.format} needs pyarrow")
+    cents = args.money == "cents"
+    if args.engine == "incremental" and not cents:
+        parser.error("the incremental engine keeps its aggregates in cents")
+
+    if windowed:
+        from periods import aggregate_periods, summarize_periods, window_orders, write_period_summary
+        orders = window_orders(args.input, args.since, args.until, load=args.engine == "batch")
+        if args.by:
+            rows = summarize_periods(aggregate_periods(orders, args.by, cents), cents)
+            write_period_summary(rows, args.output)
+            print(f"Wrote {len(rows)} customer-{args.by} rows to {args.output}")
+            return 0
+        stats = aggregate_cents(orders) if cents else aggregate(orders)
+    elif args.engine == "incremental":
+        from incremental import run_incremental
+        state_path = args.state or f"{args.output}.state"
+        stats = run_incremental(args.input, state_path, force=not os.path.exists(args.output))
+        if stats is None:
+            print(f"{args.output} is up to date")
+            return 0
+    elif args.engine == "columnar":
+        from columnar import run_columnar
+        stats = run_columnar(args.input, cents)
+    elif args.engine == "parallel":
+        from parallel import run_parallel
+        stats = run_parallel(args.input, args.workers, args.chunk_mb << 20, cents)
+    elif args.engine == "stream":
+        stats = run_stream(args.input, cents)
+    else:
+        stats = run_batch(args.input, cents)
+
+    if args.top is not None:
+        from topk import top_rows
+        rows = top_rows(stats, args.top, cents)
+    else:
+        rows = summarize(stats, cents)
+    if args.format == "csv":
+        write_summary(rows, args.output)
+    else:
+        from writers import write_output
+        write_output(rows, args.output, args.format)
+    print(f"Wrote {len(rows)} customers to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Test suite for the columnar engine in columnar.py.
+Run with: python3 -m unittest test_columnar
+"""
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from columnar import run_columnar
+from pipeline import run_stream
+
+
+class TestColumnarMatchesStream(unittest.TestCase):
+    """The columnar engine gives the stream engine's totals, cent for cent."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_orders(self, orders):
+        path = os.path.join(self.tmp.name, "orders.jsonl")
+        with open(path, "w") as f:
+            for order in orders:
+                f.write(json.dumps(order) + "\n")
+        return path
+
+    def assertEnginesAgree(self, orders):
+        path = self.write_orders(orders)
+        for cents in (True, False):
+            with self.subTest(cents=cents):
+                self.assertEqual(run_columnar(path, cents), run_stream(path, cents))
+
+    def test_01_sub_cent_prices_round_per_order(self):
+        """Three half-cent items round once per order, not once per item"""
+        orders = [{"id": 1, "customer": "A", "status": "completed",
+                   "items": [{"quantity": 1, "price": 0.005}] * 3}]
+        self.assertEnginesAgree(orders)
+        self.assertEqual(run_columnar(self.write_orders(orders), cents=True), {"A": [1, 2]})
+
+    def test_02_random_sub_cent_prices(self):
+        """Random three-decimal prices give the same cents in both engines"""
+        rng = random.Random(0)
+        orders = [
+            {"id": i, "customer": rng.choice("ABCDE"),
+             "status": rng.choice(["completed", "completed", "pending"]),
+             "items": [{"quantity": rng.randint(1, 5), "price": rng.randint(0, 99999) / 1000}
+                       for _ in range(rng.randint(1, 4))]}
+            for i in range(2000)
+        ]
+        self.assertEnginesAgree(orders)
+
+    def test_03_pending_orders_only(self):
+        """Customers without completed orders are left out"""
+        self.assertEnginesAgree([{"id": 1, "customer": "A", "status": "pending",
+                                  "items": [{"quantity": 2, "price": 1.25}]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Top-K customers for the C4 pipeline without sorting every customer.
+
+``top_rows`` selects the K best customers from finished aggregates with a
+bounded heap (``heapq.nsmallest``) in O(n log K). ``TopK`` keeps the
+current top K while aggregates are still being updated, so a running
+stream can report its leaders at any point.
+
+Both rank exactly like ``pipeline.summarize``: total in cents descending,
+then customer name ascending. The output therefore equals the first K rows
+of the fully sorted summary.
+"""
+
+import heapq
+
+from money import div_cents, to_cents
+from pipeline import completed_totals
+
+
+def top_rows(stats, k, cents=False):
+    """Step 4 for the best ``k`` customers only.
+
+    Args:
+        stats: Dict mapping customer to ``[order_count, total_spent]``.
+        k: Number of rows to keep.
+        cents: ``total_spent`` is already integer cents.
+
+    Returns:
+        The first ``k`` rows ``summarize(stats, cents)`` would return.
+    """
+    if cents:
+        best = heapq.nsmallest(k, stats.items(), key=lambda kv: (-kv[1][1], kv[0]))
+    else:
+        best = heapq.nsmallest(k, stats.items(), key=lambda kv: (-to_cents(kv[1][1]), kv[0]))
+    rows = []
+    for customer, (count, total) in best:
+        if not cents:
+            total = to_cents(total)
+        rows.append((customer, count, total, div_cents(total, count)))
+    return rows
+
+
+class _Entry:
+    """Heap entry ordered weakest first: lower total, then later name."""
+
+    __slots__ = ("total", "customer")
+
+    def __init__(self, total, customer):
+        self.total = total
+        self.customer = customer
+
+    def __lt__(self, other):
+        if self.total != other.total:
+            return self.total < other.total
+        return self.customer > other.customer
+
+
+class TopK:
+    """The K customers with the highest totals, kept up to date as totals change.
+
+    Call ``update`` with a customer's new running total whenever it
+    changes. Each update costs O(log K). Totals that only grow (the normal
+    case, since order totals are non-negative) keep the set exact. If a
+    member's total ever shrinks, an outsider may now deserve its place;
+    ``exact`` turns False until ``rebuild`` is called with the full
+    aggregates.
+
+    Args:
+        k: Number of customers to track.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.exact = True
+        self._members = {}   # customer -> total, for the current top K
+        self._heap = []      # _Entry per member; stale entries are skipped
+
+    def _weakest(self):
+        """Return the live heap entry with the lowest rank."""
+        heap = self._heap
+        while heap[0].total != self._members.get(heap[0].customer):
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _push(self, customer, total):
+        heapq.heappush(self._heap, _Entry(total, customer))
+        if len(self._heap) > 4 * self.k + 64:
+            # Too many stale entries: rebuild from the live members.
+            self._heap = [_Entry(t, c) for c, t in self._members.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, customer, total):
+        """Record that ``customer``'s running total is now ``total``."""
+        members = self._members
+        old = members.get(customer)
+        if old is not None:
+            if total < old:
+                self.exact = False
+            members[customer] = total
+            self._push(customer, total)
+        elif len(members) < self.k:
+            members[customer] = total
+            self._push(customer, total)
+        elif self.k and self._weakest() < _Entry(total, customer):
+            evicted = heapq.heappop(self._heap)
+            del members[evicted.customer]
+            members[customer] = total
+            self._push(customer, total)
+
+    def rebuild(self, totals):
+        """Recompute the set from ``{customer: total}`` in O(n log K)."""
+        best = heapq.nlargest(self.k, (_Entry(t, c) for c, t in totals.items()))
+        self._members = {entry.customer: entry.total for entry in best}
+        self._heap = best
+        heapq.heapify(self._heap)
+        self.exact = True
+
+    def ranking(self):
+        """Return the current ``(customer, total)`` pairs, best first."""
+        return sorted(self._members.items(), key=lambda ct: (-ct[1], ct[0]))
+
+
+def aggregate_top_k(orders, k):
+    """``aggregate_cents`` that also tracks the top ``k`` customers live.
+
+    Returns:
+        ``(stats, top)``: the per-customer ``[order_count, total_cents]``
+        dict and the ``TopK`` maintained during the pass.
+    """
+    stats = {}
+    top = TopK(k)
+    for order, total in completed_totals(orders, cents=True):
+        acc = stats.get(order["customer"])
+        if acc is None:
+            acc = stats[order["customer"]] = [1, total]
+        else:
+            acc[0] += 1
+            acc[1] += total
+        top.update(order["customer"], acc[1])
+    if not top.exact:
+        top.rebuild({customer: acc[1] for customer, acc in stats.items()})
+    return stats, top
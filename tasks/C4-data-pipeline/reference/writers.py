@@ -0,0 +1,177 @@
+"""Binary and columnar outputs for the C4 summary.
+
+Besides ``summary.csv`` (``pipeline.write_summary``), the summary rows can
+be written as:
+
+    binary   a fixed-width little-endian table that can be memory-mapped
+             and indexed without parsing (``SummaryTable``)
+    arrow    an Arrow IPC file (Feather v2), needs pyarrow
+    parquet  a Parquet file, needs pyarrow
+
+All three store money as integer cents in ``total_cents`` and
+``avg_cents`` columns, so no precision is lost and no decimal parsing is
+needed downstream. Rows keep the summary order.
+
+Binary layout::
+
+    header   8s magic  b"C4SUMMRY"
+             u64 row count
+             u64 name width in bytes (a multiple of 8)
+    rows     name (UTF-8, NUL-padded to the width), then int64
+             order_count, total_cents, avg_cents
+
+Every field is 8-byte aligned, so the file maps directly onto a NumPy
+structured array (``SummaryTable.as_numpy``).
+"""
+
+import mmap
+import struct
+
+from pipeline import write_summary
+
+COLUMNS = ["customer", "order_count", "total_cents", "avg_cents"]
+MAGIC = b"C4SUMMRY"
+
+_HEADER = struct.Struct("<8sQQ")
+
+
+def _record_struct(width):
+    return struct.Struct(f"<{width}sqqq")
+
+
+# ============================================================
+# BINARY TABLE
+# ============================================================
+def write_binary(rows, path):
+    """Write summary rows as a fixed-width binary table.
+
+    The whole file is packed into one preallocated buffer and written
+    with a single call.
+    """
+    names = [row[0].encode("utf-8") for row in rows]
+    width = max(map(len, names), default=0)
+    width = max(8, (width + 7) & ~7)
+    record = _record_struct(width)
+    buf = bytearray(_HEADER.size + record.size * len(rows))
+    _HEADER.pack_into(buf, 0, MAGIC, len(rows), width)
+    offset = _HEADER.size
+    pack_into = record.pack_into
+    for name, (_, count, total, avg) in zip(names, rows):
+        pack_into(buf, offset, name, count, total, avg)
+        offset += record.size
+    with open(path, "wb") as f:
+        f.write(buf)
+
+
+class SummaryTable:
+    """Read-only, memory-mapped view of a binary summary table.
+
+    Rows are decoded on access, so opening a table is O(1) regardless of
+    its size, and ``table[i]`` reads a single record.
+
+    Args:
+        path: File written by ``write_binary``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path}: not a binary summary table")
+        magic, self._rows, self.width = _HEADER.unpack_from(self._mmap, 0)
+        self._record = _record_struct(self.width)
+        if magic != MAGIC or len(self._mmap) != _HEADER.size + self._record.size * self._rows:
+            self._mmap.close()
+            raise ValueError(f"{path}: not a binary summary table")
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, index):
+        """Return row ``index`` as ``(customer, order_count, total_cents, avg_cents)``."""
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("summary row out of range")
+        name, count, total, avg = self._record.unpack_from(
+            self._mmap, _HEADER.size + index * self._record.size)
+        return name.rstrip(b"\0").decode("utf-8"), count, total, avg
+
+    def __iter__(self):
+        with memoryview(self._mmap) as view:
+            for name, count, total, avg in self._record.iter_unpack(view[_HEADER.size:]):
+                yield name.rstrip(b"\0").decode("utf-8"), count, total, avg
+
+    def as_numpy(self):
+        """Map the rows as a NumPy structured array with ``COLUMNS`` fields.
+
+        The array maps the file itself (``np.memmap``) and stays valid
+        after ``close``. Requires NumPy.
+        """
+        import numpy as np
+
+        dtype = np.dtype([
+            ("customer", f"S{self.width}"),
+            ("order_count", "<i8"),
+            ("total_cents", "<i8"),
+            ("avg_cents", "<i8"),
+        ])
+        if not self._rows:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=_HEADER.size,
+                         shape=(self._rows,))
+
+
+# ============================================================
+# ARROW / PARQUET
+# ============================================================
+def _arrow_table(rows):
+    import pyarrow as pa
+
+    customers, counts, totals, avgs = zip(*rows) if rows else ((), (), (), ())
+    return pa.table({
+        "customer": pa.array(customers, type=pa.string()),
+        "order_count": pa.array(counts, type=pa.int64()),
+        "total_cents": pa.array(totals, type=pa.int64()),
+        "avg_cents": pa.array(avgs, type=pa.int64()),
+    })
+
+
+def write_arrow(rows, path):
+    """Write summary rows as an Arrow IPC file. Requires pyarrow."""
+    import pyarrow as pa
+
+    table = _arrow_table(rows)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def write_parquet(rows, path):
+    """Write summary rows as a Parquet file. Requires pyarrow."""
+    import pyarrow.parquet as pq
+
+    pq.write_table(_arrow_table(rows), path)
+
+
+WRITERS = {
+    "csv": write_summary,
+    "binary": write_binary,
+    "arrow": write_arrow,
+    "parquet": write_parquet,
+}
+
+
+def write_output(rows, path, fmt="csv"):
+    """Write summary rows to ``path`` in one of the ``WRITERS`` formats."""
+    WRITERS[fmt](rows, path)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark IntervalIndex against a linear scan.
+
+Usage:
+    python3 bench_index.py [--intervals 1000000] [--queries 100000]
+                           [--scan-queries 200] [--span 1000000000]
+
+Random intervals (length 1-10000, starts uniform over ``--span``) are
+indexed, then the same random points and ranges are answered by the
+index in one batch and by a vectorized linear scan, one NumPy mask per
+query (O(n) each). The scan is timed on the first ``--scan-queries``
+queries only and its results are checked against the index's.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from index import IntervalIndex
+
+
+def synthesize(n, span, seed=0):
+    """Return ``(starts, ends)`` int64 arrays of ``n`` random intervals."""
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, span, n)
+    return starts, starts + rng.integers(1, 10_001, n)
+
+
+def scan(starts, ends, lo, hi):
+    """Ids of the intervals overlapping ``[lo, hi]``, by a full scan."""
+    return np.flatnonzero((starts <= hi) & (ends >= lo))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--scan-queries", type=int, default=200)
+    parser.add_argument("--span", type=int, default=1_000_000_000)
+    args = parser.parse_args(argv)
+
+    starts, ends = synthesize(args.intervals, args.span)
+    rng = np.random.default_rng(1)
+    points = rng.integers(0, args.span, args.queries)
+    widths = rng.integers(0, 100_000, args.queries)
+
+    start = time.perf_counter()
+    index = IntervalIndex(starts, ends)
+    build_s = time.perf_counter() - start
+    print(f"{args.intervals:,} intervals, index built in {build_s:.3f}s")
+
+    start = time.perf_counter()
+    stab_offsets, stab_ids = index.stab_batch(points)
+    stab_s = time.perf_counter() - start
+    start = time.perf_counter()
+    range_offsets, range_ids = index.overlap_batch(points, points + widths)
+    range_s = time.perf_counter() - start
+
+    k = min(args.scan_queries, args.queries)
+    start = time.perf_counter()
+    stab_scan = [scan(starts, ends, p, p) for p in points[:k]]
+    stab_scan_s = time.perf_counter() - start
+    start = time.perf_counter()
+    range_scan = [scan(starts, ends, p, p + w) for p, w in zip(points[:k], widths[:k])]
+    range_scan_s = time.perf_counter() - start
+
+    for q in range(k):
+        if not (np.array_equal(stab_scan[q], stab_ids[stab_offsets[q]:stab_offsets[q + 1]])
+                and np.array_equal(range_scan[q], range_ids[range_offsets[q]:range_offsets[q + 1]])):
+            print(f"MISMATCH on query {q}")
+            return 1
+
+    print(f"{'query':<7} {'path':<6} {'queries/s':>14} {'results/query':>14}")
+    rows = [
+        ("stab", "index", args.queries / stab_s, len(stab_ids) / args.queries),
+        ("stab", "scan", k / stab_scan_s, sum(map(len, stab_scan)) / k),
+        ("range", "index", args.queries / range_s, len(range_ids) / args.queries),
+        ("range", "scan", k / range_scan_s, sum(map(len, range_scan)) / k),
+    ]
+    for query, path, rate, per in rows:
+        print(f"{query:<7} {path:<6} {rate:>14,.0f} {per:>14.2f}")
+    print(f"speedup: stab {rows[0][2] / rows[1][2]:.0f}x, range {rows[2][2] / rows[3][2]:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark the list and array interval merges.
+
+Usage:
+    python3 bench_intervals.py [--intervals 10000000] [--span 1000000000]
+
+Random intervals (length 1-1000, starts uniform over ``--span``) are
+merged by ``merge_intervals`` over ``[start, end]`` lists and by
+``merge_interval_arrays`` over int64 arrays. Building the lists is not
+timed. Both results are checked against each other before timings are
+printed.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from intervals import merge_interval_arrays, merge_intervals
+
+
+def synthesize(n, span, seed=0):
+    """Return ``(starts, ends)`` int64 arrays of ``n`` random intervals."""
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, span, n)
+    return starts, starts + rng.integers(1, 1001, n)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=10_000_000)
+    parser.add_argument("--span", type=int, default=1_000_000_000)
+    args = parser.parse_args(argv)
+
+    starts, ends = synthesize(args.intervals, args.span)
+    pairs = np.column_stack((starts, ends)).tolist()
+
+    start = time.perf_counter()
+    merged_starts, merged_ends = merge_interval_arrays(starts, ends)
+    array_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged = merge_intervals(pairs)
+    list_s = time.perf_counter() - start
+
+    if merged != np.column_stack((merged_starts, merged_ends)).tolist():
+        print("MISMATCH between list and array merges")
+        return 1
+
+    n = args.intervals
+    print(f"{n:,} intervals -> {len(merged):,} merged")
+    print(f"{'path':<6} {'seconds':>9} {'intervals/s':>14}")
+    print(f"{'list':<6} {list_s:>9.3f} {n / list_s:>14,.0f}")
+    print(f"{'array':<6} {array_s:>9.3f} {n / array_s:>14,.0f}")
+    print(f"speedup: {list_s / array_s:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark the serial and multi-process array interval merges.
+
+Usage:
+    python3 bench_parallel.py [--intervals 3000000] [--span 1000000000]
+                              [--workers 1 2 4]
+
+Random intervals (length 1-1000, starts uniform over ``--span``) are
+merged by ``merge_interval_arrays`` in this process and by
+``merge_interval_arrays_parallel`` with each ``--workers`` pool size.
+Every parallel result is checked against the serial one before timings
+are printed. A speedup needs at least as many free cores as workers;
+``os.cpu_count()`` is printed for reference.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from bench_intervals import synthesize
+from intervals import merge_interval_arrays
+from parallel import merge_interval_arrays_parallel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=3_000_000)
+    parser.add_argument("--span", type=int, default=1_000_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    starts, ends = synthesize(args.intervals, args.span)
+
+    start = time.perf_counter()
+    expected = merge_interval_arrays(starts, ends)
+    serial_s = time.perf_counter() - start
+
+    n = args.intervals
+    print(f"{n:,} intervals -> {len(expected[0]):,} merged, {os.cpu_count()} CPUs")
+    print(f"{'path':<12} {'seconds':>9} {'intervals/s':>14} {'speedup':>8}")
+    print(f"{'serial':<12} {serial_s:>9.3f} {n / serial_s:>14,.0f} {1:>7.2f}x")
+    for workers in args.workers:
+        start = time.perf_counter()
+        merged = merge_interval_arrays_parallel(starts, ends, workers, min_partition=1)
+        parallel_s = time.perf_counter() - start
+        if not all(np.array_equal(a, b) for a, b in zip(merged, expected)):
+            print(f"MISMATCH with {workers} workers")
+            return 1
+        label = f"{workers} workers"
+        print(f"{label:<12} {parallel_s:>9.3f} {n / parallel_s:>14,.0f} "
+              f"{serial_s / parallel_s:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Out-of-core interval merge for inputs larger than memory.
+
+Usage:
+    python3 external.py [intervals.txt|-] [-o merged.txt] [--run-size N]
+                        [--fan-in K] [--tmp-dir DIR]
+
+Intervals are read as a stream, one per line: two integers separated by
+a comma and/or whitespace (surrounding brackets are ignored, so
+``[1, 3]`` works too); blank lines and ``#`` comments are skipped.
+
+The merge is an external sort:
+
+    runs   up to ``run_size`` intervals are read, merged in memory with
+           ``merge_intervals`` and spilled to a temporary file as packed
+           little-endian int64 pairs
+    merge  the sorted runs are combined with a k-way ``heapq.merge`` and
+           merged on the fly; if there are more than ``fan_in`` runs,
+           groups of them are first merged into longer runs
+
+Memory is bounded by one run of ``run_size`` intervals while spilling and
+by ``fan_in`` read buffers while merging, whatever the input size. The
+output is identical to ``merge_intervals`` over the whole input.
+"""
+
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+from array import array
+
+from intervals import merge_intervals
+
+RUN_SIZE = 1_000_000
+FAN_IN = 64
+# Intervals decoded per read from a run file.
+READ_INTERVALS = 1 << 16
+
+_FIELDS = re.compile(r"[\s,]+")
+
+
+def read_intervals(f):
+    """Yield ``(start, end)`` pairs from an open text stream, one per line."""
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        start, end = _FIELDS.split(line.strip("[]() \t"))
+        yield int(start), int(end)
+
+
+def merge_sorted(pairs):
+    """Merge intervals that arrive sorted by start, yielding ``[start, end]``."""
+    current = None
+    for start, end in pairs:
+        if current is not None and start <= current[1]:
+            if end > current[1]:
+                current[1] = end
+        else:
+            if current is not None:
+                yield current
+            current = [start, end]
+    if current is not None:
+        yield current
+
+
+# ============================================================
+# RUN FILES
+# ============================================================
+def _write_run(intervals, tmp_dir):
+    """Spill sorted ``[start, end]`` pairs to a new temporary run file."""
+    fd, path = tempfile.mkstemp(prefix="run-", suffix=".bin", dir=tmp_dir)
+    with os.fdopen(fd, "wb") as f:
+        buf = array("q")
+        for start, end in intervals:
+            buf.append(start)
+            buf.append(end)
+            if len(buf) >= 2 * READ_INTERVALS:
+                _write_block(f, buf)
+                del buf[:]
+        _write_block(f, buf)
+    return path
+
+
+def _write_block(f, values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    f.write(values.tobytes())
+
+
+def _read_run(path):
+    """Yield ``(start, end)`` pairs from a run file, a block at a time."""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(16 * READ_INTERVALS)
+            if not block:
+                return
+            values = array("q", block)
+            if sys.byteorder == "big":
+                values.byteswap()
+            it = iter(values)
+            yield from zip(it, it)
+
+
+def _spill_runs(pairs, run_size, tmp_dir):
+    """Split the input into merged, sorted runs on disk; return their paths."""
+    runs = []
+    batch = []
+    for pair in pairs:
+        batch.append(pair)
+        if len(batch) >= run_size:
+            runs.append(_write_run(merge_intervals(batch), tmp_dir))
+            batch = []
+    if batch:
+        runs.append(_write_run(merge_intervals(batch), tmp_dir))
+    return runs
+
+
+# ============================================================
+# EXTERNAL MERGE
+# ============================================================
+def merge_intervals_external(pairs, run_size=RUN_SIZE, fan_in=FAN_IN, tmp_dir=None):
+    """Merge intervals from a stream of any size, yielding ``[start, end]``.
+
+    Args:
+        pairs: Iterable of ``(start, end)`` pairs in any order, e.g.
+            ``read_intervals(f)``.
+        run_size: Intervals held in memory per sorted run.
+        fan_in: Runs merged at once; more runs are merged in passes.
+        tmp_dir: Directory for run files (default: the system temp dir).
+
+    Yields:
+        Merged ``[start, end]`` pairs sorted by start, exactly as
+        ``merge_intervals`` would return them.
+
+    Raises:
+        ValueError: If ``run_size`` is below 1 or ``fan_in`` below 2.
+    """
+    if run_size < 1 or fan_in < 2:
+        raise ValueError("run_size must be at least 1 and fan_in at least 2")
+    with tempfile.TemporaryDirectory(prefix="intervals-", dir=tmp_dir) as work:
+        runs = _spill_runs(pairs, run_size, work)
+        while len(runs) > fan_in:
+            group, runs = runs[:fan_in], runs[fan_in:]
+            merged = merge_sorted(heapq.merge(*(_read_run(run) for run in group)))
+            runs.append(_write_run(merged, work))
+            for run in group:
+                os.remove(run)
+        yield from merge_sorted(heapq.merge(*(_read_run(run) for run in runs)))
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge overlapping intervals larger than memory.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="intervals file, one 'start end' per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="file for the merged intervals (default: stdout)")
+    parser.add_argument("--run-size", type=int, default=RUN_SIZE,
+                        help=f"intervals per in-memory run (default: {RUN_SIZE:,})")
+    parser.add_argument("--fan-in", type=int, default=FAN_IN,
+                        help=f"runs merged at once (default: {FAN_IN})")
+    parser.add_argument("--tmp-dir", default=None,
+                        help="directory for run files (default: system temp dir)")
+    args = parser.parse_args(argv)
+    if args.run_size < 1 or args.fan_in < 2:
+        parser.error("--run-size must be at least 1 and --fan-in at least 2")
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        merged = merge_intervals_external(read_intervals(src), args.run_size, args.fan_in,
+                                          args.tmp_dir)
+        dst.writelines(f"{start} {end}\n" for start, end in merged)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""Static interval index for stabbing and range-overlap queries.
+
+``IntervalIndex`` answers "which intervals contain point p" and "which
+intervals overlap [a, b]" over a fixed set of (unmerged) intervals, in
+O(log n + k) per query for k results. Intervals are closed, so touching
+counts as overlapping, as in ``merge_intervals``.
+
+The index is a centered interval tree stored in flat NumPy arrays. Every
+node has a center point; the intervals containing the center live at
+that node, the ones entirely left or right of it in the node's
+subtrees. Centers are the median endpoint of a subtree's intervals, so
+the tree has O(log n) levels. The tree is built level by level with
+vectorized sorts, O(n log n) in total, rather than node by node.
+
+Each node keeps its intervals twice, sorted by start and by descending
+end. A point left of (or at) the center is contained in exactly a prefix
+of the by-start list, and a point right of it in a prefix of the by-end
+list, so one ``searchsorted`` per visited node finds all k results.
+Batch queries walk every query down the tree together, one vectorized
+step per level. A range query [a, b] is the stabbing query at ``a`` plus
+the intervals starting in ``(a, b]``, found on the sorted starts.
+
+Results come back in CSR form: ``offsets`` of length ``m + 1`` and
+``ids``, where the intervals matching query ``q`` are
+``ids[offsets[q]:offsets[q + 1]]``, in increasing id order. Ids index
+the ``starts``/``ends`` arrays the index was built from.
+
+Requires NumPy.
+"""
+
+import numpy as np
+
+
+class IntervalIndex:
+    """Centered interval tree over fixed intervals.
+
+    Args:
+        starts: 1-D integer array of interval starts.
+        ends: 1-D integer array of interval ends, same length.
+
+    Raises:
+        ValueError: If the arrays differ in shape or an interval ends
+            before it starts.
+    """
+
+    def __init__(self, starts, ends):
+        starts = np.ascontiguousarray(starts, dtype=np.int64)
+        ends = np.ascontiguousarray(ends, dtype=np.int64)
+        if starts.ndim != 1 or starts.shape != ends.shape:
+            raise ValueError("starts and ends must be 1-D arrays of the same length")
+        if np.any(starts > ends):
+            raise ValueError("every interval must have start <= end")
+        self.starts = starts
+        self.ends = ends
+        self._order = np.argsort(starts, kind="stable")
+        self._sorted_starts = starts[self._order]
+        self._sorted_ends = np.sort(ends)
+        self._build()
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Build an index from ``[start, end]`` pairs."""
+        pairs = np.array(list(intervals), dtype=np.int64).reshape(-1, 2)
+        return cls(pairs[:, 0], pairs[:, 1])
+
+    def __len__(self):
+        return len(self.starts)
+
+    # ============================================================
+    # BUILD
+    # ============================================================
+    def _build(self):
+        n = len(self.starts)
+        centers, lefts, rights = [], [], []
+        stored_ids, stored_nodes = [], []
+
+        # Every endpoint, sorted once. A node's subtree covers a value
+        # range disjoint from its siblings', and nodes of a level are
+        # numbered left to right, so filtering this order level by level
+        # keeps each node's endpoints contiguous and sorted: no re-sort.
+        values = np.concatenate((self.starts, self.ends))
+        endpoints = np.argsort(values, kind="stable")
+        # Distinct endpoint values and the rank of every endpoint among
+        # them. Node keys combine a node number and a rank into one int64,
+        # so a single searchsorted serves all nodes.
+        ordered = values[endpoints]
+        distinct = np.empty(len(ordered), dtype=bool)
+        distinct[:1] = True
+        np.not_equal(ordered[1:], ordered[:-1], out=distinct[1:])
+        self._values = ordered[distinct]
+        rank = np.empty(len(values), dtype=np.int64)
+        rank[endpoints] = np.cumsum(distinct) - 1
+        del ordered, distinct
+        node_of = np.zeros(n, dtype=np.int64)   # node within the level, per interval
+        ids = np.arange(n, dtype=np.int64)      # intervals not yet placed
+        level_nodes = 1 if n else 0
+        base = 0                                # global number of the level's first node
+        while len(endpoints):
+            owners = endpoints % n
+            groups = node_of[owners]
+            counts = np.bincount(groups, minlength=level_nodes)
+            firsts = np.cumsum(counts) - counts
+            center = values[endpoints[firsts + (counts - 1) // 2]]
+
+            s, e = self.starts[ids], self.ends[ids]
+            local = node_of[ids]
+            c = center[local]
+            here = (s <= c) & (e >= c)
+            stored_ids.append(ids[here])
+            stored_nodes.append(base + local[here])
+
+            # Children: left (side 0) and right (side 1) of every node,
+            # numbered in key order, which is left-to-right value order.
+            rest = ids[~here]
+            child_key = local[~here] * 2 + (s[~here] > c[~here])
+            exists = np.bincount(child_key, minlength=2 * level_nodes) > 0
+            numbers = np.cumsum(exists) - 1
+            next_base = base + level_nodes
+            children = np.where(exists, next_base + numbers, -1).reshape(level_nodes, 2)
+
+            centers.append(center)
+            lefts.append(children[:, 0])
+            rights.append(children[:, 1])
+            node_of[rest] = numbers[child_key]
+            stay = np.zeros(n, dtype=bool)
+            stay[rest] = True
+            endpoints = endpoints[stay[owners]]
+            ids = rest
+            base, level_nodes = next_base, int(exists.sum())
+
+        empty = np.empty(0, dtype=np.int64)
+        self._center = np.concatenate(centers) if centers else empty
+        self._left = np.concatenate(lefts) if lefts else empty
+        self._right = np.concatenate(rights) if rights else empty
+        ids = np.concatenate(stored_ids) if stored_ids else empty
+        nodes = np.concatenate(stored_nodes) if stored_nodes else empty
+
+        stride = len(self._values) + 1
+        self._stride = stride
+        start_rank = rank[ids]
+        end_rank = rank[n + ids]
+        # By start ascending: key = node * stride + rank(start) + 1.
+        start_key = nodes * stride + start_rank + 1
+        order = np.argsort(start_key, kind="stable")
+        self._by_start_key = start_key[order]
+        self._by_start_ids = ids[order]
+        # By end descending: key = node * stride + (R - 1 - rank(end)) + 1.
+        end_key = nodes * stride + (stride - 1 - end_rank)
+        order = np.argsort(end_key, kind="stable")
+        self._by_end_key = end_key[order]
+        self._by_end_ids = ids[order]
+        node_numbers = np.arange(len(self._center), dtype=np.int64)
+        self._start_first = np.searchsorted(self._by_start_key, node_numbers * stride)
+        self._end_first = np.searchsorted(self._by_end_key, node_numbers * stride)
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+    def stab_batch(self, points):
+        """Find the intervals containing each point.
+
+        Args:
+            points: 1-D integer array of query points.
+
+        Returns:
+            ``(offsets, ids)`` in CSR form, one row per point.
+        """
+        points = np.asarray(points, dtype=np.int64).reshape(-1)
+        queries, positions, sources = self._stab(points)
+        return self._collect(len(points), queries, positions, sources)
+
+    def overlap_batch(self, lo, hi):
+        """Find the intervals overlapping each ``[lo[q], hi[q]]``.
+
+        Args:
+            lo: 1-D integer array of range starts.
+            hi: 1-D integer array of range ends, same length.
+
+        Returns:
+            ``(offsets, ids)`` in CSR form, one row per range.
+
+        Raises:
+            ValueError: If the arrays differ in shape or a range is empty.
+        """
+        lo = np.asarray(lo, dtype=np.int64).reshape(-1)
+        hi = np.asarray(hi, dtype=np.int64).reshape(-1)
+        if lo.shape != hi.shape:
+            raise ValueError("lo and hi must have the same length")
+        if np.any(lo > hi):
+            raise ValueError("every range must have lo <= hi")
+        queries, positions, sources = self._stab(lo)
+        # Intervals starting in (lo, hi]: a slice of the sorted starts.
+        first = np.searchsorted(self._sorted_starts, lo, side="right")
+        last = np.searchsorted(self._sorted_starts, hi, side="right")
+        queries.append(np.arange(len(lo), dtype=np.int64))
+        positions.append((first, last - first))
+        sources.append(self._order)
+        return self._collect(len(lo), queries, positions, sources)
+
+    def stab(self, point):
+        """Return the ids of the intervals containing ``point``."""
+        offsets, ids = self.stab_batch([point])
+        return ids.tolist()
+
+    def overlapping(self, start, end):
+        """Return the ids of the intervals overlapping ``[start, end]``."""
+        offsets, ids = self.overlap_batch([start], [end])
+        return ids.tolist()
+
+    def stab_counts(self, points):
+        """Count the intervals containing each point, in O(log n) per point."""
+        points = np.asarray(points, dtype=np.int64)
+        started = np.searchsorted(self._sorted_starts, points, side="right")
+        ended = np.searchsorted(self._sorted_ends, points, side="left")
+        return started - ended
+
+    def _stab(self, points):
+        """Walk all points down the tree together.
+
+        Returns:
+            Parallel lists of per-level pieces: query numbers, ``(first,
+            count)`` slices and the id array each slice indexes.
+        """
+        queries, positions, sources = [], [], []
+        if not len(self._center):
+            return queries, positions, sources
+        stride = self._stride
+        rank_le = np.searchsorted(self._values, points, side="right")   # rank(<= p) + 1
+        rank_ge = np.searchsorted(self._values, points, side="left")    # rank(>= p)
+        active = np.arange(len(points), dtype=np.int64)
+        node = np.zeros(len(points), dtype=np.int64)
+        while len(active):
+            p = points[active]
+            c = self._center[node]
+            left_side = p <= c
+            base = node * stride
+
+            q = active[left_side]
+            nodes = node[left_side]
+            first = self._start_first[nodes]
+            last = np.searchsorted(self._by_start_key, base[left_side] + rank_le[q], side="right")
+            queries.append(q)
+            positions.append((first, last - first))
+            sources.append(self._by_start_ids)
+
+            right_side = ~left_side
+            q = active[right_side]
+            nodes = node[right_side]
+            first = self._end_first[nodes]
+            last = np.searchsorted(self._by_end_key, base[right_side] + (stride - 1 - rank_ge[q]),
+                                   side="right")
+            queries.append(q)
+            positions.append((first, last - first))
+            sources.append(self._by_end_ids)
+
+            node = np.where(p < c, self._left[node], np.where(p > c, self._right[node], -1))
+            keep = node >= 0
+            active, node = active[keep], node[keep]
+        return queries, positions, sources
+
+    @staticmethod
+    def _collect(m, queries, positions, sources):
+        """Expand ``(first, count)`` slices into CSR ``(offsets, ids)``."""
+        all_queries, all_ids = [], []
+        for q, (first, count), source in zip(queries, positions, sources):
+            total = int(count.sum())
+            if not total:
+                continue
+            # Position of every result: first[j] + 0..count[j]-1 for each j.
+            owner = np.repeat(np.arange(len(count)), count)
+            within = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+            all_queries.append(q[owner])
+            all_ids.append(source[first[owner] + within])
+        if not all_queries:
+            return np.zeros(m + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+        q = np.concatenate(all_queries)
+        ids = np.concatenate(all_ids)
+        order = np.lexsort((ids, q))
+        offsets = np.zeros(m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(q, minlength=m), out=offsets[1:])
+        return offsets, ids[order]
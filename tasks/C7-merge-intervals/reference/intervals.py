@@ -0,0 +1,265 @@
+"""Reference implementation of the C7 interval merge.
+
+``merge_intervals`` is the function plan.md specifies: it takes
+``[start, end]`` pairs and returns the merged pairs sorted by start.
+Intervals that overlap or merely touch (``[1, 4]`` and ``[4, 5]``) are
+merged.
+
+``IntervalSet`` keeps the merged result up to date under inserts and
+removals instead of re-merging the whole list after every change.
+
+``merge_interval_arrays`` applies the same rule to two NumPy int64 arrays
+(starts, ends) without creating a Python object per interval, for inputs
+of tens of millions of intervals. It needs NumPy; ``merge_intervals``
+does not.
+
+Intervals are assumed to be well-formed (``start <= end``).
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+# ============================================================
+# LIST API
+# ============================================================
+def merge_intervals(intervals):
+    """Merge overlapping and touching intervals.
+
+    Args:
+        intervals: Iterable of ``[start, end]`` pairs. It is not modified.
+
+    Returns:
+        List of merged ``[start, end]`` pairs, sorted by start.
+    """
+    merged = []
+    for start, end in sorted(intervals, key=lambda interval: interval[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class IntervalSet:
+    """A set of disjoint intervals, merged as ``merge_intervals`` merges.
+
+    Merged intervals are kept sorted in chunks of at most ``2 * CHUNK``
+    (parallel lists of starts and ends), with each chunk's last start and
+    last end indexed separately. A lookup bisects the chunk index and then
+    one chunk, O(log n); an update splices one or two chunks, so it never
+    moves more than a few thousand pointers however large the set grows.
+    The covered length is maintained on every update.
+
+    Args:
+        intervals: Optional initial ``[start, end]`` pairs.
+    """
+
+    CHUNK = 512
+
+    def __init__(self, intervals=()):
+        merged = merge_intervals(intervals)
+        load = self.CHUNK
+        self._starts = [[start for start, _ in merged[k:k + load]]
+                        for k in range(0, len(merged), load)]
+        self._ends = [[end for _, end in merged[k:k + load]]
+                      for k in range(0, len(merged), load)]
+        self._last_starts = [chunk[-1] for chunk in self._starts]
+        self._last_ends = [chunk[-1] for chunk in self._ends]
+        self._len = len(merged)
+        self._covered = sum(end - start for start, end in merged)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for starts, ends in zip(self._starts, self._ends):
+            for start, end in zip(starts, ends):
+                yield [start, end]
+
+    def __repr__(self):
+        return f"IntervalSet({list(self)!r})"
+
+    # Positions are (chunk, index) pairs; (len(chunks), 0) is the end.
+    def _locate(self, lasts, chunks, value, right):
+        """``bisect_left`` (or ``bisect_right``) of ``value`` across all chunks."""
+        bisect = bisect_right if right else bisect_left
+        c = bisect(lasts, value)
+        if c == len(chunks):
+            return c, 0
+        return c, bisect(chunks[c], value)
+
+    def _replace(self, lo, hi, new_starts, new_ends):
+        """Replace the intervals at positions ``[lo, hi)`` with the new ones."""
+        n = len(self._starts)
+        if not n:
+            if new_starts:
+                self._starts.append(new_starts)
+                self._ends.append(new_ends)
+                self._last_starts.append(new_starts[-1])
+                self._last_ends.append(new_ends[-1])
+                self._len = len(new_starts)
+                self._covered = sum(e - s for s, e in zip(new_starts, new_ends))
+            return
+        if lo[0] == n:
+            lo = (n - 1, len(self._starts[-1]))
+        if hi[0] == n:
+            hi = (n - 1, len(self._starts[-1]))
+        (c1, i1), (c2, i2) = lo, hi
+
+        removed = 0
+        covered = 0
+        for c in range(c1, c2 + 1):
+            first = i1 if c == c1 else 0
+            last = i2 if c == c2 else len(self._starts[c])
+            starts, ends = self._starts[c], self._ends[c]
+            for k in range(first, last):
+                covered += ends[k] - starts[k]
+            removed += last - first
+        for start, end in zip(new_starts, new_ends):
+            covered -= end - start
+        self._covered -= covered
+        self._len += len(new_starts) - removed
+
+        if c1 == c2:
+            self._starts[c1][i1:i2] = new_starts
+            self._ends[c1][i1:i2] = new_ends
+            self._tidy(c1)
+            return
+        self._starts[c1][i1:] = new_starts
+        self._ends[c1][i1:] = new_ends
+        del self._starts[c2][:i2]
+        del self._ends[c2][:i2]
+        del self._starts[c1 + 1:c2]
+        del self._ends[c1 + 1:c2]
+        del self._last_starts[c1 + 1:c2]
+        del self._last_ends[c1 + 1:c2]
+        self._tidy(c1 + 1)
+        self._tidy(c1)
+
+    def _tidy(self, c):
+        """Refresh chunk ``c``'s index entry, dropping or splitting it as needed."""
+        starts, ends = self._starts[c], self._ends[c]
+        if not starts:
+            del self._starts[c], self._ends[c], self._last_starts[c], self._last_ends[c]
+        elif len(starts) > 2 * self.CHUNK:
+            half = len(starts) // 2
+            self._starts[c:c + 1] = [starts[:half], starts[half:]]
+            self._ends[c:c + 1] = [ends[:half], ends[half:]]
+            self._last_starts[c:c + 1] = [starts[half - 1], starts[-1]]
+            self._last_ends[c:c + 1] = [ends[half - 1], ends[-1]]
+        else:
+            self._last_starts[c] = starts[-1]
+            self._last_ends[c] = ends[-1]
+
+    def add(self, start, end):
+        """Insert ``[start, end]``, merging every interval it overlaps or touches."""
+        if start > end:
+            raise ValueError(f"interval start {start} is after its end {end}")
+        # First interval ending at or after start, and past the last one
+        # starting at or before end: exactly the intervals to merge.
+        lo = self._locate(self._last_ends, self._ends, start, right=False)
+        hi = self._locate(self._last_starts, self._starts, end, right=True)
+        if lo < hi:
+            start = min(start, self._starts[lo[0]][lo[1]])
+            c, i = hi if hi[1] else (hi[0] - 1, len(self._ends[hi[0] - 1]))
+            end = max(end, self._ends[c][i - 1])
+        self._replace(lo, hi, [start], [end])
+
+    def remove(self, start, end):
+        """Remove the span ``[start, end]`` from the set.
+
+        Intervals are treated as spans of the number line: removing
+        ``[2, 4]`` from ``[0, 10]`` leaves ``[0, 2]`` and ``[4, 10]``. A
+        zero-length span removes nothing.
+        """
+        if start > end:
+            raise ValueError(f"interval start {start} is after its end {end}")
+        if start == end:
+            return
+        # Intervals ending after start and starting before end.
+        lo = self._locate(self._last_ends, self._ends, start, right=True)
+        hi = self._locate(self._last_starts, self._starts, end, right=False)
+        if lo >= hi:
+            return
+        first_start = self._starts[lo[0]][lo[1]]
+        c, i = hi if hi[1] else (hi[0] - 1, len(self._ends[hi[0] - 1]))
+        last_end = self._ends[c][i - 1]
+        new_starts, new_ends = [], []
+        if first_start < start:
+            new_starts.append(first_start)
+            new_ends.append(start)
+        if last_end > end:
+            new_starts.append(end)
+            new_ends.append(last_end)
+        self._replace(lo, hi, new_starts, new_ends)
+
+    def contains(self, point):
+        """Return True if ``point`` lies in some interval (endpoints included)."""
+        c, i = self._locate(self._last_ends, self._ends, point, right=False)
+        return c < len(self._starts) and self._starts[c][i] <= point
+
+    def overlaps(self, start, end):
+        """Return True if ``[start, end]`` overlaps or touches some interval."""
+        c, i = self._locate(self._last_ends, self._ends, start, right=False)
+        return c < len(self._starts) and self._starts[c][i] <= end
+
+    def covered_length(self):
+        """Return the total length ``end - start`` over all intervals, in O(1)."""
+        return self._covered
+
+
+# ============================================================
+# ARRAY API
+# ============================================================
+def merge_interval_arrays(starts, ends):
+    """Merge intervals given as parallel arrays, fully vectorized.
+
+    Intervals are ordered by start with ``argsort``. A running
+    maximum of the ends (``np.maximum.accumulate``) gives, at each
+    position, the end of the merged interval seen so far; a new merged
+    interval begins wherever a start exceeds the running end before it.
+    Equal values do not start a new interval, so touching intervals merge
+    exactly as in ``merge_intervals``.
+
+    Args:
+        starts: 1-D integer array of interval starts.
+        ends: 1-D integer array of interval ends, same length.
+
+    Returns:
+        ``(merged_starts, merged_ends)`` int64 arrays, sorted by start.
+
+    Raises:
+        ValueError: If the arrays are not 1-D or differ in length.
+    """
+    import numpy as np
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if starts.ndim != 1 or starts.shape != ends.shape:
+        raise ValueError("starts and ends must be 1-D arrays of the same length")
+    if not len(starts):
+        return starts.copy(), ends.copy()
+
+    order = np.argsort(starts)
+    return merge_sorted_arrays(starts[order], ends[order])
+
+
+def merge_sorted_arrays(starts, ends):
+    """``merge_interval_arrays`` for arrays already sorted by start.
+
+    Args:
+        starts: Non-empty 1-D int64 array, sorted ascending.
+        ends: Matching int64 array of ends.
+
+    Returns:
+        ``(merged_starts, merged_ends)`` int64 arrays.
+    """
+    import numpy as np
+
+    running_end = np.maximum.accumulate(ends)
+    # Index of the first interval of every merged interval after the first.
+    breaks = np.flatnonzero(starts[1:] > running_end[:-1]) + 1
+    merged_starts = np.concatenate((starts[:1], starts[breaks]))
+    merged_ends = np.concatenate((running_end[breaks - 1], running_end[-1:]))
+    return merged_starts, merged_ends
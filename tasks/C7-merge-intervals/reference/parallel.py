@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Multi-process interval merge over shared memory.
+
+Usage:
+    python3 parallel.py --check [--trials 500] [--workers N]
+
+The parent copies the intervals, unsorted, into a
+``multiprocessing.shared_memory`` block and splits the range of start
+values at quantiles of a strided sample of the starts, one range per
+partition. Workers in a ``ProcessPoolExecutor`` attach to the block by
+name, so no interval is pickled. Each worker selects the intervals whose
+start falls in its range, sorts and merges them with
+``merge_sorted_arrays``, and writes the result into a shared output
+block at the number of starts below its range. It returns only that
+offset and the count. The O(n log n) sort is thus spread over the
+workers, and the parent's own work is the copy, the sample and the
+stitch. Every worker scans all n starts to find its range, so the total
+work grows with the pool. Use ``bench_parallel.py`` to compare with the
+serial ``merge_interval_arrays``: the merge only wins with a free core
+per worker.
+
+The parent then stitches the partitions in order. A partition's leading
+intervals may still overlap or touch the interval built so far, and a
+long interval can swallow several of them, so the stitch finds how many
+with one ``searchsorted`` per partition. The result is identical to the
+serial ``merge_intervals``.
+
+``--check`` runs ``test_parallel``, which compares the parallel merge
+with the serial one on the eight cases from ``verify.sh`` and on
+randomized inputs, with partitions small enough to put boundaries
+everywhere.
+
+Requires NumPy.
+"""
+
+import argparse
+import os
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from intervals import merge_sorted_arrays
+
+# Smallest partition worth a worker; smaller inputs are merged in-process.
+MIN_PARTITION = 1 << 18
+
+# Sampled starts per partition when choosing the range boundaries.
+SAMPLES_PER_PARTITION = 1024
+
+
+def _pair_views(shm, n):
+    """Return the ``(starts, ends)`` int64 views of a 2 x n block."""
+    table = np.ndarray((2, n), dtype=np.int64, buffer=shm.buf)
+    return table[0], table[1]
+
+
+def merge_partition(task):
+    """Sort and merge the shared intervals whose start is in ``[lo, hi)``.
+
+    Args:
+        task: ``(input_name, output_name, n, lo, hi)``; ``lo`` or ``hi``
+            is None for a range open at that end.
+
+    Returns:
+        ``(offset, count)``: the merged intervals are written at
+        ``offset``, the number of starts below ``lo``, in the output
+        block.
+    """
+    input_name, output_name, n, lo, hi = task
+    # Pool workers share the parent's resource tracker, so attaching here
+    # neither takes ownership of the blocks nor unlinks them on exit.
+    src = shared_memory.SharedMemory(name=input_name)
+    dst = shared_memory.SharedMemory(name=output_name)
+    try:
+        starts, ends = _pair_views(src, n)
+        offset, mask = 0, None
+        if lo is not None:
+            mask = starts >= lo
+            offset = n - int(np.count_nonzero(mask))
+        if hi is not None:
+            mask = starts < hi if mask is None else mask & (starts < hi)
+        part_starts, part_ends = starts[mask], ends[mask]
+        del starts, ends, mask
+        if not len(part_starts):
+            return offset, 0
+        order = np.argsort(part_starts)
+        merged_starts, merged_ends = merge_sorted_arrays(part_starts[order], part_ends[order])
+        count = len(merged_starts)
+        out_starts, out_ends = _pair_views(dst, n)
+        out_starts[offset:offset + count] = merged_starts
+        out_ends[offset:offset + count] = merged_ends
+        del out_starts, out_ends
+        return offset, count
+    finally:
+        src.close()
+        dst.close()
+
+
+def _stitch(parts):
+    """Join per-partition merges, in partition order, into one merge.
+
+    Args:
+        parts: Iterable of ``(starts, ends)`` merged arrays, each sorted
+            and disjoint, with partitions ordered by start. The last end
+            kept from a partition is extended in place when later
+            partitions reach back into it.
+
+    Returns:
+        ``(merged_starts, merged_ends)`` int64 arrays.
+    """
+    out_starts, out_ends = [], []
+    end = None
+    for starts, ends in parts:
+        if not len(starts):
+            continue
+        if end is not None:
+            # Leading intervals reaching back into the current one.
+            k = int(np.searchsorted(starts, end, side="right"))
+            if k:
+                end = max(end, int(ends[k - 1]))
+                out_ends[-1][-1] = end
+                starts, ends = starts[k:], ends[k:]
+                if not len(starts):
+                    continue
+        out_starts.append(starts)
+        out_ends.append(ends)
+        end = int(ends[-1])
+    if not out_starts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(out_starts), np.concatenate(out_ends)
+
+
+def merge_interval_arrays_parallel(starts, ends, workers=None, min_partition=MIN_PARTITION):
+    """Merge intervals given as parallel arrays across a process pool.
+
+    Args:
+        starts: 1-D integer array of interval starts.
+        ends: 1-D integer array of interval ends, same length.
+        workers: Pool size (default: ``os.cpu_count()``).
+        min_partition: Fewest intervals per partition.
+
+    Returns:
+        ``(merged_starts, merged_ends)`` int64 arrays, sorted by start.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if starts.ndim != 1 or starts.shape != ends.shape:
+        raise ValueError("starts and ends must be 1-D arrays of the same length")
+    n = len(starts)
+    workers = workers or os.cpu_count() or 1
+    partitions = min(workers, -(-n // max(min_partition, 1)))
+    if partitions <= 1:
+        if not n:
+            return starts.copy(), ends.copy()
+        order = np.argsort(starts)
+        return merge_sorted_arrays(starts[order], ends[order])
+
+    sample = np.sort(starts[::max(1, n // (partitions * SAMPLES_PER_PARTITION))])
+    bounds = [None, *(int(sample[len(sample) * p // partitions])
+                      for p in range(1, partitions)), None]
+
+    src = shared_memory.SharedMemory(create=True, size=2 * n * 8)
+    dst = shared_memory.SharedMemory(create=True, size=2 * n * 8)
+    try:
+        shared_starts, shared_ends = _pair_views(src, n)
+        shared_starts[:] = starts
+        shared_ends[:] = ends
+        del shared_starts, shared_ends
+
+        tasks = [(src.name, dst.name, n, lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+        with ProcessPoolExecutor(max_workers=min(workers, partitions)) as pool:
+            results = list(pool.map(merge_partition, tasks))
+
+        out_starts, out_ends = _pair_views(dst, n)
+        merged = _stitch(
+            (out_starts[offset:offset + count], out_ends[offset:offset + count])
+            for offset, count in results
+        )
+        # _stitch() concatenates, so the result no longer refers to the block.
+        del out_starts, out_ends
+        return merged
+    finally:
+        src.close()
+        src.unlink()
+        dst.close()
+        dst.unlink()
+
+
+def merge_intervals_parallel(intervals, workers=None, min_partition=MIN_PARTITION):
+    """``merge_intervals`` computed across a process pool.
+
+    Args:
+        intervals: Iterable of ``[start, end]`` integer pairs.
+        workers: Pool size (default: ``os.cpu_count()``).
+        min_partition: Fewest intervals per partition.
+
+    Returns:
+        List of merged ``[start, end]`` pairs, sorted by start.
+    """
+    pairs = np.array(list(intervals), dtype=np.int64).reshape(-1, 2)
+    merged_starts, merged_ends = merge_interval_arrays_parallel(
+        pairs[:, 0], pairs[:, 1], workers, min_partition)
+    return np.column_stack((merged_starts, merged_ends)).tolist()
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true",
+                        help="run test_parallel against the serial merge and exit")
+    parser.add_argument("--trials", type=int, default=500,
+                        help="randomized inputs for --check (default: 500)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="pool size for --check (default: 4)")
+    args = parser.parse_args(argv)
+    if not args.check:
+        parser.print_help()
+        return 2
+    import test_parallel
+    test_parallel.TRIALS, test_parallel.WORKERS = args.trials, args.workers
+    suite = unittest.defaultTestLoader.loadTestsFromModule(test_parallel)
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
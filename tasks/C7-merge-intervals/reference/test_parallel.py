@@ -0,0 +1,78 @@
+"""
+Test suite for the multi-process interval merge in parallel.py.
+Run with: python3 -m unittest test_parallel   (or: python3 parallel.py --check)
+"""
+import random
+import unittest
+
+from intervals import merge_intervals
+from parallel import merge_intervals_parallel
+
+# Pool size and number of randomized inputs; parallel.py --check sets these.
+WORKERS = 4
+TRIALS = 500
+
+
+class TestVerifyCases(unittest.TestCase):
+    """The eight cases from verify.sh, with a partition boundary between every interval."""
+
+    def assertMerges(self, intervals, expected):
+        for min_partition in (1, 2):
+            with self.subTest(min_partition=min_partition):
+                self.assertEqual(merge_intervals_parallel(intervals, WORKERS, min_partition),
+                                 expected)
+
+    def test_01_empty_input(self):
+        """No intervals merge to no intervals"""
+        self.assertMerges([], [])
+
+    def test_02_single_interval(self):
+        """A single interval is returned unchanged"""
+        self.assertMerges([[1, 3]], [[1, 3]])
+
+    def test_03_basic_merge(self):
+        """Overlapping intervals merge, disjoint ones are kept"""
+        self.assertMerges([[1, 3], [2, 6], [8, 10], [15, 18]], [[1, 6], [8, 10], [15, 18]])
+
+    def test_04_adjacent_intervals(self):
+        """Intervals that touch merge"""
+        self.assertMerges([[1, 4], [4, 5]], [[1, 5]])
+
+    def test_05_overlapping_with_earlier_start(self):
+        """Input order does not matter"""
+        self.assertMerges([[1, 4], [0, 4]], [[0, 4]])
+
+    def test_06_nested_interval(self):
+        """An interval inside another disappears"""
+        self.assertMerges([[1, 4], [2, 3]], [[1, 4]])
+
+    def test_07_one_covers_all(self):
+        """One long interval swallows every partition"""
+        self.assertMerges([[2, 3], [4, 5], [6, 7], [8, 9], [1, 10]], [[1, 10]])
+
+    def test_08_three_way_merge(self):
+        """A chain of overlaps merges into one interval"""
+        self.assertMerges([[1, 4], [0, 2], [3, 5]], [[0, 5]])
+
+
+class TestRandomized(unittest.TestCase):
+    """Random inputs and partition sizes against the serial merge_intervals."""
+
+    def test_matches_serial_merge(self):
+        """The parallel merge equals merge_intervals on random inputs"""
+        rng = random.Random(0)
+        for trial in range(TRIALS):
+            n = rng.randint(0, 200)
+            span = rng.choice([10, 100, 10_000])
+            intervals = []
+            for _ in range(n):
+                start = rng.randint(-span, span)
+                intervals.append([start, start + rng.randint(0, rng.choice([0, 3, span]))])
+            min_partition = rng.randint(1, max(1, n // 2))
+            with self.subTest(trial=trial, min_partition=min_partition):
+                self.assertEqual(merge_intervals_parallel(intervals, WORKERS, min_partition),
+                                 merge_intervals(intervals))
+
+
+if __name__ == "__main__":
+    unittest.main()